@@ -0,0 +1,272 @@
+import math
+import os
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+import pandas as pd
+
+from text_normalize import UNIVERSITY_EXPANDER, fold_lower
+
+# ==============================================================================
+# AFFILIATION MATCHING
+# ==============================================================================
+# Grades how well a Scholar affiliation matches the awardee's institution
+# (calistigi_kurum) on the 1-5 scale of calculate_match_score:
+#   5  the awardee's institution is named (or its e-mail domain appears)
+#   4  most of its distinctive words appear
+#   3  nothing to compare, or the "affiliation" is a citation snippet
+#   2  only a weak overlap
+#   1  another known institution is named instead, or no overlap at all
+#
+# The gazetteer holds every distinct calistigi_kurum value plus the aliases
+# below (English names, abbreviations, e-mail domains). Each name becomes a
+# token set (Turkish generic words translated, generic/unit words dropped);
+# names with the same token set are one institution. An inverted index maps
+# tokens to names, so one pass over a found affiliation's tokens yields an
+# IDF-weighted containment score for every institution at once.
+
+GAZETTEER_SOURCES = ["data/gebip_awardees.csv", "data/gebip_scholar_final.csv"]
+
+INSTITUTION_ALIASES = {
+    "middle east technical university": ["odtu", "metu", "orta dogu teknik universitesi", "ortadogu teknik universitesi", "metu.edu.tr", "odtu.edu.tr"],
+    "istanbul technical university": ["itu", "istanbul teknik universitesi", "itu.edu.tr"],
+    "bogazici university": ["boun", "bogazici universitesi", "boun.edu.tr"],
+    "izmir institute of technology": ["iyte", "izmir yuksek teknoloji enstitusu", "iyte.edu.tr"],
+    "koc university": ["koc universitesi", "ku.edu.tr"],
+    "sabanci university": ["sabanci universitesi", "sabanciuniv.edu"],
+    "bilkent university": ["bilkent universitesi", "ihsan dogramaci bilkent universitesi", "bilkent universitesi unam", "unam", "bilkent.edu.tr"],
+    "hacettepe university": ["hacettepe universitesi", "hacettepe.edu.tr"],
+    "ankara university": ["ankara universitesi", "ankara.edu.tr"],
+    "istanbul university": ["istanbul universitesi", "istanbul.edu.tr", "iuc.edu.tr"],
+    "tobb university of economics and technology": ["tobb etu", "tobb ekonomi ve teknoloji universitesi", "etu.edu.tr"],
+    "gebze technical university": ["gebze teknik universitesi", "gebze yuksek teknoloji enstitusu", "gtu.edu.tr"],
+    "bursa uludag university": ["uludag universitesi", "bursa uludag universitesi", "uludag.edu.tr"],
+    "canakkale onsekiz mart university": ["canakkale 18 mart universitesi", "canakkale onsekizmart universitesi", "comu.edu.tr"],
+    "nigde omer halisdemir university": ["nigde omer halis demir universitesi", "nigde universitesi", "ohu.edu.tr"],
+    "necmettin erbakan university": ["konya necmettin erbakan universitesi", "necmettin erbakan universitesi", "erbakan.edu.tr"],
+    "acibadem university": ["acibadem mehmet ali aydinlar universitesi", "acibadem.edu.tr"],
+    "izmir biomedicine and genome center": ["izmir biyotip ve genom merkezi", "ibg"],
+    "tubitak marmara research center": ["tubitak mam", "tubitak mrc", "tubitak marmara arastirma merkezi"],
+}
+
+TERM_TRANSLATIONS = {
+    "teknik": "technical", "teknoloji": "technology", "ekonomi": "economics",
+    "saglik": "health", "bilimleri": "sciences", "yuksek": "", "dogu": "east",
+    "orta": "middle", "ortadogu": "middle east", "uzay": "space", "teknolojileri": "technologies",
+}
+STOP_WORDS = frozenset({
+    "university", "universitesi", "universitat", "universite", "institute", "enstitusu",
+    "faculty", "fakultesi", "department", "bolumu", "school", "college", "hospital",
+    "hastanesi", "center", "centre", "merkezi", "research", "arastirma", "of", "the",
+    "and", "for", "at", "in", "ve", "tip", "medicine", "medical", "engineering",
+    "professor", "prof", "assoc", "asst", "dr", "verified", "email", "uzerinde",
+    "dogrulanmis", "posta", "adresine", "sahip", "edu", "com", "org",
+})
+# Province names: "Ankara Yıldırım Beyazıt Üniversitesi" is still "Yıldırım Beyazıt Üniv."
+LOCALITY_WORDS = frozenset("""
+adana adiyaman afyonkarahisar agri aksaray amasya ankara antalya ardahan artvin aydin
+balikesir bartin batman bayburt bilecik bingol bitlis bolu burdur bursa canakkale cankiri
+corum denizli diyarbakir duzce edirne elazig erzincan erzurum eskisehir gaziantep giresun
+gumushane hakkari hatay igdir isparta istanbul izmir kahramanmaras karabuk karaman kars
+kastamonu kayseri kilis kirikkale kirklareli kirsehir kocaeli konya kutahya malatya manisa
+mardin mersin mugla mus nevsehir nigde ordu osmaniye rize sakarya samsun sanliurfa siirt
+sinop sirnak sivas tekirdag tokat trabzon tunceli usak van yalova yozgat zonguldak
+turkey turkiye
+""".split())
+# Abbreviated / misspelled "Üniversitesi" ("Üniv.", "Üniveristesi", "Ünüversitesi"), "Ensti."
+GENERIC_PREFIXES = ("univ", "unv", "unu", "ensti")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[a-z0-9]+)+|[a-z0-9]+")
+DOMAIN_SUFFIXES = ("edu", "com", "org", "net", "gov")
+# A kurum like "Boston University (Sabancı Üniv)" names two institutions
+PART_SEPARATORS = re.compile(r"[()/]|\s-\s")
+CITATION_PATTERNS = [
+    re.compile(r"cited by|view all|alintilanma|\bdoi\b|journal|proceedings|\bvol\.", re.I),
+    re.compile(r"(?:\b[A-Z]{1,3} [A-ZÇĞİÖŞÜ][a-zçğıöşü]+,\s*){3,}"),  # "E Genc, AC Yüzer, G Yanalak, ..."
+]
+
+STRONG, PARTIAL, WEAK = 0.99, 0.5, 0.0
+
+@lru_cache(maxsize=65536)
+def affiliation_token_set(text, expand=False):
+    """Distinctive tokens of a name: e-mail domains and words, generic words dropped."""
+    folded = fold_lower(text)
+    if expand:
+        folded = UNIVERSITY_EXPANDER.expand(folded)
+    tokens = set()
+    for tok in TOKEN_PATTERN.findall(folded):
+        if "." in tok:
+            tok = _domain(tok)
+        else:
+            tok = TERM_TRANSLATIONS.get(tok, tok)
+        for t in tok.split():
+            if t in STOP_WORDS or t.startswith(GENERIC_PREFIXES):
+                continue
+            if len(t) > 2 or "." in t:
+                tokens.add(t)
+    return frozenset(tokens)
+
+def _domain(tok):
+    """
+    Registrable domain of an e-mail host ("ee.bilkent.edu.tr" -> "bilkent.edu.tr");
+    dotted text that is not a host ("i.d", "lab.yeditepe") is split into words.
+    """
+    labels = tok.split(".")
+    if not (labels[-1] in DOMAIN_SUFFIXES or len(labels[-1]) == 2) or len(labels[0]) < 2:
+        return " ".join(labels)
+    keep = 3 if labels[-2] in DOMAIN_SUFFIXES and len(labels) >= 3 else 2
+    return ".".join(labels[-keep:])
+
+def looks_like_citation(text):
+    """True for snippet text that is a publication/citation list rather than an affiliation."""
+    return isinstance(text, str) and any(p.search(text) for p in CITATION_PATTERNS)
+
+class Gazetteer:
+    def __init__(self, names, aliases=INSTITUTION_ALIASES):
+        self.institutions = []          # display name per institution id
+        self.docs = []                  # (institution id, token set, total weight)
+        self.by_key = {}                # token set -> institution id
+        self.postings = defaultdict(list)
+
+        alias_docs = defaultdict(set)
+        for canonical, alias_list in aliases.items():
+            inst = self._institution(affiliation_token_set(canonical), canonical)
+            for alias in [canonical, *alias_list]:
+                tokens = affiliation_token_set(alias)
+                alias_docs[inst].add(tokens)
+                self.by_key.setdefault(tokens, inst)
+        for name in names:
+            for part in self.split_parts(name):
+                tokens = affiliation_token_set(part, expand=True)
+                if tokens:
+                    inst = self._institution(tokens, part)
+                    alias_docs[inst].add(tokens)
+
+        # IDF over institutions
+        inst_freq = defaultdict(int)
+        for inst, docs in alias_docs.items():
+            for tok in set().union(*docs):
+                inst_freq[tok] += 1
+        n = len(self.institutions)
+        self.idf = {tok: math.log(1 + n / f) for tok, f in inst_freq.items()}
+
+        self.inst_tokens = {inst: set().union(*docs) for inst, docs in alias_docs.items()}
+        for inst, docs in alias_docs.items():
+            for tokens in docs:
+                doc_id = len(self.docs)
+                self.docs.append((inst, tokens, sum(self.idf[t] for t in tokens)))
+                for tok in tokens:
+                    self.postings[tok].append(doc_id)
+
+    def _institution(self, tokens, name):
+        if tokens not in self.by_key:
+            self.by_key[tokens] = len(self.institutions)
+            self.institutions.append(name)
+        return self.by_key[tokens]
+
+    @staticmethod
+    def split_parts(name):
+        if not isinstance(name, str):
+            return []
+        return [p.strip() for p in PART_SEPARATORS.split(name) if p.strip()]
+
+    def resolve(self, original):
+        """Institution ids (or ad-hoc token sets for unknown names) for an awardee's kurum."""
+        resolved = []
+        for part in self.split_parts(original):
+            tokens = affiliation_token_set(part, expand=True)
+            if tokens:
+                resolved.append(self.by_key.get(tokens, tokens))
+        return resolved
+
+    def scan(self, tokens):
+        """One pass over the index: {institution id: (containment, matched weight, doc id)}."""
+        matched = defaultdict(float)
+        for tok in tokens:
+            for doc_id in self.postings.get(tok, ()):
+                matched[doc_id] += self.idf[tok]
+        best = {}
+        for doc_id, weight in matched.items():
+            inst, _, total = self.docs[doc_id]
+            score = (weight / total, weight, doc_id)
+            if score[:2] > best.get(inst, (0.0, 0.0))[:2]:
+                best[inst] = score
+        return best
+
+    def grade(self, original, found):
+        """(score 1-5, notes) for one awardee kurum vs one found affiliation."""
+        if pd.isna(found) or not found:
+            return 3, "No affiliation in profile"
+        if pd.isna(original):
+            return 3, "No original affiliation to compare"
+
+        found_tokens = affiliation_token_set(str(found))
+        scanned = self.scan(found_tokens)
+
+        # Best containment of the awardee's institution(s) in the found text
+        own, own_matched, own_ids, own_tokens = 0.0, frozenset(), set(), set()
+        for target in self.resolve(str(original)):
+            if isinstance(target, frozenset):
+                tokens = target
+                own_tokens |= tokens
+                total = sum(self.idf.get(t, 1.0) for t in tokens)
+                containment = sum(self.idf.get(t, 1.0) for t in tokens & found_tokens) / total
+            else:
+                own_ids.add(target)
+                own_tokens |= self.inst_tokens[target]
+                if target not in scanned:
+                    continue
+                containment, _, doc_id = scanned[target]
+                tokens = self.docs[doc_id][1]
+            if containment > own:
+                own, own_matched = containment, tokens & found_tokens
+
+        # Another institution named in full that is more specific than the
+        # awardee's match (e.g. "Istanbul Technical University" for "İstanbul Üniversitesi")
+        for inst, (containment, weight, doc_id) in sorted(scanned.items(), key=lambda kv: -kv[1][1]):
+            if inst in own_ids or containment < STRONG:
+                continue
+            doc_tokens = self.docs[doc_id][1]
+            extra = doc_tokens - own_tokens
+            if not extra:
+                continue  # a broader name of the awardee's own institution ("TÜBİTAK")
+            if own_matched and own_matched <= doc_tokens and extra <= LOCALITY_WORDS:
+                continue  # the same name with its city ("Ankara Yıldırım Beyazıt Üniversitesi")
+            if own < STRONG or own_matched < doc_tokens:
+                return 1, f"Different institution: '{self.institutions[inst]}' vs '{original}'"
+
+        if own >= STRONG:
+            return 5, f"Matched institution: '{original}'"
+        if own >= PARTIAL:
+            return 4, f"Partial institution match ({own:.2f}): '{original}'"
+        if looks_like_citation(found):
+            return 3, "Affiliation looks like a citation snippet"
+        if own > WEAK:
+            return 2, f"Weak institution match ({own:.2f}): '{original}' vs '{found}'"
+        return 1, f"Affiliation mismatch? '{original}' vs '{found}'"
+
+    def grade_many(self, originals, founds):
+        """Grades aligned sequences, each distinct pair once. Returns [(score, notes)]."""
+        results = {}
+        out = []
+        for pair in zip(originals, founds):
+            key = tuple(None if pd.isna(v) else v for v in pair)
+            if key not in results:
+                results[key] = self.grade(*pair)
+            out.append(results[key])
+        return out
+
+def load_gazetteer(sources=GAZETTEER_SOURCES):
+    names = set()
+    for path in sources:
+        if os.path.exists(path):
+            names.update(pd.read_csv(path, usecols=["calistigi_kurum"])["calistigi_kurum"].dropna())
+    return Gazetteer(sorted(names))
+
+_gazetteer = None
+
+def get_gazetteer():
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = load_gazetteer()
+    return _gazetteer
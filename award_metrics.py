@@ -0,0 +1,96 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+import data_store
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+# ==============================================================================
+# AWARD-YEAR METRIC ENGINE
+# ==============================================================================
+# odul_aninda_atif / odul_aninda_yayin = sum of the yearly counts with
+# year <= award year (yili). Instead of walking the yearly strings row by row:
+#   1. YearMatrix lays the yearly_series table out as a dense
+#      researcher x year matrix and takes one cumulative sum along the years.
+#   2. Any point-in-time value (award year, award year + N, a fixed query year)
+#      is then a single fancy-index gather over all researchers.
+# refresh_award_metrics() keeps a signature (hash of yili and the yearly
+# strings) per researcher and only recomputes and writes the rows whose
+# signature changed since the last run.
+
+STATE_TABLE = "award_metrics_state"
+SIGNATURE_COLUMNS = ["yili", "yillik_atif", "yillik_yayin"]
+METRIC_COLUMNS = {"citations": "odul_aninda_atif", "documents": "odul_aninda_yayin"}
+
+class YearMatrix:
+    def __init__(self, series, researcher_ids=None):
+        """Dense cumulative matrices for the given researchers (default: all in the series)."""
+        ids = series.researcher_ids if researcher_ids is None else np.asarray(researcher_ids, dtype=np.int64)
+        self.researcher_ids = ids
+        self.first_year = int(series.year.min()) if len(series.year) else 0
+        n_years = int(series.year.max()) - self.first_year + 1 if len(series.year) else 1
+
+        # Row of every series entry in the matrix; entries of other researchers are dropped
+        pos = np.searchsorted(ids, series.researcher)
+        pos = np.minimum(pos, len(ids) - 1) if len(ids) else pos
+        keep = (ids[pos] == series.researcher) if len(ids) else np.zeros(len(pos), dtype=bool)
+        cols = series.year[keep] - self.first_year
+
+        self.cumulative = {}
+        for name, values in series.values.items():
+            dense = np.zeros((len(ids), n_years))
+            dense[pos[keep], cols] = np.nan_to_num(values[keep])
+            self.cumulative[name] = np.cumsum(dense, axis=1)
+
+    def at(self, name, query_years):
+        """
+        Cumulative value at the query year(s) for every researcher. query_years
+        is a scalar or an array aligned with researcher_ids; years before the
+        first year give 0, years after the last give the full total.
+        """
+        cum = self.cumulative[name]
+        query = np.broadcast_to(np.asarray(query_years, dtype=np.float64), self.researcher_ids.shape)
+        valid = ~np.isnan(query)
+        col = np.where(valid, query, self.first_year) - self.first_year
+        col = np.clip(col, -1, cum.shape[1] - 1).astype(np.int64)
+        padded = np.hstack([cum, np.zeros((len(cum), 1))])  # column -1 -> 0
+        out = padded[np.arange(len(cum)), col]
+        return np.where(valid, out, np.nan)
+
+def award_metrics(df, series, offset=0):
+    """Point-in-time metrics at yili + offset for df (indexed by researcher id)."""
+    matrix = YearMatrix(series, np.sort(df.index.to_numpy(dtype=np.int64)))
+    query = df["yili"].reindex(matrix.researcher_ids).to_numpy(dtype=np.float64) + offset
+    return pd.DataFrame({col: matrix.at(name, query) for name, col in METRIC_COLUMNS.items()},
+                        index=matrix.researcher_ids)
+
+def signatures(df):
+    return pd.util.hash_pandas_object(df[SIGNATURE_COLUMNS], index=False).astype("int64")
+
+def refresh_award_metrics(conn, force=False):
+    """Recomputes the award-year metrics of researchers whose yili or series changed."""
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {STATE_TABLE} (researcher_id INTEGER PRIMARY KEY, signature INTEGER NOT NULL)")
+    df = data_store.load_frame(conn)
+    current = signatures(df)
+    stored = pd.read_sql(f"SELECT researcher_id, signature FROM {STATE_TABLE}", conn, index_col="researcher_id")["signature"]
+    changed = df.index if force else df.index[current.ne(stored.reindex(df.index)).to_numpy()]
+    if len(changed) == 0:
+        print("Award-year metrics up to date.")
+        return 0
+
+    metrics = award_metrics(df.loc[changed], data_store.load_series(conn))
+    for col in METRIC_COLUMNS.values():
+        data_store.update_column(conn, col, metrics[col].to_dict())
+    with conn:
+        conn.executemany(f"INSERT OR REPLACE INTO {STATE_TABLE} VALUES (?, ?)",
+                         [(int(i), int(current[i])) for i in changed])
+    print(f"Recomputed award-year metrics for {len(changed)} of {len(df)} researchers.")
+    return len(changed)
+
+if __name__ == "__main__":
+    # python award_metrics.py [--force]
+    conn = data_store.connect()
+    refresh_award_metrics(conn, force="--force" in sys.argv)
+    data_store.export_csv(conn)
@@ -0,0 +1,172 @@
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# ==============================================================================
+# WORK-STEALING BATCH SCHEDULER
+# ==============================================================================
+# Hands the pending (start, end) batches of process_all_authors to a pool of
+# workers. Each worker starts with a contiguous run of batches in its own deque
+# and takes from the front; when it runs dry it steals from the back of the
+# longest remaining deque, so slow batches (prolific researchers, throttling)
+# do not leave other workers idle.
+#
+# mode="threads"    workers share the process (and its rate limiter), each
+#                   with its own pooled session (http_session is per thread)
+#                   and async client (scholar_async keeps one per thread).
+# mode="processes"  every worker owns a single-process executor (spawned, not
+#                   forked from a worker thread), i.e. its own session, limiter
+#                   and, with several keys, its own Serper key. Each child's
+#                   limiter is scaled to 1/workers of the configured rates, so
+#                   the total request rate does not grow with the worker count.
+#                   Every batch returns its counters (Serper, candidates,
+#                   connections, response cache, limiter), added up in the
+#                   parent for the end-of-run report.
+#
+# Rows are written to the checkpoint journal as they finish, so batches that
+# were fully journaled are skipped on resume and partial ones only redo the
+# missing rows.
+
+class WorkStealingQueue:
+    def __init__(self, items, n_workers):
+        self.lock = threading.Lock()
+        self.queues = [deque() for _ in range(n_workers)]
+        chunk = -(-len(items) // n_workers) if items else 0
+        for i, item in enumerate(items):
+            self.queues[i // chunk].append(item)
+        self.steals = 0
+
+    def next(self, worker_id):
+        """Returns the worker's next batch (stealing if needed), or None when all are done."""
+        with self.lock:
+            own = self.queues[worker_id]
+            if own:
+                return own.popleft()
+            victim = max(self.queues, key=len)
+            if victim:
+                self.steals += 1
+                return victim.pop()
+            return None
+
+_stats_lock = threading.Lock()
+
+def collect_stats():
+    """This process's scraper counters: {group: {counter: number}}."""
+    from data_scrape import CANDIDATE_STATS, SERPER_STATS
+    from http_session import CONNECTION_STATS
+    from rate_limit import LIMITER
+    from response_cache import RESPONSE_CACHE
+
+    connections = CONNECTION_STATS.counts()
+    versions = connections.pop("http_versions")
+    stats = {
+        "serper": dict(SERPER_STATS),
+        "candidates": dict(CANDIDATE_STATS),
+        "cache": dict(RESPONSE_CACHE.stats),
+        "connections": connections,
+        "http_versions": versions,
+    }
+    for name, counters in LIMITER.stats.items():
+        stats[f"limiter.{name}"] = dict(counters)
+    return stats
+
+def _stats_delta(after, before):
+    return {group: {k: v - before.get(group, {}).get(k, 0) for k, v in counters.items()}
+            for group, counters in after.items()}
+
+def add_stats(stats):
+    """Adds a worker process's collect_stats() delta to this process's counters."""
+    from data_scrape import CANDIDATE_STATS, SERPER_STATS
+    from http_session import CONNECTION_STATS
+    from rate_limit import LIMITER
+    from response_cache import RESPONSE_CACHE
+
+    with _stats_lock:
+        for target, group in ((SERPER_STATS, "serper"), (CANDIDATE_STATS, "candidates"),
+                              (RESPONSE_CACHE.stats, "cache")):
+            for k, v in stats[group].items():
+                target[k] = target.get(k, 0) + v
+        for name, counters in LIMITER.stats.items():
+            for k, v in stats.get(f"limiter.{name}", {}).items():
+                counters[k] += v
+        CONNECTION_STATS.add_counts(dict(stats["connections"], http_versions=stats["http_versions"]))
+
+def _init_process(share, prefetched):
+    """
+    Worker process initializer: its share of the configured request rates,
+    and the queries the parent's planner prefetched (see SERPER_STATS).
+    """
+    from data_scrape import PREFETCHED_QUERIES
+    from rate_limit import LIMITER
+    LIMITER.scale(share)
+    PREFETCHED_QUERIES.update(prefetched)
+
+def run_batch(start_idx, end_idx, api_key=None):
+    """
+    Processes one batch. Runs in the worker thread or worker process.
+    Returns the batch's counters (see collect_stats).
+    """
+    from data_scrape import DATA_FILE, process_batch
+
+    before = collect_stats()
+    df_source = pd.read_csv(DATA_FILE)
+    print(f"\nProcessing batch: {start_idx} to {end_idx}")
+    process_batch(df_source, start_idx, end_idx, api_key=api_key)
+    print(f"Journaled batch: {start_idx} to {end_idx}")
+    return _stats_delta(collect_stats(), before)
+
+def _worker_loop(worker_id, queue, api_key, executor, errors):
+    while True:
+        batch = queue.next(worker_id)
+        if batch is None:
+            return
+        try:
+            if executor is None:
+                run_batch(*batch, api_key=api_key)
+            else:
+                add_stats(executor.submit(run_batch, *batch, api_key=api_key).result())
+        except Exception as e:
+            # Unfinished rows are not journaled; the next run picks them up again
+            print(f"\n[Worker {worker_id}] Batch {batch[0]}-{batch[1]} failed: {e}")
+            errors.append((batch, e))
+
+def run_batches(batches, workers=1, mode="threads", api_keys=None):
+    """Runs all batches on the work-stealing pool. Returns the failed batches."""
+    if not batches:
+        return []
+    workers = max(1, min(workers, len(batches)))
+    api_keys = api_keys or [None]
+    queue = WorkStealingQueue(batches, workers)
+    errors = []
+
+    executors = [None] * workers
+    if mode == "processes":
+        from data_scrape import PREFETCHED_QUERIES
+        context = multiprocessing.get_context("spawn")
+        executors = [ProcessPoolExecutor(max_workers=1, mp_context=context,
+                                         initializer=_init_process, initargs=(1 / workers, set(PREFETCHED_QUERIES)))
+                     for _ in range(workers)]
+    threads = [
+        threading.Thread(target=_worker_loop, name=f"batch-worker-{i}",
+                         args=(i, queue, api_keys[i % len(api_keys)], executors[i], errors))
+        for i in range(workers)
+    ]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown()
+        if mode == "threads":
+            from scholar_async import close_async_clients
+            close_async_clients()
+
+    print(f"\nScheduler: {len(batches)} batches on {workers} {mode} workers, "
+          f"{queue.steals} steals, {len(errors)} failed")
+    return errors
@@ -0,0 +1,129 @@
+import argparse
+import functools
+import statistics
+import sys
+import time
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+# ==============================================================================
+# DASHBOARD LATENCY BENCHMARK
+# ==============================================================================
+# python bench_dashboard.py [--script dashboard.py] [--repeat 5]
+#
+# Drives the dashboard headlessly with Streamlit's AppTest and times each
+# interaction of INTERACTIONS (a widget found by its label, toggled between
+# two values). AppTest always reruns the whole script, so the harness also
+# wraps st.fragment to time every fragment body: for a widget that lives in a
+# fragment, the browser only waits for that fragment's rerun, which is the
+# latency reported. Scripts without that fragment (e.g. an older dashboard.py,
+# `git show <rev>:dashboard.py > old.py`) report the full rerun.
+# Times are server-side script time; the browser's rendering is not included.
+# At the end the hit / miss counts of the figure cache (figure_factory.py)
+# are printed, if the script uses it.
+
+# name, widget kind, label, two values to alternate, fragment holding the widget
+INTERACTIONS = [
+    ("opacity slider", "slider", "Nokta Opaklığı", [0.5, 0.7], "explorer_tab"),
+    ("explorer Y axis", "selectbox", "Y Ekseni", ["H-İndeksi", "Toplam Atıf"], "explorer_tab"),
+    ("explorer highlight", "selectbox", "Araştırmacı Vurgula", [1, 0], "explorer_tab"),
+    ("year range filter", "slider", "Yıl Aralığı", [(2010, 2020), None], None),
+    ("profile researcher", "selectbox", "🔍 Araştırmacı Seçin", [10, 0], "profile_tab"),
+    ("profile log scale", "checkbox", "📊 Logaritmik Ölçek Kullan (Y-ekseni)", [False, True], "profile_tab"),
+    ("award log X", "checkbox", "Logaritmik X Ekseni", [False, True], "award_tab"),
+    ("table search", "text_input", "🔍 Araştırmacı Ara (Ad, Soyad, Kurum)", ["Ali", ""], "table_tab"),
+]
+
+FRAGMENT_TIMES = {}
+FIGURE_CACHES = []
+
+def _timed_fragment(original):
+    """st.fragment replacement recording how long each fragment body takes."""
+    def fragment(func=None, **kwargs):
+        if func is None:
+            return lambda f: fragment(f, **kwargs)
+        @functools.wraps(func)
+        def timed(*args, **kw):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kw)
+            finally:
+                FRAGMENT_TIMES[func.__name__] = time.perf_counter() - start
+        return original(timed, **kwargs)
+    return fragment
+
+def _track_figure_caches():
+    try:
+        import figure_factory
+    except ImportError:
+        return
+    init = figure_factory.FigureCache.__init__
+    def tracked(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        FIGURE_CACHES.append(self)
+    figure_factory.FigureCache.__init__ = tracked
+
+def _widget(at, kind, label):
+    for w in getattr(at, kind):
+        if w.label == label:
+            return w
+    return None
+
+def _value(widget, value, initial):
+    # Option positions for selectboxes, None for the widget's initial value
+    if value is None:
+        return initial
+    if isinstance(value, int) and not isinstance(value, bool) and hasattr(widget, "options"):
+        return widget.options[value]
+    return value
+
+def run(script, repeat):
+    st.fragment = _timed_fragment(st.fragment)
+    _track_figure_caches()
+    at = AppTest.from_file(script, default_timeout=300)
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    print(f"{script}: first run {first * 1000:.0f} ms")
+    print(f"  {'interaction':<22}{'full rerun':>12}{'fragment':>12}{'latency':>12}")
+
+    results = {}
+    for name, kind, label, values, fragment in INTERACTIONS:
+        widget = _widget(at, kind, label)
+        if widget is None:
+            print(f"  {name:<22}{'(widget not found)':>36}")
+            continue
+        initial = widget.value
+        full, scoped = [], []
+        for i in range(repeat * len(values)):
+            widget = _widget(at, kind, label)
+            widget.set_value(_value(widget, values[i % len(values)], initial))
+            FRAGMENT_TIMES.clear()
+            start = time.perf_counter()
+            at.run()
+            full.append(time.perf_counter() - start)
+            if fragment in FRAGMENT_TIMES:
+                scoped.append(FRAGMENT_TIMES[fragment])
+        full_ms = statistics.median(full) * 1000
+        scoped_ms = statistics.median(scoped) * 1000 if scoped else None
+        latency = scoped_ms if scoped_ms is not None else full_ms
+        results[name] = latency
+        scoped_text = f"{scoped_ms:.1f}" if scoped_ms is not None else "-"
+        print(f"  {name:<22}{full_ms:>12.1f}{scoped_text:>12}{latency:>12.1f}")
+    for cache in FIGURE_CACHES:
+        stats = cache.stats()
+        print(f"  figure cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%}), {stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB, "
+              f"{stats['build_seconds']:.2f}s building")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-interaction latency of the Streamlit dashboard")
+    parser.add_argument("--script", default="dashboard.py")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sys.stdout.reconfigure(encoding='utf-8')
+    run(args.script, args.repeat)
@@ -0,0 +1,55 @@
+import sqlite3
+import sys
+import time
+import zlib
+
+from response_cache import CACHE_FILE
+from scholar_parsers import PARSERS
+
+# ==============================================================================
+# PARSER BENCHMARK
+# ==============================================================================
+# Times every available Scholar page parser on the pages in the response cache
+# and checks that they agree.
+# Usage: python bench_parsers.py [cache_file] [repeats]
+
+def load_cached_pages(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute(
+        "SELECT r.url, b.body FROM responses r JOIN bodies b ON b.content_hash = r.content_hash "
+        "WHERE r.endpoint = 'scholar'"
+    ).fetchall()
+    conn.close()
+    return [(url, zlib.decompress(blob).decode("utf-8", errors="replace")) for url, blob in rows]
+
+def bench(parser, pages, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        results = []
+        for url, html in pages:
+            if "cstart=" in url:
+                results.append(parser.parse_publications(html))
+            else:
+                results.append(parser.parse_metrics(html))
+    return time.perf_counter() - start, results
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else CACHE_FILE
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    pages = load_cached_pages(path)
+    if not pages:
+        print(f"No cached Scholar pages in {path}. Run the scraper once to fill the cache.")
+        sys.exit(1)
+
+    print(f"{len(pages)} cached pages, {repeats} repeats\n")
+    baseline = None
+    for name, parser_cls in PARSERS.items():
+        elapsed, results = bench(parser_cls(), pages, repeats)
+        per_page = elapsed / (len(pages) * repeats) * 1000
+        note = ""
+        if baseline is None:
+            baseline = (elapsed, results)
+        else:
+            note = f"  {baseline[0] / elapsed:.1f}x vs {next(iter(PARSERS))}"
+            note += "" if results == baseline[1] else "  (RESULTS DIFFER)"
+        print(f"{name:>6}: {elapsed:.2f}s total, {per_page:.2f} ms/page{note}")
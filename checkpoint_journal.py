@@ -0,0 +1,94 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+# ==============================================================================
+# ROW-LEVEL CHECKPOINT JOURNAL
+# ==============================================================================
+# Append-only record of every scraped awardee row, written right after the row
+# is finished (SQLite in WAL mode, safe for several worker threads/processes).
+#   * Resume: completed_indices() is a primary-key lookup, so a crash loses at
+#     most the rows in flight instead of a whole 20-row batch.
+#   * Merge: iter_rows() streams the rows in source order for merge_and_validate.
+# A row that is scraped again (e.g. a manual rerun) replaces its earlier entry.
+
+JOURNAL_FILE = os.environ.get("SCRAPE_JOURNAL_FILE", "data/scrape_journal.sqlite")
+
+def _clean(value):
+    """Makes pandas/numpy scalars JSON-friendly (NaN -> None)."""
+    if value is None:
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+class CheckpointJournal:
+    def __init__(self, path=JOURNAL_FILE):
+        self.path = path
+        self.local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        # SQLite connections must not be shared with forked worker processes
+        if conn is None or self.local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rows (
+                    row_index INTEGER PRIMARY KEY,
+                    scholar_id TEXT,
+                    data TEXT NOT NULL,
+                    recorded_at REAL NOT NULL
+                )
+            """)
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def record(self, row_index, row):
+        """Stores one finished row (a dict or pandas Series)."""
+        data = {k: _clean(v) for k, v in dict(row).items()}
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?)",
+                         (int(row_index), data.get("scholar_id"),
+                          json.dumps(data, ensure_ascii=False), time.time()))
+
+    def completed_indices(self, start=None, end=None):
+        query = "SELECT row_index FROM rows"
+        params = ()
+        if start is not None and end is not None:
+            query += " WHERE row_index >= ? AND row_index < ?"
+            params = (start, end)
+        return {r[0] for r in self._conn().execute(query, params)}
+
+    def get(self, row_index):
+        row = self._conn().execute("SELECT data FROM rows WHERE row_index = ?", (int(row_index),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_rows(self):
+        """Yields (row_index, data dict) in source order."""
+        for row_index, data in self._conn().execute("SELECT row_index, data FROM rows ORDER BY row_index"):
+            yield row_index, json.loads(data)
+
+    def to_frame(self):
+        indices, records = [], []
+        for row_index, data in self.iter_rows():
+            indices.append(row_index)
+            records.append(data)
+        return pd.DataFrame.from_records(records, index=indices)
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+# Shared by every scraper in the process
+JOURNAL = CheckpointJournal()
@@ -3,6 +3,11 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import plotly.io as pio
+import os
+import data_store
+import dashboard_aggregates
+import figure_factory
+from yearly_series import YearlySeries
 
 # Sayfa yapılandırması
 st.set_page_config(page_title="TÜBA GEBİP Akademik Performans Keşif Aracı", layout="wide", page_icon="📊")
@@ -13,14 +18,38 @@ st.markdown("TÜBA GEBİP ödül sahiplerinin akademik metriklerini keşfedin. G
 # Veri yükleme
 @st.cache_data
 def load_data():
-    df = pd.read_csv("data/gebip_scholar_final.csv")
-    # Sayısal sütunları garantiye al
-    numeric_cols = ['yili', 'toplam_atif', 'h_indeksi', 'i10_indeksi', 
-                    'toplam_yayin', 'odul_aninda_atif', 'odul_aninda_yayin']
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    return df
+    # Kanonik veri deposu varsa oradan, yoksa dışa aktarılan CSV'den oku
+    return dashboard_aggregates.load_frame()
+
+# Verinin içerik özeti; önceden hesaplanmış özetlerin güncelliğini kontrol eder
+@st.cache_data
+def data_version():
+    return dashboard_aggregates.source_hash(load_data())
+
+# Önceden hesaplanmış özetler (python dashboard_aggregates.py); eski ya da
+# yoksa bellekte bir kez hesaplanır ve tüm oturumlarca paylaşılır
+@st.cache_resource
+def load_aggregates(version):
+    aggregates = dashboard_aggregates.DashboardAggregates.load()
+    if aggregates is None or aggregates.source != version:
+        aggregates = dashboard_aggregates.DashboardAggregates.build(load_data())
+    return aggregates
+
+# Yıllık seriler (araştırmacı, yıl, atıf, yayın); indeks = araştırmacı kimliği
+@st.cache_resource
+def load_yearly_series():
+    if os.path.exists(data_store.DB_FILE):
+        conn = data_store.connect()
+        series = data_store.load_series(conn)
+        conn.close()
+        return series
+    return YearlySeries.from_frame(load_data())
+
+# Grafik fabrikası: serileştirilmiş grafiklerin tüm oturumlarca paylaşılan önbelleği
+@st.cache_resource
+def load_figure_factory(version):
+    df = load_data()
+    return figure_factory.FigureFactory(df, dashboard_aggregates.has_scholar_id(df), load_yearly_series(), version)
 
 try:
     df = load_data()
@@ -28,15 +57,59 @@ except FileNotFoundError:
     st.error("Veri dosyası 'data/gebip_scholar_final.csv' bulunamadı.")
     st.stop()
 
+version = data_version()
+aggregates = load_aggregates(version)
+figures = load_figure_factory(version)
+has_id = dashboard_aggregates.has_scholar_id(df)
+
+# --- Ortak Filtreler ---
+# Keşif Aracı ve Özet İstatistikler sekmeleri bu filtreleri paylaşır; değişmeleri
+# tüm sayfayı yeniden çalıştırır. Her sekmenin kendi kontrolleri ise sekmenin
+# fragment'ı içindedir ve yalnızca o sekmeyi yeniden çalıştırır.
+st.sidebar.header("🔍 Filtreler")
+
+# Yıl filtresi
+min_year = int(df['yili'].min())
+max_year = int(df['yili'].max())
+selected_years = st.sidebar.slider("Yıl Aralığı", min_year, max_year, (min_year, max_year))
+
+# Alan filtresi
+all_fields = sorted(df['genel_alan'].dropna().unique().tolist())
+
+# Session state initialization for multiselect
+if "selected_fields_key" not in st.session_state:
+    st.session_state.selected_fields_key = all_fields
+
+def select_all_fields():
+    st.session_state.selected_fields_key = all_fields
+
+def deselect_all_fields():
+    st.session_state.selected_fields_key = []
+
+col_btn1, col_btn2 = st.sidebar.columns(2)
+col_btn1.button("Tümünü Seç", on_click=select_all_fields)
+col_btn2.button("Temizle", on_click=deselect_all_fields)
+
+selected_fields = st.sidebar.multiselect("Genel Alana Göre Filtrele", options=all_fields, key="selected_fields_key")
+
+# Scholar ID filtresi (sadece ID'si olanlar)
+only_with_id = st.sidebar.checkbox("Sadece Scholar ID'si Olanlar", value=True)
+
+filters = (tuple(selected_years), tuple(selected_fields), only_with_id)
+
+all_researchers_sorted = sorted(df['adi_soyadi'].dropna().unique().tolist())
+
 # --- Sekmeler ---
 tab1, tab3, tab2, tab4, tab5, tab6 = st.tabs(["📈 Keşif Aracı", "📊 Özet İstatistikler", "👤 Araştırmacı Profili", "🏆 Ödül Anı Analizi", "📋 Veri Tablosu", "ℹ️ Hakkında"])
 
-with tab1:
-    # --- Kenar Çubuğu Kontrolleri ---
-    st.sidebar.header("🎨 Görselleştirme Ayarları")
+@st.fragment
+def explorer_tab(filters):
+    # --- Görselleştirme Ayarları ---
+    with st.expander("🎨 Görselleştirme Ayarları", expanded=True):
+        col_axes, col_style, col_view = st.columns(3)
 
     # Eksen Seçimi
-    st.sidebar.subheader("Eksenler")
+    col_axes.subheader("Eksenler")
     axis_options = {
         "Ödül Yılı": "yili",
         "Toplam Atıf": "toplam_atif",
@@ -47,17 +120,17 @@ with tab1:
         "Ödül Anında Yayın": "odul_aninda_yayin"
     }
     
-    x_axis_label = st.sidebar.selectbox("X Ekseni", options=list(axis_options.keys()), index=0)
-    y_axis_label = st.sidebar.selectbox("Y Ekseni", options=list(axis_options.keys()), index=1)
+    x_axis_label = col_axes.selectbox("X Ekseni", options=list(axis_options.keys()), index=0)
+    y_axis_label = col_axes.selectbox("Y Ekseni", options=list(axis_options.keys()), index=1)
     
     # Logaritmik Ölçek Seçeneği
-    log_y = st.sidebar.checkbox("Logaritmik Y Ekseni", value=True)
+    log_y = col_axes.checkbox("Logaritmik Y Ekseni", value=True)
     
     x_col = axis_options[x_axis_label]
     y_col = axis_options[y_axis_label]
 
     # Görsel Kodlama
-    st.sidebar.subheader("🎨 Stil")
+    col_style.subheader("🎨 Stil")
     
     # Renk
     color_options = {
@@ -67,176 +140,40 @@ with tab1:
         "Kurum": "calistigi_kurum", 
         "Ödül Yılı": "yili"
     }
-    color_label = st.sidebar.selectbox("Renklendir", options=list(color_options.keys()), index=1)
+    color_label = col_style.selectbox("Renklendir", options=list(color_options.keys()), index=1)
     color_col = color_options[color_label]
 
-    # Vurgulama
-    st.sidebar.subheader("✨ Vurgulama")
-    all_researchers_sorted = sorted(df['adi_soyadi'].dropna().unique().tolist())
-    highlight_options = ["Hiçbiri"] + all_researchers_sorted
-    
-    highlight_researcher = st.sidebar.selectbox(
-        "Araştırmacı Vurgula", 
-        options=highlight_options,
-        index=0
-    )
-    
-
-
-    # Filtreleme
-    st.sidebar.subheader("🔍 Filtreler")
-    
-    # Yıl filtresi
-    min_year = int(df['yili'].min())
-    max_year = int(df['yili'].max())
-    selected_years = st.sidebar.slider("Yıl Aralığı", min_year, max_year, (min_year, max_year))
-    
-    # Alan filtresi
-    # Alan filtresi
-    all_fields = sorted(df['genel_alan'].dropna().unique().tolist())
-    
-    # Session state initialization for multiselect
-    if "selected_fields_key" not in st.session_state:
-        st.session_state.selected_fields_key = all_fields
-
-    def select_all_fields():
-        st.session_state.selected_fields_key = all_fields
-
-    def deselect_all_fields():
-        st.session_state.selected_fields_key = []
-
-    col_btn1, col_btn2 = st.sidebar.columns(2)
-    col_btn1.button("Tümünü Seç", on_click=select_all_fields)
-    col_btn2.button("Temizle", on_click=deselect_all_fields)
-
-    selected_fields = st.sidebar.multiselect("Genel Alana Göre Filtrele", options=all_fields, key="selected_fields_key")
-    
-    # Scholar ID filtresi (sadece ID'si olanlar)
-    only_with_id = st.sidebar.checkbox("Sadece Scholar ID'si Olanlar", value=True)
-
-    # Filtreleri Uygula
-    df_plot = df[
-        (df['yili'] >= selected_years[0]) & 
-        (df['yili'] <= selected_years[1]) &
-        (df['genel_alan'].isin(selected_fields))
-    ]
-    
-    if only_with_id:
-        df_plot = df_plot[df_plot['scholar_id'] != 'no id found']
-    
-    # İstatistikler için filtrelenmiş veriyi sakla (Axis NA filtresinden önce)
-    df_filtered_stats = df_plot.copy()
-
-    df_plot = df_plot.dropna(subset=[x_col, y_col])
-
-    st.sidebar.markdown("---")
-    st.sidebar.subheader("📐 Görünüm Ayarları")
-    
-    # Boyut (Alta taşındı)
+    # Boyut
     size_options = {
         "Hiçbiri": None, 
         "H-İndeksi": "h_indeksi", 
         "Toplam Atıf": "toplam_atif", 
         "Toplam Yayın": "toplam_yayin"
     }
-    size_label = st.sidebar.selectbox("Boyutlandır", options=list(size_options.keys()), index=1)
+    size_label = col_style.selectbox("Boyutlandır", options=list(size_options.keys()), index=1)
     size_col = size_options[size_label]
+
+    # Vurgulama ve görünüm
+    col_view.subheader("✨ Vurgulama")
+    highlight_options = ["Hiçbiri"] + all_researchers_sorted
+    
+    highlight_researcher = col_view.selectbox(
+        "Araştırmacı Vurgula", 
+        options=highlight_options,
+        index=0
+    )
     
-    opacity = st.sidebar.slider("Nokta Opaklığı", 0.1, 1.0, 0.7)
+    opacity = col_view.slider("Nokta Opaklığı", 0.1, 1.0, 0.7)
 
-    # Plotly'nin size parametresi NaN değerlerden hoşlanmadığı için temizle
-    if size_col and size_col in df_plot.columns:
-        df_plot = df_plot.dropna(subset=[size_col])
+    # Filtreleri Uygula
+    df_plot = figures.explorer_rows(filters, x_col, y_col, size_col)
 
     # --- Çizim ---
     if df_plot.empty:
         st.warning("⚠️ Seçilen filtreler için veri bulunmuyor.")
     else:
-        # Hover verisi
-        hover_data = {
-            'adi_soyadi': True, 
-            'calistigi_kurum': True, 
-            'alan': True,
-            'genel_alan': True,
-            'yili': True,
-            'h_indeksi': True,
-            'toplam_atif': True,
-            'toplam_yayin': True
-        }
-        
-        # Sütun isimlerini Türkçeleştirme haritası
-        labels_map = {
-            'yili': 'Ödül Yılı',
-            'toplam_atif': 'Toplam Atıf',
-            'h_indeksi': 'H-İndeksi',
-            'i10_indeksi': 'i10-İndeksi',
-            'toplam_yayin': 'Toplam Yayın',
-            'odul_aninda_atif': 'Ödül Anında Atıf',
-            'odul_aninda_yayin': 'Ödül Anında Yayın',
-            'genel_alan': 'Genel Alan',
-            'alan': 'Alan',
-            'calistigi_kurum': 'Kurum',
-            'adi_soyadi': 'Adı Soyadı'
-        }
-
-        fig = px.scatter(
-            df_plot,
-            x=x_col,
-            y=y_col,
-            color=color_col,
-            size=size_col,
-            size_max=25,
-            opacity=opacity,
-
-            log_y=log_y,
-            hover_name="adi_soyadi",
-            hover_data=hover_data,
-            title=f"{y_axis_label} vs. {x_axis_label}",
-            labels=labels_map,
-            height=650
-        )
-
-        # Vurgulanan araştırmacıyı ekle
-        if highlight_researcher and highlight_researcher != "Hiçbiri":
-            highlighted_data = df_plot[df_plot['adi_soyadi'] == highlight_researcher]
-            if not highlighted_data.empty:
-                # Siyah çember içine al (Annotation symbol replacement)
-                fig.add_trace(
-                    go.Scatter(
-                        x=highlighted_data[x_col],
-                        y=highlighted_data[y_col],
-                        mode='markers',
-                        marker=dict(
-                            color='black',
-                            size=18,
-                            symbol='circle-open', 
-                            line=dict(width=3, color='black')
-                        ),
-                        name="Vurgulanan",
-                        hoverinfo='skip',
-                        showlegend=False
-                    )
-                )
-                
-                # Başlığa ismi ekle (Formatlı)
-                fig.update_layout(
-                    title={
-                        'text': f"{y_axis_label} vs. {x_axis_label}<br><span style='font-size: 75%; color: gray;'>({highlight_researcher} siyah çember ile işaretlenmiştir)</span>",
-                        'y': 0.95,
-                        'x': 0.5,
-                        'xanchor': 'center',
-                        'yanchor': 'top'
-                    }
-                )
-
-        
-        fig.update_layout(
-            font=dict(size=12),
-            title_font_size=18
-        )
-        
-
-
+        fig = figures.explorer(filters, x_col, y_col, x_axis_label, y_axis_label, log_y,
+                               color_col, size_col, opacity, highlight_researcher)
         st.plotly_chart(fig, use_container_width=True)
         
         # Metrikleri göster
@@ -249,15 +186,17 @@ with tab1:
             st.metric("Ortalama Toplam Atıf", f"{df_plot['toplam_atif'].mean():.0f}")
         with col4:
             st.metric("Ortalama Toplam Yayın", f"{df_plot['toplam_yayin'].mean():.0f}")
-        
 
+with tab1:
+    explorer_tab(filters)
 
-with tab2:
+@st.fragment
+def profile_tab():
     st.header("👤 Araştırmacı Profili")
     st.markdown("Bireysel araştırmacıların detaylı akademik profillerini inceleyin.")
     
     # Sadece ID'si olanları listele
-    df_with_id = df[df['scholar_id'] != 'no id found'].copy()
+    df_with_id = df[has_id]
     
     # Araştırmacı seçimi
     researcher_names = sorted(df_with_id['adi_soyadi'].tolist())
@@ -282,7 +221,7 @@ with tab2:
             st.markdown(f"**🏆 Ödül Yılı:** {int(researcher_data['yili']) if pd.notna(researcher_data['yili']) else 'N/A'}")
             st.markdown(f"**📚 Detaylı Alan:** {researcher_data['alan'] if pd.notna(researcher_data['alan']) else 'N/A'}")
         with col3:
-            if pd.notna(researcher_data['scholar_id']) and researcher_data['scholar_id'] != 'no id found':
+            if has_id[researcher_data.name]:
                 scholar_url = f"https://scholar.google.com/citations?user={researcher_data['scholar_id']}"
                 st.markdown(f"**🔗 [Google Scholar Profili]({scholar_url})**")
         
@@ -404,110 +343,21 @@ with tab2:
         
         col1, col2 = st.columns(2)
         
-        # Yıllık atıf verilerini parse et
-        def parse_yearly_data(data_str):
-            if pd.isna(data_str) or data_str == '':
-                return {}, []
-            
-            data_dict = {}
-            pairs = str(data_str).split('|')
-            for pair in pairs:
-                pair = pair.strip()
-                if ':' in pair:
-                    year, count = pair.split(':')
-                    try:
-                        data_dict[int(year.strip())] = int(count.strip())
-                    except ValueError:
-                        continue
-            
-            if data_dict:
-                years = sorted(data_dict.keys())
-                cumulative = []
-                total = 0
-                for year in years:
-                    total += data_dict[year]
-                    cumulative.append(total)
-                return data_dict, list(zip(years, cumulative))
-            return {}, []
+        # Yıllık seriler (ingest sırasında ayrıştırılmış); grafikler fabrikadan
+        award_year = int(researcher_data['yili']) if pd.notna(researcher_data['yili']) else None
         
         with col1:
             # Atıf zaman serisi
-            cit_data, cit_cumulative = parse_yearly_data(researcher_data['yillik_atif'])
-            
-            if cit_cumulative:
-                years, cumulative_cits = zip(*cit_cumulative)
-                
-                fig_cit_time = go.Figure()
-                fig_cit_time.add_trace(go.Scatter(
-                    x=years,
-                    y=cumulative_cits,
-                    mode='lines+markers',
-                    name='Kümülatif Atıf',
-                    line=dict(color='blue', width=2),
-                    marker=dict(size=6)
-                ))
-                
-                # Ödül yılı çizgisi
-                if pd.notna(researcher_data['yili']):
-                    award_year = int(researcher_data['yili'])
-                    fig_cit_time.add_vline(
-                        x=award_year,
-                        line_dash="dash",
-                        line_color="red",
-                        annotation_text="Ödül Yılı",
-                        annotation_position="top"
-                    )
-                
-                fig_cit_time.update_layout(
-                    title="Kümülatif Atıf Sayısı",
-                    xaxis_title="Yıl",
-                    yaxis_title="Kümülatif Atıf",
-                    yaxis_type="log" if use_log_scale else "linear",
-                    height=400,
-                    xaxis=dict(title=dict(font=dict(size=14)), tickfont=dict(size=12)),
-                    yaxis=dict(title=dict(font=dict(size=14)), tickfont=dict(size=12))
-                )
+            fig_cit_time = figures.time_series(int(researcher_data.name), 'citations', award_year, use_log_scale)
+            if fig_cit_time is not None:
                 st.plotly_chart(fig_cit_time, use_container_width=True)
             else:
                 st.info("Yıllık atıf verisi mevcut değil")
         
         with col2:
             # Yayın zaman serisi
-            pub_data, pub_cumulative = parse_yearly_data(researcher_data['yillik_yayin'])
-            
-            if pub_cumulative:
-                years, cumulative_pubs = zip(*pub_cumulative)
-                
-                fig_pub_time = go.Figure()
-                fig_pub_time.add_trace(go.Scatter(
-                    x=years,
-                    y=cumulative_pubs,
-                    mode='lines+markers',
-                    name='Kümülatif Yayın',
-                    line=dict(color='green', width=2),
-                    marker=dict(size=6)
-                ))
-                
-                # Ödül yılı çizgisi
-                if pd.notna(researcher_data['yili']):
-                    award_year = int(researcher_data['yili'])
-                    fig_pub_time.add_vline(
-                        x=award_year,
-                        line_dash="dash",
-                        line_color="red",
-                        annotation_text="Ödül Yılı",
-                        annotation_position="top"
-                    )
-                
-                fig_pub_time.update_layout(
-                    title="Kümülatif Yayın Sayısı",
-                    xaxis_title="Yıl",
-                    yaxis_title="Kümülatif Yayın",
-                    yaxis_type="log" if use_log_scale else "linear",
-                    height=400,
-                    xaxis=dict(title=dict(font=dict(size=14)), tickfont=dict(size=12)),
-                    yaxis=dict(title=dict(font=dict(size=14)), tickfont=dict(size=12))
-                )
+            fig_pub_time = figures.time_series(int(researcher_data.name), 'documents', award_year, use_log_scale)
+            if fig_pub_time is not None:
                 st.plotly_chart(fig_pub_time, use_container_width=True)
             else:
                 st.info("Yıllık yayın verisi mevcut değil")
@@ -517,41 +367,31 @@ with tab2:
         # Alan içi karşılaştırma
         st.subheader("📊 Alan İçi Karşılaştırma")
         
-        # Aynı alandaki diğer araştırmacılar
-        same_field = df_with_id[df_with_id['genel_alan'] == researcher_data['genel_alan']]
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            # H-indeksi sıralaması
-            h_rank = (same_field['h_indeksi'] > researcher_data['h_indeksi']).sum() + 1
-            h_percentile = (1 - h_rank / len(same_field)) * 100
-            st.metric(
-                f"H-İndeksi Sıralaması ({researcher_data['genel_alan']})",
-                f"{h_rank} / {len(same_field)}",
-                f"Üst %{h_percentile:.0f}",
-                help=f"Aynı alanda {len(same_field)} araştırmacı var"
+        # Alan içi sıralamalar önceden hesaplandı (dashboard_aggregates)
+        ranks = aggregates.row(df.index.get_loc(researcher_data.name))
+        field_size = int(ranks['field_size']) if pd.notna(ranks['field_size']) else 0
+        
+        def rank_metric(col, label, rank_col, help=None):
+            if field_size == 0:
+                col.metric(f"{label} ({researcher_data['genel_alan']})", "N/A", help=help)
+                return
+            rank = int(ranks[rank_col])
+            percentile = (1 - rank / field_size) * 100
+            col.metric(
+                f"{label} ({researcher_data['genel_alan']})",
+                f"{rank} / {field_size}",
+                f"Üst %{percentile:.0f}",
+                help=help
             )
         
-        with col2:
-            # Atıf sıralaması
-            cit_rank = (same_field['toplam_atif'] > researcher_data['toplam_atif']).sum() + 1
-            cit_percentile = (1 - cit_rank / len(same_field)) * 100
-            st.metric(
-                f"Atıf Sıralaması ({researcher_data['genel_alan']})",
-                f"{cit_rank} / {len(same_field)}",
-                f"Üst %{cit_percentile:.0f}"
-            )
+        col1, col2, col3 = st.columns(3)
         
-        with col3:
-            # Yayın sıralaması
-            pub_rank = (same_field['toplam_yayin'] > researcher_data['toplam_yayin']).sum() + 1
-            pub_percentile = (1 - pub_rank / len(same_field)) * 100
-            st.metric(
-                f"Yayın Sıralaması ({researcher_data['genel_alan']})",
-                f"{pub_rank} / {len(same_field)}",
-                f"Üst %{pub_percentile:.0f}"
-            )
+        # H-indeksi sıralaması
+        rank_metric(col1, "H-İndeksi Sıralaması", 'h_rank', help=f"Aynı alanda {field_size} araştırmacı var")
+        # Atıf sıralaması
+        rank_metric(col2, "Atıf Sıralaması", 'cit_rank')
+        # Yayın sıralaması
+        rank_metric(col3, "Yayın Sıralaması", 'pub_rank')
         
         # İlgi alanları
         if pd.notna(researcher_data['ilgi_alanlari']) and researcher_data['ilgi_alanlari'] != '':
@@ -562,53 +402,68 @@ with tab2:
     else:
         st.info("Lütfen bir araştırmacı seçin")
 
-with tab3:
+with tab2:
+    profile_tab()
+
+# Özet istatistik grafikleri ve tabloları; önceden hesaplanmış özetlerden
+# dilimlenir ve filtre değerleriyle önbelleğe alınır
+@st.cache_data
+def stats_figures(filters):
+    inst_counts = aggregates.institution_counts(*filters).reset_index()
+    inst_counts.columns = ['Kurum', 'Sayı']
+    fig_inst = px.bar(
+        inst_counts, 
+        x='Sayı', 
+        y='Kurum', 
+        orientation='h', 
+        title="Ödül Sayısına Göre İlk 15 Kurum"
+    )
+    fig_inst.update_traces(marker_color='#1f77b4')
+    fig_inst.update_layout(yaxis={'categoryorder':'total ascending'})
+
+    field_counts = aggregates.field_counts(*filters).reset_index()
+    field_counts.columns = ['Genel Alan', 'Sayı']
+    fig_field = px.pie(
+        field_counts, 
+        values='Sayı', 
+        names='Genel Alan', 
+        title="Genel Alana Göre Ödüller",
+        hole=0.3
+    )
+
+    year_counts = aggregates.year_counts(*filters).reset_index()
+    year_counts.columns = ['Yıl', 'Sayı']
+    fig_year = px.bar(
+        year_counts, 
+        x='Yıl', 
+        y='Sayı', 
+        title="Yıllara Göre Ödül Sayısı"
+    )
+    fig_year.update_traces(marker_color='#1f77b4')
+    return fig_inst, fig_field, fig_year
+
+@st.cache_data
+def stats_tops(filters):
+    return {metric: aggregates.top(metric, *filters) for metric in ['h_indeksi', 'toplam_atif', 'toplam_yayin']}
+
+def stats_tab(filters):
     st.header("📊 Özet İstatistikler")
     
-    # Sadece ID'si olanları kullan (Filtrelenmiş veri üzerinden)
-    df_stats = df_filtered_stats.copy()
+    fig_inst, fig_field, fig_year = stats_figures(filters)
+    tops = stats_tops(filters)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("🏛️ En Çok Ödül Alan Kurumlar")
-        inst_counts = df_stats['calistigi_kurum'].value_counts().head(15).reset_index()
-        inst_counts.columns = ['Kurum', 'Sayı']
-        fig_inst = px.bar(
-            inst_counts, 
-            x='Sayı', 
-            y='Kurum', 
-            orientation='h', 
-            title="Ödül Sayısına Göre İlk 15 Kurum"
-        )
-        fig_inst.update_traces(marker_color='#1f77b4')
-        fig_inst.update_layout(yaxis={'categoryorder':'total ascending'})
         st.plotly_chart(fig_inst, use_container_width=True)
         
     with col2:
         st.subheader("🔬 Alan Dağılımı")
-        field_counts = df_stats['genel_alan'].value_counts().reset_index()
-        field_counts.columns = ['Genel Alan', 'Sayı']
-        fig_field = px.pie(
-            field_counts, 
-            values='Sayı', 
-            names='Genel Alan', 
-            title="Genel Alana Göre Ödüller",
-            hole=0.3
-        )
         st.plotly_chart(fig_field, use_container_width=True)
     
     # Yıllara göre dağılım
     st.subheader("📅 Yıllara Göre Ödül Dağılımı")
-    year_counts = df_stats['yili'].value_counts().sort_index().reset_index()
-    year_counts.columns = ['Yıl', 'Sayı']
-    fig_year = px.bar(
-        year_counts, 
-        x='Yıl', 
-        y='Sayı', 
-        title="Yıllara Göre Ödül Sayısı"
-    )
-    fig_year.update_traces(marker_color='#1f77b4')
     st.plotly_chart(fig_year, use_container_width=True)
     
     # En yüksek metrikler
@@ -618,25 +473,24 @@ with tab3:
     
     with col1:
         st.markdown("**En Yüksek H-İndeksi**")
-        top_h = df_stats.nlargest(5, 'h_indeksi')[['adi_soyadi', 'h_indeksi', 'yili']]
-        st.dataframe(top_h, hide_index=True)
+        st.dataframe(tops['h_indeksi'], hide_index=True)
     
     with col2:
         st.markdown("**En Çok Atıf**")
-        top_cit = df_stats.nlargest(5, 'toplam_atif')[['adi_soyadi', 'toplam_atif', 'yili']]
-        st.dataframe(top_cit, hide_index=True)
+        st.dataframe(tops['toplam_atif'], hide_index=True)
     
     with col3:
         st.markdown("**En Çok Yayın**")
-        top_pub = df_stats.nlargest(5, 'toplam_yayin')[['adi_soyadi', 'toplam_yayin', 'yili']]
-        st.dataframe(top_pub, hide_index=True)
+        st.dataframe(tops['toplam_yayin'], hide_index=True)
 
-with tab4:
+with tab3:
+    stats_tab(filters)
+
+@st.fragment
+def award_tab():
     st.header("🏆 Ödül Anı Analizi")
     st.markdown("Araştırmacıların ödül aldıkları andaki akademik performanslarını inceleyin.")
     
-    df_award = df[df['scholar_id'] != 'no id found'].copy()
-    
     # Kontroller
     col_c1, col_c2, col_c3 = st.columns(3)
     with col_c1:
@@ -644,7 +498,6 @@ with tab4:
     with col_c2:
         log_y_award = st.checkbox("Logaritmik Y Ekseni", value=True, key="award_log_y")
     with col_c3:
-        all_researchers_sorted = sorted(df['adi_soyadi'].dropna().unique().tolist())
         highlight_award = st.selectbox("Araştırmacı Vurgula", ["Hiçbiri"] + all_researchers_sorted, key="award_highlight")
 
     # Ödül anı vs şu anki karşılaştırma
@@ -652,121 +505,12 @@ with tab4:
     
     with col1:
         st.subheader("📈 Atıf Artışı")
-        df_award['atif_artisi'] = df_award['toplam_atif'] - df_award['odul_aninda_atif']
-        
-        fig_cit_growth = px.scatter(
-            df_award,
-            x='odul_aninda_atif',
-            y='toplam_atif',
-            color='genel_alan',
-            hover_name='adi_soyadi',
-            hover_data=['yili', 'h_indeksi'],
-            title="Ödül Anı vs Güncel Atıf Sayısı",
-            log_x=log_x_award,
-            log_y=log_y_award,
-            labels={
-                'odul_aninda_atif': 'Ödül Anında Atıf',
-                'toplam_atif': 'Güncel Toplam Atıf',
-                'genel_alan': 'Genel Alan'
-            }
-        )
-        # Diagonal line (y=x)
-        max_val_cit = max(df_award['toplam_atif'].max(), df_award['odul_aninda_atif'].max())
-        fig_cit_growth.add_trace(
-            go.Scatter(x=[0, max_val_cit], y=[0, max_val_cit], 
-                      mode='lines', name='y=x', 
-                      line=dict(dash='dash', color='gray'))
-        )
-        
-        # Vurgulama
-        if highlight_award and highlight_award != "Hiçbiri":
-            highlighted_data = df_award[df_award['adi_soyadi'] == highlight_award]
-            if not highlighted_data.empty:
-                # Siyah çember
-                fig_cit_growth.add_trace(
-                    go.Scatter(
-                        x=highlighted_data['odul_aninda_atif'],
-                        y=highlighted_data['toplam_atif'],
-                        mode='markers',
-                        marker=dict(color='black', size=18, symbol='circle-open', line=dict(width=3, color='black')),
-                        name="Vurgulanan",
-                        showlegend=False
-                    )
-                )
-                
-                # Başlığa ismi ekle (Formatlı)
-                fig_cit_growth.update_layout(
-                    title={
-                        'text': f"Ödül Anı vs Güncel Atıf Sayısı<br><span style='font-size: 75%; color: gray;'>({highlight_award} siyah çember ile işaretlenmiştir)</span>",
-                        'y': 0.95,
-                        'x': 0.5,
-                        'xanchor': 'center',
-                        'yanchor': 'top'
-                    }
-                )
-
-        # Remove legend for the first plot
-        fig_cit_growth.update_layout(showlegend=False)
-
-
+        fig_cit_growth = figures.award_scatter("atif", log_x_award, log_y_award, highlight_award)
         st.plotly_chart(fig_cit_growth, use_container_width=True)
     
     with col2:
         st.subheader("📚 Yayın Artışı")
-        df_award['yayin_artisi'] = df_award['toplam_yayin'] - df_award['odul_aninda_yayin']
-        
-        fig_pub_growth = px.scatter(
-            df_award,
-            x='odul_aninda_yayin',
-            y='toplam_yayin',
-            color='genel_alan',
-            hover_name='adi_soyadi',
-            hover_data=['yili', 'h_indeksi'],
-            title="Ödül Anı vs Güncel Yayın Sayısı",
-            log_x=log_x_award,
-            log_y=log_y_award,
-            labels={
-                'odul_aninda_yayin': 'Ödül Anında Yayın',
-                'toplam_yayin': 'Güncel Toplam Yayın',
-                'genel_alan': 'Genel Alan'
-            }
-        )
-        # Diagonal line (y=x)
-        max_val_pub = max(df_award['toplam_yayin'].max(), df_award['odul_aninda_yayin'].max())
-        fig_pub_growth.add_trace(
-            go.Scatter(x=[0, max_val_pub], y=[0, max_val_pub], 
-                      mode='lines', name='y=x', 
-                      line=dict(dash='dash', color='gray'))
-        )
-
-        # Vurgulama
-        if highlight_award and highlight_award != "Hiçbiri":
-            highlighted_data = df_award[df_award['adi_soyadi'] == highlight_award]
-            if not highlighted_data.empty:
-                # Siyah çember
-                fig_pub_growth.add_trace(
-                    go.Scatter(
-                        x=highlighted_data['odul_aninda_yayin'],
-                        y=highlighted_data['toplam_yayin'],
-                        mode='markers',
-                        marker=dict(color='black', size=18, symbol='circle-open', line=dict(width=3, color='black')),
-                        name="Vurgulanan",
-                        showlegend=False
-                    )
-                )
-
-                # Başlığa ismi ekle (Formatlı)
-                fig_pub_growth.update_layout(
-                    title={
-                        'text': f"Ödül Anı vs Güncel Yayın Sayısı<br><span style='font-size: 75%; color: gray;'>({highlight_award} siyah çember ile işaretlenmiştir)</span>",
-                        'y': 0.95,
-                        'x': 0.5,
-                        'xanchor': 'center',
-                        'yanchor': 'top'
-                    }
-                )
-
-
+        fig_pub_growth = figures.award_scatter("yayin", log_x_award, log_y_award, highlight_award)
         st.plotly_chart(fig_pub_growth, use_container_width=True)
     
     # En çok büyüyenler
@@ -776,28 +520,34 @@ with tab4:
     
     with col1:
         st.markdown("**Atıf Artışı (Mutlak)**")
-        top_growth_cit = df_award.nlargest(10, 'atif_artisi')[['adi_soyadi', 'odul_aninda_atif', 'toplam_atif', 'atif_artisi', 'yili']]
+        # Artışlar önceden hesaplandı (dashboard_aggregates)
+        top_growth_cit = aggregates.growth_top('atif_artisi')
         st.dataframe(top_growth_cit, hide_index=True)
     
     with col2:
         st.markdown("**Yayın Artışı (Mutlak)**")
-        top_growth_pub = df_award.nlargest(10, 'yayin_artisi')[['adi_soyadi', 'odul_aninda_yayin', 'toplam_yayin', 'yayin_artisi', 'yili']]
+        top_growth_pub = aggregates.growth_top('yayin_artisi')
         st.dataframe(top_growth_pub, hide_index=True)
 
-with tab5:
+with tab4:
+    award_tab()
+
+# Aramayla eşleşen satırların konumları
+@st.cache_data
+def search_positions(search):
+    mask = (df['adi_soyadi'].str.contains(search, case=False, na=False) |
+            df['calistigi_kurum'].str.contains(search, case=False, na=False))
+    return mask.to_numpy().nonzero()[0]
+
+@st.fragment
+def table_tab():
     st.header("📋 Veri Tablosu")
     st.markdown("Tüm veriyi inceleyin ve arayın.")
     
     # Arama kutusu
     search = st.text_input("🔍 Araştırmacı Ara (Ad, Soyad, Kurum)", "")
     
-    df_display = df.copy()
-    
-    if search:
-        df_display = df_display[
-            df_display['adi_soyadi'].str.contains(search, case=False, na=False) |
-            df_display['calistigi_kurum'].str.contains(search, case=False, na=False)
-        ]
+    df_display = df.iloc[search_positions(search)] if search else df
     
     # Sütun seçimi
     all_cols = df_display.columns.tolist()
@@ -810,8 +560,9 @@ with tab5:
         st.dataframe(df_display[selected_cols], use_container_width=True, height=600)
     else:
         st.dataframe(df_display, use_container_width=True, height=600)
-    
 
+with tab5:
+    table_tab()
 
 # Tab 6: Hakkında (About)
 with tab6:
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import data_store
+
+# ==============================================================================
+# DASHBOARD AGGREGATES
+# ==============================================================================
+# python dashboard_aggregates.py   (also the "aggregates" stage of gebip.py)
+#
+# Precomputed views for dashboard.py, built once per data change instead of on
+# every Streamlit rerun. The sidebar filters (year range, genel_alan, only rows
+# with a Scholar ID) always select whole cells of (yili, genel_alan, has_id),
+# so every filtered statistic is a sum or merge over the selected cells:
+#   cells.parquet         researchers per cell
+#   institutions.parquet  researchers per (cell, calistigi_kurum)
+#   top.parquet           the TOP_N rows of every (cell, metric); the top TOP_N
+#                         of any set of cells is among them
+#   researchers.parquet   per-row columns in frame order: in-field ranks
+#                         (Profile tab) and growth since the award (Award tab)
+#   growth_top.parquet    largest growth since the award, rows with an ID
+#   manifest.json         hash of the source data, build time
+# The dashboard loads the directory once per process; when the manifest does
+# not match the data it loaded (or there are no artifacts) it builds the same
+# views in memory.
+
+AGG_DIR = "data/dashboard"
+MANIFEST = "manifest.json"
+TABLES = ["cells", "institutions", "top", "researchers", "growth_top"]
+
+NUMERIC_COLUMNS = ["yili", "toplam_atif", "h_indeksi", "i10_indeksi",
+                   "toplam_yayin", "odul_aninda_atif", "odul_aninda_yayin"]
+NO_ID_MARKERS = ["no_scholar_id", "no id found"]
+CELL_KEYS = ["yili", "genel_alan", "has_id"]
+
+TOP_N = 5
+TOP_METRICS = ["h_indeksi", "toplam_atif", "toplam_yayin"]
+TOP_INSTITUTIONS = 15
+GROWTH_TOP_N = 10
+# growth column: (award-time column, current column)
+GROWTH_COLUMNS = {"atif_artisi": ("odul_aninda_atif", "toplam_atif"),
+                  "yayin_artisi": ("odul_aninda_yayin", "toplam_yayin")}
+# metric: rank column
+RANK_COLUMNS = {"h_indeksi": "h_rank", "toplam_atif": "cit_rank", "toplam_yayin": "pub_rank"}
+
+def load_frame():
+    """The dashboard data: the data store if present, else the exported CSV."""
+    if os.path.exists(data_store.DB_FILE):
+        conn = data_store.connect()
+        df = data_store.load_frame(conn)
+        conn.close()
+    else:
+        df = pd.read_csv(data_store.FINAL_CSV)
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+def has_scholar_id(df):
+    return df["scholar_id"].notna() & ~df["scholar_id"].isin(NO_ID_MARKERS)
+
+def source_hash(df):
+    """
+    Hash of the data columns, independent of the index and of int/float or
+    string dtypes, so the store frame and the exported CSV hash the same.
+    """
+    df = df[[c for c in data_store.COLUMNS if c in df.columns]]
+    normalized = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_numeric_dtype(s):
+            normalized[col] = s.astype("float64")
+        else:
+            normalized[col] = s.astype(object).where(s.notna(), None)
+    hashed = pd.util.hash_pandas_object(pd.DataFrame(normalized), index=False)
+    return hashlib.sha256(hashed.to_numpy().tobytes()).hexdigest()
+
+# ------------------------------------------------------------------------------
+# Build
+# ------------------------------------------------------------------------------
+
+def _cell_frame(df):
+    return pd.DataFrame({
+        "yili": df["yili"].to_numpy(),
+        "genel_alan": df["genel_alan"].to_numpy(dtype=object),
+        "has_id": has_scholar_id(df).to_numpy(),
+        "pos": np.arange(len(df)),
+    })
+
+def _top(frame, df):
+    parts = []
+    for metric in TOP_METRICS:
+        part = frame.assign(metric=metric, value=df[metric].to_numpy(), adi_soyadi=df["adi_soyadi"].to_numpy())
+        part = part[part["value"].notna()].sort_values(["value", "pos"], ascending=[False, True])
+        parts.append(part.groupby(CELL_KEYS, dropna=False).head(TOP_N))
+    return pd.concat(parts, ignore_index=True)
+
+def _researchers(frame, df):
+    out = pd.DataFrame(index=pd.RangeIndex(len(df)))
+    for growth, (award, current) in GROWTH_COLUMNS.items():
+        out[growth] = (df[current] - df[award]).to_numpy()
+
+    # Rank among rows with an ID in the same genel_alan: 1 + number of
+    # researchers with a strictly higher value (a missing value ranks first)
+    with_id = df[frame["has_id"].to_numpy()]
+    positions = frame.loc[frame["has_id"], "pos"].to_numpy()
+    by_field = with_id.groupby("genel_alan")
+    out["field_size"] = np.nan
+    out.loc[positions, "field_size"] = by_field["genel_alan"].transform("size").to_numpy()
+    for metric, rank in RANK_COLUMNS.items():
+        ranks = by_field[metric].rank(method="min", ascending=False)
+        out[rank] = np.nan
+        out.loc[positions, rank] = ranks.where(with_id[metric].notna() | with_id["genel_alan"].isna(), 1).to_numpy()
+    return out
+
+def _growth_top(frame, df, researchers):
+    parts = []
+    for growth, (award, current) in GROWTH_COLUMNS.items():
+        part = pd.DataFrame({
+            "metric": growth,
+            "adi_soyadi": df["adi_soyadi"].to_numpy(),
+            "award": df[award].to_numpy(),
+            "current": df[current].to_numpy(),
+            "growth": researchers[growth].to_numpy(),
+            "yili": df["yili"].to_numpy(),
+        })[frame["has_id"].to_numpy()]
+        parts.append(part.nlargest(GROWTH_TOP_N, "growth"))
+    return pd.concat(parts, ignore_index=True)
+
+def build_tables(df):
+    frame = _cell_frame(df)
+    cells = frame.groupby(CELL_KEYS, dropna=False).size().rename("n").reset_index()
+
+    inst = frame.assign(calistigi_kurum=df["calistigi_kurum"].to_numpy(dtype=object))
+    inst = inst[inst["calistigi_kurum"].notna()]
+    institutions = (inst.groupby(CELL_KEYS + ["calistigi_kurum"], dropna=False)
+                    .agg(n=("pos", "size"), first=("pos", "min")).reset_index())
+
+    researchers = _researchers(frame, df)
+    return {
+        "cells": cells,
+        "institutions": institutions,
+        "top": _top(frame, df),
+        "researchers": researchers,
+        "growth_top": _growth_top(frame, df, researchers),
+    }
+
+# ------------------------------------------------------------------------------
+# Views
+# ------------------------------------------------------------------------------
+
+class DashboardAggregates:
+    def __init__(self, tables, source=None):
+        self.tables = tables
+        self.source = source
+        self.researchers = tables["researchers"]
+
+    @classmethod
+    def build(cls, df):
+        return cls(build_tables(df), source_hash(df))
+
+    @classmethod
+    def load(cls, path=AGG_DIR):
+        """Reads the artifacts; None if they are missing."""
+        manifest = os.path.join(path, MANIFEST)
+        if not os.path.exists(manifest):
+            return None
+        with open(manifest, encoding="utf-8") as f:
+            meta = json.load(f)
+        tables = {name: pd.read_parquet(os.path.join(path, f"{name}.parquet")) for name in TABLES}
+        return cls(tables, meta.get("source_hash"))
+
+    def save(self, path=AGG_DIR):
+        os.makedirs(path, exist_ok=True)
+        for name in TABLES:
+            self.tables[name].to_parquet(os.path.join(path, f"{name}.parquet"), index=False)
+        with open(os.path.join(path, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump({"source_hash": self.source, "rows": len(self.researchers),
+                       "built_at": time.strftime("%Y-%m-%d %H:%M:%S")}, f, indent=2)
+        return path
+
+    def _select(self, name, years, fields, only_with_id):
+        table = self.tables[name]
+        mask = table["yili"].between(years[0], years[1]) & table["genel_alan"].isin(fields)
+        if only_with_id:
+            mask &= table["has_id"]
+        return table[mask]
+
+    def count(self, years, fields, only_with_id):
+        return int(self._select("cells", years, fields, only_with_id)["n"].sum())
+
+    def institution_counts(self, years, fields, only_with_id, n=TOP_INSTITUTIONS):
+        """Like value_counts() of calistigi_kurum over the filtered rows, first n."""
+        sel = self._select("institutions", years, fields, only_with_id)
+        counts = sel.groupby("calistigi_kurum").agg(count=("n", "sum"), first=("first", "min"))
+        counts = counts.sort_values(["count", "first"], ascending=[False, True]).head(n)
+        return counts["count"].rename_axis("calistigi_kurum")
+
+    def field_counts(self, years, fields, only_with_id):
+        sel = self._select("cells", years, fields, only_with_id)
+        return sel.groupby("genel_alan")["n"].sum().sort_values(ascending=False, kind="stable").rename("count")
+
+    def year_counts(self, years, fields, only_with_id):
+        sel = self._select("cells", years, fields, only_with_id)
+        return sel.groupby("yili")["n"].sum().sort_index().rename("count")
+
+    def top(self, metric, years, fields, only_with_id, n=TOP_N):
+        """Like nlargest(n, metric) over the filtered rows: adi_soyadi, metric, yili."""
+        sel = self._select("top", years, fields, only_with_id)
+        sel = sel[sel["metric"] == metric].sort_values(["value", "pos"], ascending=[False, True]).head(n)
+        return pd.DataFrame({"adi_soyadi": sel["adi_soyadi"].to_numpy(), metric: sel["value"].to_numpy(),
+                             "yili": sel["yili"].to_numpy()})
+
+    def growth_top(self, growth):
+        """Largest growth since the award: adi_soyadi, award column, current column, growth, yili."""
+        award, current = GROWTH_COLUMNS[growth]
+        sel = self.tables["growth_top"]
+        sel = sel[sel["metric"] == growth]
+        return pd.DataFrame({"adi_soyadi": sel["adi_soyadi"].to_numpy(), award: sel["award"].to_numpy(),
+                             current: sel["current"].to_numpy(), growth: sel["growth"].to_numpy(),
+                             "yili": sel["yili"].to_numpy()})
+
+    def row(self, pos):
+        """Derived columns (ranks, field size, growth) of the row at position pos of the frame."""
+        return self.researchers.iloc[pos]
+
+def build(df=None, path=AGG_DIR):
+    df = load_frame() if df is None else df
+    start = time.perf_counter()
+    aggregates = DashboardAggregates.build(df)
+    aggregates.save(path)
+    print(f"Dashboard aggregates: {len(df)} rows, {len(aggregates.tables['cells'])} cells "
+          f"-> {path} ({time.perf_counter() - start:.2f}s)")
+    return aggregates
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    build()
@@ -0,0 +1,104 @@
+import sys
+
+import data_store
+from text_normalize import normalize_name
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+# ==============================================================================
+# DATA FIXING
+# ==============================================================================
+# Maintenance pass over the production data, run after every merge:
+#   * Manual overrides: awardees whose Scholar profile was fixed by hand, or
+#     excluded (no_scholar_id) because search kept finding someone else.
+#     A changed ID is rescraped.
+#   * Standardization: rows without a profile (the "no id found" marker that
+#     merge_and_validate writes for name mismatches, or no ID at all) get
+#     no_scholar_id, and their profile columns are cleared.
+# Only changed cells are written (data_store.update_column); award-year metrics
+# are then refreshed for the rows whose yearly series changed.
+
+NO_SCHOLAR_ID = "no_scholar_id"
+LEGACY_NO_ID_MARKERS = ["no id found"]
+
+# Awardee name -> Scholar ID (or NO_SCHOLAR_ID)
+MANUAL_OVERRIDES = {
+    "Cory David Dunn": NO_SCHOLAR_ID,
+    "Ozan Yılmaz": "2HffCiYAAAAJ",
+    "Fevzi Çakmak Cebeci": "Q4oircsAAAAJ",
+}
+
+# Profile data cleared for rows without a Scholar profile
+PROFILE_COLUMNS = [
+    "scholar_isim", "scholar_kurum", "toplam_atif", "h_indeksi", "i10_indeksi",
+    "yillik_atif", "toplam_yayin", "yillik_yayin", "ilgi_alanlari",
+    "scholar_name", "scholar_affiliation",
+]
+FIX_COLUMNS = ["scholar_id", *PROFILE_COLUMNS]
+
+def rescrape(scholar_id):
+    """Store columns of a freshly scraped profile, or None if the scrape failed."""
+    from data_scrape import scrape_profile_by_id
+    print(f"  Rescraping {scholar_id}...")
+    info = scrape_profile_by_id(scholar_id)
+    if info is None:
+        return None
+    info["interests"] = ", ".join(info["interests"])
+    row = {data_store.SCRAPE_COLUMN_MAP[k]: v for k, v in info.items() if k in data_store.SCRAPE_COLUMN_MAP}
+    row["scholar_name"] = row["scholar_isim"]
+    row["scholar_affiliation"] = row["scholar_kurum"]
+    return row
+
+def fix_frame(df, overrides=MANUAL_OVERRIDES):
+    """Returns (fixed copy of df, {column: {row id: new value}} of the changed cells)."""
+    fixed = df.copy()
+
+    # 1. Manual overrides
+    names = fixed["adi_soyadi"].map(normalize_name)
+    for name, scholar_id in overrides.items():
+        rows = fixed.index[(names == normalize_name(name)) & (fixed["scholar_id"] != scholar_id)]
+        if len(rows) == 0:
+            continue
+        print(f"  Override: {name} -> {scholar_id}")
+        if scholar_id != NO_SCHOLAR_ID:
+            row = rescrape(scholar_id)
+            if row is None:
+                # Left as is, so the next run applies the override again
+                print(f"  Rescrape of {scholar_id} failed, override not applied.")
+                continue
+            for col, value in row.items():
+                if col in fixed.columns:
+                    fixed.loc[rows, col] = value
+        fixed.loc[rows, "scholar_id"] = scholar_id
+
+    # 2. Standardize the no-profile marker and clear profile data
+    no_id = fixed["scholar_id"].isna() | fixed["scholar_id"].isin(LEGACY_NO_ID_MARKERS)
+    fixed.loc[no_id, "scholar_id"] = NO_SCHOLAR_ID
+    fixed.loc[fixed["scholar_id"] == NO_SCHOLAR_ID, PROFILE_COLUMNS] = None
+
+    changes = {}
+    for col in FIX_COLUMNS:
+        before, after = df[col], fixed[col]
+        differs = before.ne(after) & ~(before.isna() & after.isna())
+        if differs.any():
+            changes[col] = after[differs].to_dict()
+    return fixed, changes
+
+def run(conn, df):
+    """Applies the fixes to the store. Returns the updated frame."""
+    from award_metrics import refresh_award_metrics
+    _, changes = fix_frame(df)
+    for col, values in changes.items():
+        data_store.update_column(conn, col, values)
+    print(f"Fixed {sum(len(v) for v in changes.values())} cells in {len(changes)} columns.")
+    refresh_award_metrics(conn)
+    return data_store.load_frame(conn)
+
+def main():
+    conn = data_store.connect()
+    run(conn, data_store.load_frame(conn))
+    data_store.export_csv(conn)
+    print(f"Exported {data_store.FINAL_CSV}.")
+
+if __name__ == "__main__":
+    main()
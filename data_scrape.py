@@ -1,14 +1,24 @@
 
 import pandas as pd
-import requests
-import time
+from http_session import CONNECTION_STATS, get_session
 import os
 import glob
-from unidecode import unidecode
 import sys 
+import threading
 import re
+import requests
 from bs4 import BeautifulSoup
-import random
+from rate_limit import LIMITER, endpoint_for
+from response_cache import RESPONSE_CACHE, CacheMiss
+from scholar_parsers import PARSER
+from checkpoint_journal import JOURNAL
+from paper_history import PAPER_HISTORY
+from text_normalize import UNIVERSITY_MAPPING, ascii_fold
+from affiliation_matching import get_gazetteer
+from name_matching import NameBlockingIndex, add_name_columns, is_name_match, match_frame, name_score, normalize_name
+import data_store
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 sys.stdout.reconfigure(encoding='utf-8')
 
@@ -30,37 +40,53 @@ def load_api_keys():
 
 API_KEYS = load_api_keys()
 SERPER_API_KEY = API_KEYS.get("serper", "")
+# serper, serper_2, serper_3, ... -> one key per batch worker
+SERPER_API_KEYS = [v for k, v in sorted(API_KEYS.items()) if k.startswith("serper") and v] or [SERPER_API_KEY]
 SERPAPI_KEY = API_KEYS.get("serpapi", "")
 DATA_FILE = "data/gebip_awardees.csv"
 BATCH_DIR = "data/serper_batches"
 MERGED_OUTPUT_FILE = "data/gebip_scholar_enriched.csv"
 BATCH_SIZE = 20
+WORKERS = 1
+WORKER_MODE = "threads"  # or "processes"
+MAX_RETRIES = 3
+
+def throttled_request(method, url, max_retries=MAX_RETRIES, use_cache=True, **kwargs):
+    """
+    Sends a request through the shared rate limiter (see rate_limit.py)
+    on this thread's pooled keep-alive session (see http_session.py).
+    429/503 responses are retried after the limiter's backoff.
+    Successful responses are served from / stored in the on-disk cache
+    (see response_cache.py); pass use_cache=False to force a fresh fetch.
+    """
+    endpoint = endpoint_for(url)
+    body = kwargs.get("json")
+    if use_cache:
+        cached = RESPONSE_CACHE.get(method, url, endpoint, body)
+        if cached is not None:
+            return cached
+    
+    for attempt in range(max_retries + 1):
+        LIMITER.wait(endpoint)
+        response = get_session().request(method, url, **kwargs)
+        if not LIMITER.feedback(endpoint, response.status_code, response.headers):
+            break
+    
+    RESPONSE_CACHE.put(method, url, endpoint, response.status_code, response.headers,
+                       response.content, body)
+    return response
 
 # ==============================================================================
 # SECTION 1: SERPER API & SCRAPING LOGIC
 # ==============================================================================
 
-UNIVERSITY_MAPPING = {
-    "odtu": "middle east technical university",
-    "metu": "middle east technical university",
-    "middle east technical university": "middle east technical university",
-    "itu": "istanbul technical university",
-    "istanbul teknik universitesi": "istanbul technical university",
-    "boun": "bogazici university",
-    "bogazici": "bogazici university",
-    "iyte": "izmir institute of technology",
-    "izmir yuksek teknoloji enstitusu": "izmir institute of technology",
-    "ku": "koc university",
-    "su": "sabanci university"
-}
-
 def generate_name_variations(name_str):
     """Generates variations of a name."""
     if not isinstance(name_str, str):
         return []
 
     name_clean = name_str.strip()
-    name_english = unidecode(name_clean)
+    name_english = ascii_fold(name_clean)
     
     variations = set()
     variations.add(name_clean)
@@ -83,159 +109,236 @@ def generate_name_variations(name_str):
              # Abbreviated first and middle
              variations.add(f"{first[0]}. {middle_initials} {last}")
 
-    return list(variations)
+    return sorted(variations)
 
 def calculate_match_score(original_aff, found_aff):
-    """Calculates a match integrity score (1-5)."""
-    if pd.isna(found_aff) or not found_aff:
-        return 3, "No affiliation in profile"
-        
-    if pd.isna(original_aff):
-        return 3, "No original affiliation to compare"
-
-    # Normalize
-    org_norm = unidecode(str(original_aff)).lower()
-    found_norm = unidecode(str(found_aff)).lower()
-    
-    # Expand abbreviations
-    for key, value in UNIVERSITY_MAPPING.items():
-        if key in org_norm:
-            org_norm = org_norm.replace(key, value)
-    
-    # Token matching
-    stop_words = {"university", "universitesi", "faculty", "fakultesi", "of", "department", "bolumu", "institute", "enstitusu", "univ", "uni", "prof", "assoc", "asst", "dr"}
-    
-    def get_tokens(text):
-        tokens = set(text.replace(",", " ").replace("-", " ").replace("/", " ").split())
-        return {t for t in tokens if len(t) > 2 and t not in stop_words}
-
-    org_tokens = get_tokens(org_norm)
-    found_tokens = get_tokens(found_norm)
-    
-    common = org_tokens.intersection(found_tokens)
-    
-    if len(common) > 0:
-        return 5, f"Matched tokens: {', '.join(common)}"
-    else:
-        if org_norm in found_norm or found_norm in org_norm:
-             return 5, "Substring match"
-        return 1, f"Affiliation mismatch? '{original_aff}' vs '{found_aff}'"
-
-def scrape_extra_metrics(scholar_id):
     """
-    Scrapes the Google Scholar profile page for deep metrics.
-    Returns: h_index, i10_index, citations_per_year (str), total_documents (int - approx)
+    Calculates a match integrity score (1-5) against the institution gazetteer
+    (see affiliation_matching.py). Returns (score, notes).
     """
-    url = f"https://scholar.google.com/citations?user={scholar_id}&hl=en"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    
-    metrics = {
+    return get_gazetteer().grade(original_aff, found_aff)
+
+def calculate_match_scores(original_affs, found_affs):
+    """calculate_match_score over aligned sequences, each distinct pair once. Returns [(score, notes)]."""
+    return get_gazetteer().grade_many(original_affs, found_affs)
+
+SCHOLAR_BASE_URL = os.environ.get("SCHOLAR_BASE_URL", "https://scholar.google.com")
+SCHOLAR_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+PAGE_SIZE = 100
+MAX_PAGES = 30 # Cap at 3000 docs
+
+def profile_url(scholar_id, page_num=None, base_url=None):
+    """Builds the profile URL, optionally for a 100-row publication page."""
+    url = f"{base_url or SCHOLAR_BASE_URL}/citations?user={scholar_id}&hl=en"
+    if page_num is not None:
+        url += f"&cstart={page_num*PAGE_SIZE}&pagesize={PAGE_SIZE}"
+    return url
+
+def empty_metrics():
+    return {
         "h_index": 0,
         "i10_index": 0,
         "citations_per_year": "",
         "total_documents": 0,
         "documents_per_year": "",
-        "total_citations": 0
+        "total_citations": 0,
+        "papers": []
     }
+
+def parse_profile_metrics(html, metrics):
+    """Fills the citation table and yearly citation graph from a profile page."""
+    metrics.update(PARSER.parse_metrics(html))
+    return metrics
+
+def parse_publication_page(html):
+    """Returns (row_count, [(year, citations)]) for one publication list page."""
+    return PARSER.parse_publications(html)
+
+def format_yearly_counts(counter):
+    """Formats a {year: count} mapping as the 'YYYY:Count | ...' string."""
+    return " | ".join(f"{y}:{counter[y]}" for y in sorted(counter.keys()))
+
+# ------------------------------------------------------------------------------
+# Publication list pagination
+# ------------------------------------------------------------------------------
+# The first 100-row page (cstart=0) also carries the metrics table, so it
+# replaces the separate main page fetch. Every i10 paper is a row, so the
+# i10-index on that page tells us how many pages exist at minimum; those pages
+# plus SPECULATIVE_PAGES more are fetched in parallel (still paced by the rate
+# limiter) and leftover requests are cancelled once a short page comes back.
+
+PAGE_WORKERS = 4
+SPECULATIVE_PAGES = 2
+_page_pool = None
+
+def estimate_page_count(metrics):
+    """Lower bound on the number of publication pages, from the first page's i10-index."""
+    return min(MAX_PAGES, max(1, -(-metrics["i10_index"] // PAGE_SIZE)))
+
+def summarize_pages(pages):
+    """
+    Combines {page_num: (row_count, papers) or None} into
+    (total_docs, Counter of years, [(year, citations)] of every paper),
+    stopping at the first failed page (exclusive) or short page (inclusive).
+    """
+    total_docs_count = 0
+    doc_years = Counter()
+    all_papers = []
+    page_num = 0
+    while pages.get(page_num) is not None:
+        count, papers = pages[page_num]
+        total_docs_count += count
+        doc_years.update(year for year, _ in papers if year)
+        all_papers.extend(papers)
+        if count < PAGE_SIZE:
+            break
+        page_num += 1
+    return total_docs_count, doc_years, all_papers
+
+def pages_complete(pages):
+    """False if a page that should follow a full page failed (None), so the list is cut short."""
+    for page_num in range(MAX_PAGES):
+        page = pages.get(page_num)
+        if page is None:
+            return False
+        if page[0] < PAGE_SIZE:
+            return True
+    return True
+
+def _fetch_publication_page(scholar_id, page_num, use_cache=True):
+    response = throttled_request("GET", profile_url(scholar_id, page_num), use_cache=use_cache,
+                                 headers=SCHOLAR_HEADERS, timeout=10)
+    if response.status_code != 200:
+        return None
+    return parse_publication_page(response.text)
+
+def _get_page_pool():
+    # Long-lived threads keep their pooled sessions between profiles
+    global _page_pool
+    if _page_pool is None:
+        _page_pool = ThreadPoolExecutor(max_workers=PAGE_WORKERS, thread_name_prefix="scholar-page")
+    return _page_pool
+
+def fetch_remaining_pages(scholar_id, estimated_pages, use_cache=True):
+    """Fetches pages 1.. speculatively in parallel. Returns {page_num: result or None}."""
+    pool = _get_page_pool()
+    pages = {}
+    futures = {}
+    stop = MAX_PAGES  # first page that is short or failed
+    next_page = 1
     
-    try:
-        time.sleep(random.uniform(1.0, 2.0))
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response.status_code != 200:
-            print(f" [Scrape Failed: {response.status_code}]", end="")
-            return metrics
-            
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # 1. Parse Metrics Table (#gsc_rsb_st)
-        table = soup.select_one("#gsc_rsb_st")
-        if table:
-            rows = table.find_all("tr")
-            for row in rows:
-                cols = row.find_all("td")
-                if len(cols) >= 2:
-                    label = cols[0].get_text(strip=True).lower()
-                    val_all = cols[1].get_text(strip=True)
-                    
-                    if "citations" in label or "alıntılar" in label:
-                        metrics["total_citations"] = int(val_all) if val_all.isdigit() else 0
-                    elif "h-index" in label or "h-endeksi" in label:
-                        metrics["h_index"] = int(val_all) if val_all.isdigit() else 0
-                    elif "i10-index" in label or "i10-endeksi" in label:
-                        metrics["i10_index"] = int(val_all) if val_all.isdigit() else 0
-                        
-        # 2. Parse Citations Graph (Yearly)
-        years_els = soup.select(".gsc_g_t")
-        vals_els = soup.select(".gsc_g_a")
-        if not vals_els:
-            vals_els = soup.select(".gsc_g_al")
-            
-        yearly_data = []
-        if len(years_els) == len(vals_els):
-            for y, v in zip(years_els, vals_els):
-                yearly_data.append(f"{y.get_text(strip=True)}:{v.get_text(strip=True)}")
-        
-        metrics["citations_per_year"] = " | ".join(yearly_data)
-        
-        # 3. Total Documents (Pagination Loop)
-        # Detailed logic to paginate through documents to get counts per year
-        page_num = 0
-        MAX_PAGES = 30 # Cap at 3000 docs
-        from collections import Counter
-        doc_years = Counter()
-        total_docs_count = 0
-        
-        while page_num < MAX_PAGES:
-            if page_num > 0:
-                time.sleep(1.0)
-                
-            loop_url = f"https://scholar.google.com/citations?user={scholar_id}&hl=en&cstart={page_num*100}&pagesize=100"
-            
+    def submit_next():
+        nonlocal next_page
+        futures[pool.submit(_fetch_publication_page, scholar_id, next_page, use_cache)] = next_page
+        next_page += 1
+    
+    while next_page < min(estimated_pages + SPECULATIVE_PAGES, MAX_PAGES):
+        submit_next()
+    
+    while futures:
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            page_num = futures.pop(future)
             try:
-                resp_loop = requests.get(loop_url, headers=headers, timeout=10)
-                if resp_loop.status_code != 200:
-                   break
-                   
-                soup_loop = BeautifulSoup(resp_loop.text, "html.parser")
-                rows = soup_loop.select(".gsc_a_tr")
-                count = len(rows)
-                total_docs_count += count
-                
-                for row in rows:
-                    year_el = row.select_one(".gsc_a_y")
-                    if year_el:
-                        y_text = year_el.get_text(strip=True)
-                        if y_text.isdigit():
-                            doc_years[int(y_text)] += 1
-                
-                if count < 100:
-                    break
-            except:
-                break
-                
-            page_num += 1
-            
-        metrics["total_documents"] = total_docs_count
-        sorted_years = sorted(doc_years.keys())
-        docs_str_list = [f"{y}:{doc_years[y]}" for y in sorted_years]
-        metrics["documents_per_year"] = " | ".join(docs_str_list)
+                result = future.result()
+            except Exception:
+                result = None
+            pages[page_num] = result
+            if result is None or result[0] < PAGE_SIZE:
+                stop = min(stop, page_num)
+            elif next_page < stop:
+                submit_next()
+        
+        # Cancel speculative requests past the last page
+        for future, page_num in list(futures.items()):
+            if page_num > stop and future.cancel():
+                del futures[future]
+    
+    return pages
+
+def fetch_first_page(scholar_id, use_cache=True):
+    """
+    Fetches the first publication page, which also carries the metrics table.
+    Returns (metrics, first page parse), or None if the request failed.
+    """
+    response = throttled_request("GET", profile_url(scholar_id, 0), use_cache=use_cache,
+                                 headers=SCHOLAR_HEADERS, timeout=10)
+    if response.status_code != 200:
+        print(f" [Scrape Failed: {response.status_code}]", end="")
+        return None
+    return parse_profile_metrics(response.text, empty_metrics()), parse_publication_page(response.text)
+
+def crawl_publications(scholar_id, metrics, first_page, use_cache=True):
+    """
+    Completes metrics with the publication list, paginating from the already
+    fetched first page. Returns None if a publication page failed.
+    """
+    pages = {0: first_page}
+    if first_page[0] >= PAGE_SIZE:
+        pages.update(fetch_remaining_pages(scholar_id, estimate_page_count(metrics), use_cache))
+    if not pages_complete(pages):
+        print(f" [Publication Page Failed]", end="")
+        return None
+    total_docs_count, doc_years, papers = summarize_pages(pages)
         
-        return metrics
+    metrics["total_documents"] = total_docs_count
+    metrics["documents_per_year"] = format_yearly_counts(doc_years)
+    metrics["papers"] = papers
+    if papers:
+        PAPER_HISTORY.record(scholar_id, papers)
+    return metrics
+
+def scrape_extra_metrics(scholar_id):
+    """
+    Scrapes the Google Scholar profile page for deep metrics.
+    Returns: h_index, i10_index, citations_per_year (str), total_documents (int - approx),
+    or None if the profile could not be fetched (blocked, offline cache miss, network error).
+    """
+    try:
+        first = fetch_first_page(scholar_id)
+        if first is None:
+            return None
+        metrics, first_page = first
+        return crawl_publications(scholar_id, metrics, first_page)
 
     except Exception as e:
         print(f" [Scrape Error: {e}]", end="")
-        return metrics
+        return None
 
-def search_and_enrich_serper(name):
+SERPER_URL = "https://google.serper.dev/search"
+CREDITS_PER_QUERY = 1
+# lookups / cache_hits count the scraper's searches only; searches sent ahead
+# by the planner (prefetch=True) count as api_calls, and a later lookup they
+# answer counts as prefetched, not as a cache hit
+SERPER_STATS = {"lookups": 0, "cache_hits": 0, "prefetched": 0, "api_calls": 0}
+PREFETCHED_QUERIES = set()
+class ScrapeFailed(Exception):
+    """The best candidate's profile could not be scraped (see scrape_extra_metrics)."""
+
+# A search that could not be answered (offline cache miss, network/HTTP error,
+# unscrapable profile), as opposed to one that found no profile
+SEARCH_ERRORS = (CacheMiss, requests.RequestException, ScrapeFailed)
+_serper_stats_lock = threading.Lock()
+
+def normalize_query(query):
+    """Cache key form of a Serper query: quotes removed, whitespace collapsed, casefolded."""
+    # "İ".casefold() keeps a combining dot; fold it to a plain "i" first
+    return " ".join(query.replace("'", "").replace('"', "").split()).replace("İ", "i").casefold()
+
+def _count_serper(stat):
+    with _serper_stats_lock:
+        SERPER_STATS[stat] += 1
+
+def serper_search(name, api_key=None, prefetch=False):
     """
-    Searches for a Google Scholar profile using Serper Dev.
-    Then SCRAPES the profile page for detailed metrics.
+    Runs a Serper search for a Scholar profile and returns the JSON response.
+    Results are cached on the normalized query, so the same name (in any
+    casing/spacing) is only paid for once across runs. prefetch=True marks a
+    planner search (see serper_planner.py) for SERPER_STATS.
     """
-    url = "https://google.serper.dev/search"
-    name_clean = name.replace("'", "").replace('"', "")
+    name_clean = " ".join(name.replace("'", "").replace('"', "").split())
     
     payload = {
         "q": f"site:scholar.google.com {name_clean}",
@@ -243,70 +346,181 @@ def search_and_enrich_serper(name):
         "hl": "en" 
     }
     headers = {
-        "X-API-KEY": SERPER_API_KEY,
+        "X-API-KEY": api_key or SERPER_API_KEY,
         "Content-Type": "application/json"
     }
+    cache_body = dict(payload, q=normalize_query(payload["q"]))
+    
+    if not prefetch:
+        _count_serper("lookups")
+    cached = RESPONSE_CACHE.get("POST", SERPER_URL, "serper", cache_body)
+    if cached is not None:
+        if not prefetch:
+            _count_serper("prefetched" if cache_body["q"] in PREFETCHED_QUERIES else "cache_hits")
+        return cached.json()
+    
+    response = throttled_request("POST", SERPER_URL, use_cache=False, headers=headers, json=payload)
+    _count_serper("api_calls")
+    response.raise_for_status()
+    if prefetch:
+        with _serper_stats_lock:
+            PREFETCHED_QUERIES.add(cache_body["q"])
+    RESPONSE_CACHE.put("POST", SERPER_URL, "serper", response.status_code, response.headers,
+                       response.content, cache_body)
+    return response.json()
+
+def serper_report():
+    s = SERPER_STATS
+    rate = s["cache_hits"] / s["lookups"] if s["lookups"] else 0.0
+    # Without the cache every lookup is a paid call; prefetch calls are part of api_calls
+    saved = (s["lookups"] - s["api_calls"]) * CREDITS_PER_QUERY
+    c = CANDIDATE_STATS
+    return (f"  {s['lookups']} lookups, {s['cache_hits']} cache hits ({rate:.0%} hit rate), "
+            f"{s['prefetched']} answered by this run's prefetch, "
+            f"{s['api_calls']} API calls, {saved} credits saved\n"
+            f"  {c['candidates']} profile candidates in {c['responses']} responses, "
+            f"{c['rejected']} rejected before scraping, {c['reranked']} times a later candidate won")
+
+# ------------------------------------------------------------------------------
+# Candidate ranking
+# ------------------------------------------------------------------------------
+# A Serper response can hold several Scholar profiles. Every candidate is
+# scored from the response alone (name from the title, affiliation from the
+# snippet) before anything is fetched; only the best one is scraped, and
+# candidates whose name does not match or that score below the threshold are
+# rejected instead of being scraped and cleared later by merge_and_validate.
+
+NAME_WEIGHT = 0.7
+AFFILIATION_WEIGHT = 0.3
+MIN_CANDIDATE_SCORE = 0.3
+CANDIDATE_STATS = {"responses": 0, "candidates": 0, "rejected": 0, "reranked": 0}
+
+def _count_candidates(stat, n=1):
+    with _serper_stats_lock:
+        CANDIDATE_STATS[stat] += n
+
+def parse_candidate(result):
+    """Extracts a Scholar profile candidate from one organic result, or None."""
+    link = result.get("link", "")
+    if "scholar.google" not in link or "user=" not in link:
+        return None
+    try:
+        # link format: ...?user=ID&... or .../citations?user=ID
+        author_id = link.split("user=")[1].split("&")[0]
+    except:
+        return None
+    
+    raw_snippet = result.get("snippet", "")
+    snippet = raw_snippet.replace('\u202a', '').replace('\u202c', '').replace('\u200e', '').replace('\u200f', '')
+    parts = snippet.split(" - ")
+    affiliation = parts[0] if len(parts) > 0 else "Unknown"
+    
+    # Check for "Cited by" in snippet as backup
+    total_citations = 0
+    match_en = re.search(r"Cited by\s+([\d,]+)", snippet, re.IGNORECASE)
+    match_tr = re.search(r"([\d\.,]+)\s+tarafından alıntılandı", snippet, re.IGNORECASE)
+    
+    if match_en:
+        num_str = match_en.group(1).replace(",", "")
+        if num_str.isdigit(): total_citations = int(num_str)
+    elif match_tr:
+        num_str = match_tr.group(1).replace(".", "").replace(",", "") 
+        if num_str.isdigit(): total_citations = int(num_str)
+        
+    interests = []
+    for p in parts:
+        p_clean = p.strip()
+        if not p_clean: continue
+        if p_clean == affiliation.strip(): continue
+        if "Cited by" in p_clean or "tarafından alıntılandı" in p_clean: continue
+        if "Verified email" in p_clean or "doğrulanmış e-posta" in p_clean: continue
+        if "Google Scholar" in p_clean or "Google Akademik" in p_clean: continue
+        interests.append(p_clean)
+    
+    return {
+        "scholar_id": author_id,
+        "scholar_name": result.get("title", "").replace(" - Google Scholar", "").replace(" - Google Akademik", ""),
+        "affiliation": affiliation.strip(),
+        "snippet": snippet,
+        "total_citations": total_citations,
+        "interests": interests,
+    }
 
+def rank_candidates(data, name, affiliation=None):
+    """
+    Scores every profile candidate in a Serper response against the searched
+    name and (optionally) the awardee's institution. Returns (accepted,
+    n_candidates): the accepted candidates, best first, each with a
+    "candidate_score" in [0, 1], and the number of candidates in the response.
+    """
+    candidates = [c for c in map(parse_candidate, (data or {}).get("organic", [])) if c]
+    accepted = []
+    for rank, cand in enumerate(candidates):
+        if not is_name_match(name, cand["scholar_name"]):
+            continue
+        # Without an institution to compare, the affiliation is neutral
+        grade = calculate_match_score(affiliation, cand["affiliation"])[0] if isinstance(affiliation, str) else 3
+        cand["candidate_score"] = (NAME_WEIGHT * name_score(name, cand["scholar_name"])
+                                   + AFFILIATION_WEIGHT * (grade - 1) / 4)
+        if cand["candidate_score"] >= MIN_CANDIDATE_SCORE:
+            accepted.append((-cand["candidate_score"], rank, cand))
+    accepted.sort(key=lambda x: x[:2])
+    return [cand for _, _, cand in accepted], len(candidates)
+
+def has_scholar_result(data, name=None, affiliation=None):
+    """True if the response holds a profile (that passes the ranking for name and affiliation, if given)."""
+    if name is not None:
+        return bool(rank_candidates(data, name, affiliation)[0])
+    return any("scholar.google" in r.get("link", "") and "user=" in r.get("link", "")
+               for r in (data or {}).get("organic", []))
+
+def search_and_enrich_serper(name, scrape_profile=True, api_key=None, affiliation=None):
+    """
+    Searches for a Google Scholar profile using Serper Dev, ranks all profile
+    candidates by name and affiliation (the awardee's institution, if given)
+    and SCRAPES only the best one for detailed metrics.
+    With scrape_profile=False the metrics are left empty so the caller can
+    fetch them in bulk (see scholar_async.scrape_many_extra_metrics).
+    SEARCH_ERRORS are raised, so the caller can tell them from "no profile".
+    """
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
+        data = serper_search(name, api_key)
+        ranked, n_candidates = rank_candidates(data, name, affiliation)
+        _count_candidates("responses")
+        _count_candidates("candidates", n_candidates)
+        _count_candidates("rejected", n_candidates - len(ranked))
+        if not ranked:
+            return None
+        best = ranked[0]
+        first = next(filter(None, map(parse_candidate, data["organic"])))
+        if first["scholar_id"] != best["scholar_id"]:
+            _count_candidates("reranked")
         
-        for result in data.get("organic", []):
-            link = result.get("link", "")
-            
-            if "scholar.google" in link and "user=" in link:
-                try:
-                    # link format: ...?user=ID&... or .../citations?user=ID
-                    author_id = link.split("user=")[1].split("&")[0]
-                except:
-                    continue 
-                
-                raw_snippet = result.get("snippet", "")
-                snippet = raw_snippet.replace('\u202a', '').replace('\u202c', '').replace('\u200e', '').replace('\u200f', '')
-                parts = snippet.split(" - ")
-                affiliation = parts[0] if len(parts) > 0 else "Unknown"
-                
-                # Check for "Cited by" in snippet as backup
-                total_citations = 0
-                match_en = re.search(r"Cited by\s+([\d,]+)", snippet, re.IGNORECASE)
-                match_tr = re.search(r"([\d\.,]+)\s+tarafından alıntılandı", snippet, re.IGNORECASE)
-                
-                if match_en:
-                    num_str = match_en.group(1).replace(",", "")
-                    if num_str.isdigit(): total_citations = int(num_str)
-                elif match_tr:
-                    num_str = match_tr.group(1).replace(".", "").replace(",", "") 
-                    if num_str.isdigit(): total_citations = int(num_str)
-                    
-                interests = []
-                for p in parts:
-                    p_clean = p.strip()
-                    if not p_clean: continue
-                    if p_clean == affiliation.strip(): continue
-                    if "Cited by" in p_clean or "tarafından alıntılandı" in p_clean: continue
-                    if "Verified email" in p_clean or "doğrulanmış e-posta" in p_clean: continue
-                    if "Google Scholar" in p_clean or "Google Akademik" in p_clean: continue
-                    interests.append(p_clean)
-                
-                print(f" [Scraping Profile...]", end="")
-                extras = scrape_extra_metrics(author_id)
-                
-                final_citations = extras["total_citations"] if extras["total_citations"] > 0 else total_citations
-                
-                return {
-                    "scholar_id": author_id,
-                    "scholar_name": result.get("title", "").replace(" - Google Scholar", "").replace(" - Google Akademik", ""),
-                    "affiliation": affiliation.strip(),
-                    "total_citations": final_citations, 
-                    "h_index": extras["h_index"],
-                    "i10_index": extras["i10_index"],
-                    "citations_per_year": extras["citations_per_year"],
-                    "total_documents": extras["total_documents"],
-                    "documents_per_year": extras["documents_per_year"],
-                    "interests": interests
-                }
-        return None
+        if scrape_profile:
+            print(f" [Scraping Profile...]", end="")
+            extras = scrape_extra_metrics(best["scholar_id"])
+            if extras is None:
+                raise ScrapeFailed(best["scholar_id"])
+        else:
+            extras = empty_metrics()
+        
+        final_citations = extras["total_citations"] if extras["total_citations"] > 0 else best["total_citations"]
+        
+        return {
+            "scholar_id": best["scholar_id"],
+            "scholar_name": best["scholar_name"],
+            "affiliation": best["affiliation"],
+            "total_citations": final_citations, 
+            "h_index": extras["h_index"],
+            "i10_index": extras["i10_index"],
+            "citations_per_year": extras["citations_per_year"],
+            "total_documents": extras["total_documents"],
+            "documents_per_year": extras["documents_per_year"],
+            "interests": best["interests"],
+            "candidate_score": best["candidate_score"]
+        }
+    except SEARCH_ERRORS:
+        raise
     except Exception as e:
         print(f"Error searching for {name}: {e}")
         return None
@@ -314,11 +528,9 @@ def search_and_enrich_serper(name):
 def scrape_profile_by_id(scholar_id):
     """
     Directly scrapes a Google Scholar profile by ID to get Name, Affiliation, and Metrics.
+    Returns None if the metrics could not be scraped.
     """
-    url = f"https://scholar.google.com/citations?user={scholar_id}&hl=en"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
+    url = profile_url(scholar_id)
 
     info = {
         "scholar_id": scholar_id,
@@ -335,7 +547,7 @@ def scrape_profile_by_id(scholar_id):
 
     try:
         # 1. Fetch main page for Name, Affiliation, Interests
-        response = requests.get(url, headers=headers, timeout=10)
+        response = throttled_request("GET", url, headers=SCHOLAR_HEADERS, timeout=10)
         if response.status_code == 200:
             soup = BeautifulSoup(response.text, "html.parser")
             
@@ -362,6 +574,8 @@ def scrape_profile_by_id(scholar_id):
 
     # 2. Get Metrics reuse
     metrics = scrape_extra_metrics(scholar_id)
+    if metrics is None:
+        return None
     info.update(metrics)
     
     return info
@@ -370,14 +584,8 @@ def scrape_profile_by_id(scholar_id):
 # SECTION 2: BATCH PROCESSING
 # ==============================================================================
 
-def process_all_authors():
-    if not os.path.exists(BATCH_DIR):
-        os.makedirs(BATCH_DIR)
-        
-    df_source = pd.read_csv(DATA_FILE)
-    total_records = len(df_source)
-    
-    # Identify processed indices
+def processed_batch_indices():
+    """Row indices covered by legacy batch files already on disk."""
     processed_indices = set()
     for f in glob.glob(os.path.join(BATCH_DIR, "batch_*.csv")):
         try:
@@ -389,106 +597,176 @@ def process_all_authors():
                 processed_indices.add(i)
         except:
             pass
-            
-    for start_idx in range(0, total_records, BATCH_SIZE):
-        end_idx = min(start_idx + BATCH_SIZE, total_records)
-        
-        batch_indices = set(range(start_idx, end_idx))
-        if batch_indices.issubset(processed_indices):
-            print(f"Skipping batch {start_idx}-{end_idx} (Already processed)")
+    return processed_indices
+
+def process_batch(df_source, start_idx, end_idx, api_key=None):
+    """
+    Searches and scrapes the rows start_idx:end_idx that are not in the
+    checkpoint journal yet. Every row is journaled as soon as it is finished;
+    rows whose search raised SEARCH_ERRORS or whose profile scrape failed are
+    not, so the next run retries them.
+    Returns the enriched batch frame.
+    """
+    batch_df = df_source.iloc[start_idx:end_idx].copy()
+
+    cols = ["scholar_id", "scholar_name", "scholar_affiliation", "total_citations", 
+            "h_index", "i10_index", "citations_per_year", "total_documents", 
+            "documents_per_year", "interests", "match_score", "match_notes"]
+    for col in cols:
+        batch_df[col] = None
+
+    done = JOURNAL.completed_indices(start_idx, end_idx)
+    found = {}
+    for index, row in batch_df.iterrows():
+        if index in done:
             continue
-            
-        print(f"\nProcessing batch: {start_idx} to {end_idx}")
-        
-        batch_df = df_source.iloc[start_idx:end_idx].copy()
-        
-        cols = ["scholar_id", "scholar_name", "scholar_affiliation", "total_citations", 
-                "h_index", "i10_index", "citations_per_year", "total_documents", 
-                "documents_per_year", "interests", "match_score", "match_notes"]
-        for col in cols:
-            batch_df[col] = None
-            
-        for index, row in batch_df.iterrows():
-            name = row["adi_soyadi"]
-            original_affiliation = row["calistigi_kurum"]
-            
-            print(f"[{index}] {name}...", end="", flush=True)
-            
-            result = search_and_enrich_serper(name)
-            
+        name = row["adi_soyadi"]
+        original_affiliation = row["calistigi_kurum"]
+
+        print(f"[{index}] {name}...", end="", flush=True)
+
+        try:
+            result = search_and_enrich_serper(name, scrape_profile=False, api_key=api_key,
+                                              affiliation=original_affiliation)
+
             if not result:
                 variations = generate_name_variations(name)
                 for var_name in variations:
                     if var_name == name: continue
-                    result = search_and_enrich_serper(var_name)
+                    result = search_and_enrich_serper(var_name, scrape_profile=False, api_key=api_key,
+                                                      affiliation=original_affiliation)
                     if result:
                         print(f" (Found via '{var_name}')", end="")
                         break
-            
-            if result:
-                print(f" [ID: {result['scholar_id']} | Citations: {result['total_citations']}]", end="")
-                batch_df.at[index, "scholar_id"] = result["scholar_id"]
-                batch_df.at[index, "scholar_name"] = result["scholar_name"]
-                batch_df.at[index, "scholar_affiliation"] = result["affiliation"]
-                batch_df.at[index, "total_citations"] = result["total_citations"]
-                batch_df.at[index, "h_index"] = result["h_index"]
-                batch_df.at[index, "i10_index"] = result["i10_index"]
-                batch_df.at[index, "citations_per_year"] = result["citations_per_year"]
-                batch_df.at[index, "total_documents"] = result["total_documents"]
-                batch_df.at[index, "documents_per_year"] = result["documents_per_year"]
-                batch_df.at[index, "interests"] = ", ".join(result["interests"])
-                
-                score, notes = calculate_match_score(original_affiliation, result["affiliation"])
-                batch_df.at[index, "match_score"] = score
-                batch_df.at[index, "match_notes"] = notes
-            else:
-                print(" [Not Found]", end="")
-                batch_df.at[index, "match_notes"] = "Search failed"
-                
-            print("") 
-            time.sleep(0.5) 
-            
-        out_file = os.path.join(BATCH_DIR, f"batch_{start_idx}_{end_idx}.csv")
-        batch_df.to_csv(out_file, index=False)
-        print(f"Saved: {out_file}")
-        time.sleep(2)
+        except SEARCH_ERRORS as e:
+            # Not journaled: the row stays pending for the next run
+            print(f" [Search error: {e}]")
+            continue
 
-# ==============================================================================
-# SECTION 3: MERGING AND VALIDATION LOGIC
-# ==============================================================================
+        if result:
+            print(f" [ID: {result['scholar_id']}]", end="")
+            found[index] = result
+            batch_df.at[index, "scholar_id"] = result["scholar_id"]
+            batch_df.at[index, "scholar_name"] = result["scholar_name"]
+            batch_df.at[index, "scholar_affiliation"] = result["affiliation"]
+            batch_df.at[index, "interests"] = ", ".join(result["interests"])
+        else:
+            print(" [Not Found]", end="")
+            batch_df.at[index, "match_notes"] = "Search failed"
+            JOURNAL.record(index, batch_df.loc[index])
+
+        print("") 
+
+    # Grade all found affiliations in one pass, then scrape the profiles concurrently
+    if found:
+        scores = calculate_match_scores(batch_df.loc[list(found), "calistigi_kurum"],
+                                        [r["affiliation"] for r in found.values()])
+        for index, (score, notes) in zip(found, scores):
+            batch_df.at[index, "match_score"] = score
+            batch_df.at[index, "match_notes"] = notes
+
+        from scholar_async import scrape_many_extra_metrics
+        print(f"Scraping {len(found)} profiles...")
+        
+        def on_result(scholar_id, extras):
+            if extras is None:
+                # Not journaled: the rows stay pending for the next run
+                print(f" [{scholar_id}: not journaled, retried next run]")
+                return
+            for index, result in found.items():
+                if result["scholar_id"] != scholar_id:
+                    continue
+                # Fall back to the "Cited by" count from the search snippet
+                total_citations = extras["total_citations"] if extras["total_citations"] > 0 else result["total_citations"]
+                batch_df.at[index, "total_citations"] = total_citations
+                batch_df.at[index, "h_index"] = extras["h_index"]
+                batch_df.at[index, "i10_index"] = extras["i10_index"]
+                batch_df.at[index, "citations_per_year"] = extras["citations_per_year"]
+                batch_df.at[index, "total_documents"] = extras["total_documents"]
+                batch_df.at[index, "documents_per_year"] = extras["documents_per_year"]
+                JOURNAL.record(index, batch_df.loc[index])
+        
+        scrape_many_extra_metrics([r["scholar_id"] for r in found.values()], on_result=on_result)
+    
+    return batch_df
 
-def normalize_name(name):
-    if not isinstance(name, str):
-        return ""
-    clean = unidecode(name).lower()
-    for char in [".", "-", ",", "(", ")", "[", "]", "'", '"']:
-        clean = clean.replace(char, " ")
-    return " ".join(clean.split())
-
-def is_name_match(name1, name2):
-    if pd.isna(name1) or pd.isna(name2):
-        return False
-    n1 = normalize_name(name1)
-    n2 = normalize_name(name2)
-    if not n1 or not n2: return False
+def process_all_authors(workers=WORKERS, mode=WORKER_MODE):
+    """
+    Processes all pending batches. With workers > 1 the batches are spread over
+    a work-stealing pool (see batch_scheduler.py), one Serper key per worker
+    when several are configured in apis.txt. Returns the failed batches
+    [((start, end), error)]; their unjournaled rows are retried on the next run.
+    """
+    if not os.path.exists(BATCH_DIR):
+        os.makedirs(BATCH_DIR)
+        
+    df_source = pd.read_csv(DATA_FILE)
+    total_records = len(df_source)
     
-    if n1 in n2 or n2 in n1: return True
+    # Identify processed indices (journaled rows + legacy batch files)
+    processed_indices = JOURNAL.completed_indices() | processed_batch_indices()
+    
+    # Resolve all pending Serper searches up front (deduplicated, concurrent)
+    pending = df_source[~df_source.index.isin(processed_indices)]
+    if len(pending):
+        from serper_planner import prefetch_searches
+        print(f"Planning Serper searches for {len(pending)} names...")
+        plan = prefetch_searches(pending["adi_soyadi"].tolist(), pending["calistigi_kurum"].tolist())
+        print(f"  {plan['planned_queries']} planned queries, {plan['dispatched']} dispatched, "
+              f"{plan['deduplicated']} duplicates skipped")
+    
+    batches = []
+    for start_idx in range(0, total_records, BATCH_SIZE):
+        end_idx = min(start_idx + BATCH_SIZE, total_records)
+        
+        batch_indices = set(range(start_idx, end_idx))
+        if batch_indices.issubset(processed_indices):
+            print(f"Skipping batch {start_idx}-{end_idx} (Already processed)")
+            continue
+        batches.append((start_idx, end_idx))
     
-    parts1 = n1.split()
-    parts2 = n2.split()
-    set1 = set(parts1)
-    set2 = set(parts2)
-    common = set1.intersection(set2)
+    from batch_scheduler import run_batches
+    failed = run_batches(batches, workers=workers, mode=mode, api_keys=SERPER_API_KEYS)
     
-    if len(common) >= 2: return True
-    if len(common) >= 1 and any(len(c) > 2 for c in common):
-        rem1 = [p for p in parts1 if p not in common]
-        rem2 = [p for p in parts2 if p not in common]
-        if not rem1 or not rem2: return True
-        if (rem1 and rem2 and rem1[0][0] == rem2[0][0]): return True
-    return False
+    print("\nRate limiter summary:")
+    print(LIMITER.report())
+    print("Connection reuse:")
+    print(CONNECTION_STATS.report())
+    print("Response cache:")
+    print(RESPONSE_CACHE.report())
+    print("Serper searches:")
+    print(serper_report())
+    if failed:
+        print(f"{len(failed)} batches failed:")
+        for (start_idx, end_idx), error in failed:
+            print(f"  {start_idx}-{end_idx}: {error}")
+    return failed
+
+# ==============================================================================
+# SECTION 3: MERGING AND VALIDATION LOGIC
+# ==============================================================================
 
 def merge_and_validate():
+    if len(JOURNAL) > 0:
+        print(f"Streaming {len(JOURNAL)} rows from checkpoint journal...")
+        merged_df = JOURNAL.to_frame()
+        # Rows from older runs that only exist as batch files
+        legacy_df = read_batch_files()
+        if legacy_df is not None:
+            legacy_df = legacy_df[~legacy_df.index.isin(merged_df.index)]
+            merged_df = pd.concat([merged_df, legacy_df]).sort_index()
+        merged_df = merged_df.reset_index(drop=True)
+    else:
+        merged_df = read_batch_files()
+        if merged_df is None:
+            print("No matching files found.")
+            return None
+        merged_df = merged_df.reset_index(drop=True)
+    
+    return validate_merged(merged_df)
+
+def read_batch_files():
+    """Concatenates legacy batch CSVs, indexed by source row. Returns None if there are none."""
     print("Identifying batches to merge...")
     all_files = glob.glob(os.path.join(BATCH_DIR, "batch_*.csv"))
     valid_files = []
@@ -506,43 +784,60 @@ def merge_and_validate():
     files_to_read = [x[1] for x in valid_files]
     
     if not files_to_read:
-        print("No matching files found.")
-        return
+        return None
 
     print(f"Merging {len(files_to_read)} files...")
-    df_list = [pd.read_csv(f) for f in files_to_read]
-    merged_df = pd.concat(df_list, ignore_index=True)
-    
+    df_list = []
+    for start, f in valid_files:
+        batch_df = pd.read_csv(f)
+        batch_df.index = range(start, start + len(batch_df))
+        df_list.append(batch_df)
+    return pd.concat(df_list)
+
+def validate_merged(merged_df):
+    """Clears rows whose Scholar name does not match the awardee, then saves. Returns the validated frame."""
     print(f"Total rows before validation: {len(merged_df)}")
-    mismatch_count = 0
     
-    for index, row in merged_df.iterrows():
-        original_name = row.get("adi_soyadi")
-        scholar_name = row.get("scholar_name")
-        scholar_id = row.get("scholar_id")
-        
-        if pd.isna(scholar_id) or str(scholar_id).lower() == "nan":
-            continue
-            
-        if not is_name_match(original_name, scholar_name):
-            print(f" [MISMATCH] Row {index}: '{original_name}' vs Found '{scholar_name}' -> CLEARED")
-            
-            cols_to_clear = [
-                "scholar_name", "scholar_affiliation", "total_citations", 
-                "h_index", "i10_index", "citations_per_year", 
-                "total_documents", "documents_per_year", "interests",
-                "match_score", "match_notes"
-            ]
-            merged_df.at[index, "scholar_id"] = "no id found"
-            for col in cols_to_clear:
-                if col in merged_df.columns:
-                    merged_df.at[index, col] = None
-            mismatch_count += 1
+    names = add_name_columns(merged_df[["adi_soyadi", "scholar_name"]].copy(), "adi_soyadi")
+    matches = match_frame(names)
+    has_id = merged_df["scholar_id"].notna() & (merged_df["scholar_id"].astype(str).str.lower() != "nan")
+    mismatched = has_id & ~matches["name_match"]
+    # 0-1 name similarity, kept next to the affiliation match_score
+    merged_df = merged_df.drop(columns="name_score", errors="ignore")
+    position = merged_df.columns.get_loc("match_score") + 1 if "match_score" in merged_df.columns else len(merged_df.columns)
+    merged_df.insert(position, "name_score", matches["name_score"].where(has_id))
+    
+    # A mismatched profile that belongs to another awardee points at shifted rows
+    index = NameBlockingIndex(merged_df["adi_soyadi"])
+    owners = index.best_matches(merged_df.loc[mismatched, "scholar_name"].dropna())
+    owners = owners[owners["label"] != owners.index]
+    for row in merged_df.index[mismatched]:
+        original_name = merged_df.at[row, "adi_soyadi"]
+        scholar_name = merged_df.at[row, "scholar_name"]
+        owner = f" (profile of row {owners.at[row, 'label']})" if row in owners.index else ""
+        print(f" [MISMATCH] Row {row}: '{original_name}' vs Found '{scholar_name}'{owner} -> CLEARED")
+    
+    cols_to_clear = [
+        "scholar_name", "scholar_affiliation", "total_citations", 
+        "h_index", "i10_index", "citations_per_year", 
+        "total_documents", "documents_per_year", "interests",
+        "match_score", "match_notes"
+    ]
+    merged_df.loc[mismatched, "scholar_id"] = "no id found"
+    merged_df.loc[mismatched, [c for c in cols_to_clear if c in merged_df.columns]] = None
+    mismatch_count = int(mismatched.sum())
             
     print(f"\nValidation complete. Mismatches cleared: {mismatch_count}")
     merged_df.to_csv(MERGED_OUTPUT_FILE, index=False)
     print(f"Saved merged file to: {MERGED_OUTPUT_FILE}")
 
+    conn = data_store.connect()
+    upserted = data_store.upsert_scrape_results(conn, merged_df)
+    print(f"Upserted {upserted} rows into {data_store.DB_FILE}")
+    from award_metrics import refresh_award_metrics
+    refresh_award_metrics(conn)
+    return merged_df
+
 # ==============================================================================
 # SECTION 4: SERPAPI (LEGACY CODE - COMMENTED OUT)
 # ==============================================================================
@@ -613,7 +908,9 @@ def get_author_metrics_serpapi(author_id):
 if __name__ == "__main__":
     print("Starting Data Scrape Pipeline...")
     print("1. Running Batch Processing...")
-    process_all_authors()
+    failed = process_all_authors()
     
     print("\n2. Running Merge and Validate...")
     merge_and_validate()
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,184 @@
+import os
+import sqlite3
+import sys
+
+import pandas as pd
+
+import yearly_series
+
+# ==============================================================================
+# CANONICAL DATA STORE
+# ==============================================================================
+# Single SQLite database holding the production dataset, replacing the
+# full-file CSV rewrites between pipeline steps:
+#   * typed columns, indexes on scholar_id / yili / genel_alan
+#   * transactional upserts from the scraper (upsert_scrape_results) and
+#     row-level updates from the mapping step (update_column)
+#   * export_csv() still writes data/gebip_scholar_final.csv for the Shiny app
+#     and the Streamlit deployment
+#   * the yearly strings are also kept parsed, in long format, in the
+#     yearly_series table (see yearly_series.py), refreshed on every write
+# On first use the store is seeded from the existing final CSV.
+
+DB_FILE = os.environ.get("GEBIP_DB_FILE", "data/gebip.sqlite")
+FINAL_CSV = "data/gebip_scholar_final.csv"
+TABLE = "researchers"
+
+# Column order of data/gebip_scholar_final.csv
+COLUMN_TYPES = {
+    "sira_no": "INTEGER",
+    "unvan": "TEXT",
+    "adi_soyadi": "TEXT NOT NULL",
+    "yili": "INTEGER",
+    "alan": "TEXT",
+    "calistigi_kurum": "TEXT",
+    "scholar_id": "TEXT",
+    "scholar_isim": "TEXT",
+    "scholar_kurum": "TEXT",
+    "toplam_atif": "INTEGER",
+    "h_indeksi": "INTEGER",
+    "i10_indeksi": "INTEGER",
+    "yillik_atif": "TEXT",
+    "toplam_yayin": "INTEGER",
+    "yillik_yayin": "TEXT",
+    "eslesme_skoru": "REAL",
+    "eslesme_notlari": "TEXT",
+    "odul_aninda_atif": "INTEGER",
+    "odul_aninda_yayin": "INTEGER",
+    "genel_alan": "TEXT",
+    "ilgi_alanlari": "TEXT",
+    "scholar_name": "TEXT",
+    "scholar_affiliation": "TEXT",
+}
+COLUMNS = list(COLUMN_TYPES)
+KEY_COLUMNS = ["yili", "sira_no", "adi_soyadi"]
+
+# Scraper output column -> store column
+SCRAPE_COLUMN_MAP = {
+    "scholar_id": "scholar_id",
+    "scholar_name": "scholar_isim",
+    "scholar_affiliation": "scholar_kurum",
+    "total_citations": "toplam_atif",
+    "h_index": "h_indeksi",
+    "i10_index": "i10_indeksi",
+    "citations_per_year": "yillik_atif",
+    "total_documents": "toplam_yayin",
+    "documents_per_year": "yillik_yayin",
+    "match_score": "eslesme_skoru",
+    "match_notes": "eslesme_notlari",
+    "interests": "ilgi_alanlari",
+}
+
+def connect(path=DB_FILE, seed_csv=FINAL_CSV):
+    """Opens the store, creating the schema (and seeding from the final CSV) if needed."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    cols = ",\n    ".join(f"{c} {t}" for c, t in COLUMN_TYPES.items())
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE} (
+            id INTEGER PRIMARY KEY,
+            {cols},
+            UNIQUE ({", ".join(KEY_COLUMNS)})
+        );
+        CREATE INDEX IF NOT EXISTS idx_{TABLE}_scholar_id ON {TABLE}(scholar_id);
+        CREATE INDEX IF NOT EXISTS idx_{TABLE}_yili ON {TABLE}(yili);
+        CREATE INDEX IF NOT EXISTS idx_{TABLE}_genel_alan ON {TABLE}(genel_alan);
+    """)
+    yearly_series.create_table(conn)
+    empty = conn.execute(f"SELECT COUNT(*) FROM {TABLE}").fetchone()[0] == 0
+    if empty and seed_csv and os.path.exists(seed_csv):
+        upsert_frame(conn, pd.read_csv(seed_csv))
+        print(f"Seeded {path} from {seed_csv}")
+    elif conn.execute(f"SELECT COUNT(*) FROM {yearly_series.SERIES_TABLE}").fetchone()[0] == 0:
+        # Stores created before the series table existed
+        yearly_series.write_series(conn, load_frame(conn))
+    return conn
+
+def _to_db(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def upsert_frame(conn, df):
+    """Inserts or updates rows by (yili, sira_no, adi_soyadi); only df's columns are written."""
+    cols = [c for c in COLUMNS if c in df.columns]
+    updates = ", ".join(f"{c} = excluded.{c}" for c in cols if c not in KEY_COLUMNS)
+    sql = (f"INSERT INTO {TABLE} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+           f"ON CONFLICT ({', '.join(KEY_COLUMNS)}) DO UPDATE SET {updates}")
+    rows = [tuple(_to_db(v) for v in rec) for rec in df[cols].itertuples(index=False, name=None)]
+    with conn:
+        conn.executemany(sql, rows)
+    if any(c in df.columns for c in yearly_series.SERIES_COLUMNS):
+        ids = pd.read_sql(f"SELECT id, {', '.join(KEY_COLUMNS)} FROM {TABLE}", conn)
+        written = df[KEY_COLUMNS].merge(ids, on=KEY_COLUMNS, how="left")["id"]
+        yearly_series.write_series(conn, load_frame(conn).loc[written.dropna().astype(int)])
+    return len(rows)
+
+def normalize_keys(df):
+    """
+    Key columns typed like the store. The awardee list has yili values such
+    as "2001-1" / "2001-2" (two award rounds in 2001); both are stored as 2001.
+    """
+    df = df.copy()
+    df["yili"] = pd.to_numeric(df["yili"].astype(str).str[:4])
+    df["sira_no"] = pd.to_numeric(df["sira_no"])
+    return df
+
+def upsert_scrape_results(conn, scraped_df):
+    """
+    Writes merged scraper output (data_scrape column names) into the store.
+    Rows whose stored scholar_id was curated to a different value (manual
+    overrides, no_scholar_id exclusions) keep their stored data.
+    """
+    df = normalize_keys(scraped_df.rename(columns=SCRAPE_COLUMN_MAP))
+    # The final data keeps the English names as well
+    for english, turkish in (("scholar_name", "scholar_isim"), ("scholar_affiliation", "scholar_kurum")):
+        if turkish in df.columns:
+            df[english] = df[turkish]
+
+    stored = pd.read_sql(f"SELECT {', '.join(KEY_COLUMNS)}, scholar_id AS stored_id FROM {TABLE}", conn)
+    df = df.merge(stored, on=KEY_COLUMNS, how="left")
+    curated = df["stored_id"].notna() & df["scholar_id"].notna() & (df["stored_id"] != df["scholar_id"])
+    if curated.any():
+        print(f"Keeping {curated.sum()} curated rows whose scholar_id differs from the scrape.")
+    return upsert_frame(conn, df[~curated].drop(columns="stored_id"))
+
+def update_column(conn, column, values_by_id):
+    """Row-level update of one column: {row id: value}."""
+    if column not in COLUMN_TYPES:
+        raise ValueError(f"Unknown column: {column}")
+    with conn:
+        conn.executemany(f"UPDATE {TABLE} SET {column} = ? WHERE id = ?",
+                         [(_to_db(v), int(i)) for i, v in values_by_id.items()])
+    if column in yearly_series.SERIES_COLUMNS:
+        yearly_series.write_series(conn, load_frame(conn).loc[list(values_by_id)])
+    return len(values_by_id)
+
+def load_series(conn):
+    """Loads the long-format yearly series as NumPy arrays (yearly_series.YearlySeries)."""
+    return yearly_series.YearlySeries.load(conn)
+
+def load_frame(conn, where=None, params=()):
+    """Loads researchers (indexed by row id) in source order."""
+    sql = f"SELECT id, {', '.join(COLUMNS)} FROM {TABLE}"
+    if where:
+        sql += f" WHERE {where}"
+    return pd.read_sql(sql + " ORDER BY id", conn, params=params, index_col="id")
+
+def export_csv(conn, path=FINAL_CSV, df=None):
+    """Writes the CSV consumed by the Shiny app and the Streamlit deployment (from df if given)."""
+    (load_frame(conn) if df is None else df[COLUMNS]).to_csv(path, index=False)
+    return path
+
+if __name__ == "__main__":
+    # python data_store.py [export]
+    conn = connect()
+    if len(sys.argv) > 1 and sys.argv[1] == "export":
+        print(f"Exported {export_csv(conn)}")
+    n = conn.execute(f"SELECT COUNT(*) FROM {TABLE}").fetchone()[0]
+    print(f"{DB_FILE}: {n} researchers")
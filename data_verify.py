@@ -1,101 +1,85 @@
-
+import json
 import pandas as pd
 import sys
 import os
 
+import data_store
+from verify_engine import RULES_FILE, VerifyRules
+
 # Ensure UTF-8 encoding
 sys.stdout.reconfigure(encoding='utf-8')
 
 # Configuration
 DATA_FILE = 'data/gebip_scholar_final.csv'
 
-def main():
-    if not os.path.exists(DATA_FILE):
-        print(f"Error: {DATA_FILE} not found.")
-        return
-
-    print(f"Loading {DATA_FILE}...\n")
-    df = pd.read_csv(DATA_FILE)
-
-    print("=== FINAL VERIFICATION REPORT ===\n")
-
-    # 1. Check Specific Researchers (Sample Validation)
-    print("1. Sample Corrections Check:")
-    print("-" * 60)
-
-    # Cory David Dunn
-    cory = df[df['Adı Soyadı'].str.contains('Cory David Dunn', case=False, na=False)]
-    if not cory.empty:
-        print(f"\nCory David Dunn:")
-        print(f"  Scholar ID: {cory.iloc[0]['Scholar ID']}")
-        print(f"  Status: {'✓ Correctly set to no_scholar_id' if cory.iloc[0]['Scholar ID'] == 'no_scholar_id' else '✗ NOT set to no_scholar_id'}")
-    
-    # Ozan Yılmaz
-    ozan = df[df['Adı Soyadı'].str.upper() == 'OZAN YILMAZ']
-    if not ozan.empty:
-        print(f"\nOzan Yılmaz:")
-        sid = ozan.iloc[0]['Scholar ID']
-        print(f"  Scholar ID: {sid}")
-        print(f"  Status: {'✓ Correctly set to 2HffCiYAAAAJ' if sid == '2HffCiYAAAAJ' else '✗ NOT set to 2HffCiYAAAAJ'}")
+# Exit codes
+EXIT_PASSED = 0
+EXIT_FAILED = 1        # an "error" rule has violations
+EXIT_WARNINGS = 2      # only "warning" rules have violations (with --strict)
+EXIT_NO_DATA = 3
 
-    # Fevzi Çakmak CEBECİ
-    fevzi = df[df['Adı Soyadı'].str.contains('Fevzi', case=False, na=False) & 
-               df['Adı Soyadı'].str.contains('CEBECİ', case=False, na=False)]
-    if not fevzi.empty:
-        print(f"\nFevzi Çakmak CEBECİ:")
-        sid = fevzi.iloc[0]['Scholar ID']
-        print(f"  Scholar ID: {sid}")
-        print(f"  Status: {'✓ Correctly set to Q4oircsAAAAJ' if sid == 'Q4oircsAAAAJ' else '✗ NOT set to Q4oircsAAAAJ'}")
+class VerificationFailed(Exception):
+    """Raised by the pipeline when an error-severity rule has violations."""
 
-    # 2. Check Standardization
-    print("\n\n2. Standardization Check:")
-    print("-" * 60)
-    
-    # Check for consistency in ID naming
-    no_scholar_count = (df['Scholar ID'] == 'no_scholar_id').sum()
-    no_id_found_count = (df['Scholar ID'] == 'no id found').sum() # legacy check
-    
-    print(f"  Entries with 'no_scholar_id': {no_scholar_count}")
-    print(f"  Entries with 'no id found' (Legacy): {no_id_found_count}")
-    
-    if no_id_found_count > 0:
-        print("  WARNING: You have inconsistent 'no ID' markers. Run data_fixing.py to fix.")
+def load():
+    if os.path.exists(data_store.DB_FILE):
+        print(f"Loading {data_store.DB_FILE}...\n", file=sys.stderr)
+        conn = data_store.connect()
+        df = data_store.load_frame(conn).reset_index(drop=True)
+        conn.close()
     else:
-        print("  ✓ 'no id found' marker is standardized.")
+        print(f"Loading {DATA_FILE}...\n", file=sys.stderr)
+        df = pd.read_csv(DATA_FILE)
+    return df
 
-    # 3. Check Metric Integrity for 'no_scholar_id'
-    print("\n\n3. Metric Integrity Check (no_scholar_id):")
-    print("-" * 60)
-    no_scholar_mask = df['Scholar ID'] == 'no_scholar_id'
-    # Check if they have 0 citations
-    # Note: We expect cleared data to be 0 or NaN
-    ns_df = df[no_scholar_mask]
-    failed_clear = ns_df[ns_df['Toplam Atıf'] > 0]
-    
-    print(f"  Researchers with no_scholar_id: {len(ns_df)}")
-    print(f"  Researchers with no_scholar_id BUT > 0 citations: {len(failed_clear)}")
-    if len(failed_clear) == 0:
-        print("  ✓ All no_scholar_id entries have 0 citations.")
-    else:
-        print("  ✗ Some no_scholar_id entries still have citation data!")
-
-    # 4. Check Zero Award Year Citations
-    print("\n\n4. Zero Award Year Citations Check:")
-    print("-" * 60)
-    # Check people who HAVE an ID but have 0 citations at award year
-    zero_atif = df[(df['Scholar ID'] != 'no_scholar_id') & 
-                   (df['Scholar ID'].notna()) &
-                   ((df['Ödül Yılındaki Atıf'] == 0.0) | (df['Ödül Yılındaki Atıf'] == 0))]
-    
-    print(f"  Researchers with valid ID but 0 award-year citations: {len(zero_atif)}")
-    if len(zero_atif) > 0:
-        print("  (This might be correct if they had no citations by that year, but worth verifying)")
+def print_report(report):
+    print("=== FINAL VERIFICATION REPORT ===")
+    print(f"Rules: {RULES_FILE} (version {report['rules_version']})\n")
+    for result in report["results"]:
+        if result["violations"] == 0:
+            mark = "✓"
+        else:
+            mark = "✗" if result["severity"] == "error" else "!"
+        print(f"{mark} {result['id']}: {result['description']}")
+        if result["violations"]:
+            print(f"    {result['violations']} rows ({result['severity']})")
+            for row in result["sample"]:
+                print(f"      {row}")
 
-    # 5. Summary
+    no_scholar_count = report.get("no_scholar_id", 0)
     print("\n" + "=" * 60)
-    print(f"Total Records: {len(df)}")
-    print(f"Enriched Records: {len(df) - no_scholar_count}")
+    print(f"Total Records: {report['records']}")
+    print(f"Enriched Records: {report['records'] - no_scholar_count}")
+    print(f"Result: {'PASSED' if report['passed'] else 'FAILED'} "
+          f"({report['failed_rules']} failed, {report['warning_rules']} with warnings)")
     print("=" * 60)
 
+def verify(df, rules=None, quiet=False):
+    """Evaluates the verification rules on df and prints the report. Returns the report dict."""
+    rules = rules or VerifyRules.load(RULES_FILE)
+    report = rules.evaluate(df)
+    report["no_scholar_id"] = int((df['scholar_id'] == 'no_scholar_id').sum())
+    if not quiet:
+        print_report(report)
+    return report
+
+def exit_code(report, strict=False):
+    if not report["passed"]:
+        return EXIT_FAILED
+    if strict and report["warning_rules"]:
+        return EXIT_WARNINGS
+    return EXIT_PASSED
+
+def main():
+    # python data_verify.py [--json] [--strict]
+    if not os.path.exists(DATA_FILE) and not os.path.exists(data_store.DB_FILE):
+        print(f"Error: {DATA_FILE} not found.", file=sys.stderr)
+        return EXIT_NO_DATA
+    as_json = "--json" in sys.argv
+    report = verify(load(), quiet=as_json)
+    if as_json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    return exit_code(report, strict="--strict" in sys.argv)
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
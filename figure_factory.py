@@ -0,0 +1,389 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# ==============================================================================
+# FIGURE FACTORY
+# ==============================================================================
+# Builds the dashboard's data-heavy Plotly figures from hashable parameters
+# and caches them serialized:
+#   explorer        the explorer scatter (filters, axes, style, highlight)
+#   award_scatter   award-time vs current citations / publications
+#   time_series     a researcher's cumulative citations / publications
+# Scatter plots pick their rendering by the number of points (render_mode):
+# SVG markers, WebGL markers (Scattergl) from WEBGL_MIN_POINTS, and from
+# DENSITY_MIN_POINTS a 2D histogram binned here on the server (a heatmap of
+# researchers per bin, log-spaced bins on log axes), so the payload and the
+# browser's work stay bounded by the bin grid instead of growing with rows.
+# The cache key is (figure, data version, parameters); values are the figure
+# JSON strings, kept in an LRU bounded by entry count and total size. Strings
+# are immutable, so one factory (st.cache_resource) is shared by all sessions
+# and threads. A hit skips the Plotly Express build and the serialization
+# (most of a miss); it still parses the JSON, and st.plotly_chart validates
+# the returned dict into a go.Figure on every render. A new data version gets
+# a new factory, so stale figures are never served.
+
+MAX_ENTRIES = 256
+MAX_BYTES = 64 * 1024 * 1024
+
+NO_HIGHLIGHT = "Hiçbiri"
+
+# Scatter rendering by number of points
+WEBGL_MIN_POINTS = 1000
+DENSITY_MIN_POINTS = 20000
+DENSITY_BINS = (160, 120)  # x, y
+
+# Sütun isimlerini Türkçeleştirme haritası
+LABELS = {
+    'yili': 'Ödül Yılı',
+    'toplam_atif': 'Toplam Atıf',
+    'h_indeksi': 'H-İndeksi',
+    'i10_indeksi': 'i10-İndeksi',
+    'toplam_yayin': 'Toplam Yayın',
+    'odul_aninda_atif': 'Ödül Anında Atıf',
+    'odul_aninda_yayin': 'Ödül Anında Yayın',
+    'genel_alan': 'Genel Alan',
+    'alan': 'Alan',
+    'calistigi_kurum': 'Kurum',
+    'adi_soyadi': 'Adı Soyadı'
+}
+
+EXPLORER_HOVER = ['adi_soyadi', 'calistigi_kurum', 'alan', 'genel_alan', 'yili',
+                  'h_indeksi', 'toplam_atif', 'toplam_yayin']
+
+# kind: (award column, current column, title, axis labels, show legend)
+AWARD_SCATTERS = {
+    "atif": ('odul_aninda_atif', 'toplam_atif', "Ödül Anı vs Güncel Atıf Sayısı",
+             {'odul_aninda_atif': 'Ödül Anında Atıf', 'toplam_atif': 'Güncel Toplam Atıf'}, False),
+    "yayin": ('odul_aninda_yayin', 'toplam_yayin', "Ödül Anı vs Güncel Yayın Sayısı",
+              {'odul_aninda_yayin': 'Ödül Anında Yayın', 'toplam_yayin': 'Güncel Toplam Yayın'}, True),
+}
+
+# series: (trace name, title, y axis title, line color)
+TIME_SERIES = {
+    "citations": ('Kümülatif Atıf', "Kümülatif Atıf Sayısı", "Kümülatif Atıf", 'blue'),
+    "documents": ('Kümülatif Yayın', "Kümülatif Yayın Sayısı", "Kümülatif Yayın", 'green'),
+}
+
+class FigureCache:
+    """Thread-safe LRU of serialized figures with hit / miss counters."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.build_seconds = 0.0
+
+    def get(self, key, build):
+        """The cached JSON for key; on a miss build() returns a figure to serialize and store."""
+        with self.lock:
+            spec = self.entries.get(key)
+            if spec is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return spec
+            self.misses += 1
+
+        # Built outside the lock; two sessions missing the same key both build
+        start = time.perf_counter()
+        figure = build()
+        spec = "null" if figure is None else pio.to_json(figure, validate=False)
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            self.build_seconds += elapsed
+            if key not in self.entries:
+                self.entries[key] = spec
+                self.bytes += len(spec)
+            while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+                _, old = self.entries.popitem(last=False)
+                self.bytes -= len(old)
+                self.evictions += 1
+        return spec
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "build_seconds": round(self.build_seconds, 3),
+            }
+
+def render_mode(n_points):
+    """"svg", "webgl" or "density" for a scatter of n_points."""
+    if n_points >= DENSITY_MIN_POINTS:
+        return "density"
+    if n_points >= WEBGL_MIN_POINTS:
+        return "webgl"
+    return "svg"
+
+def _bin_edges(values, bins, log):
+    if log:
+        lo, hi = np.log10(values.min()), np.log10(values.max())
+        return np.logspace(lo, max(hi, lo + 1e-9), bins + 1)
+    lo, hi = values.min(), values.max()
+    # Integer values (e.g. award years) over a short range get one bin each
+    if hi - lo < bins and np.array_equal(values, np.round(values)):
+        return np.arange(lo - 0.5, hi + 1.5)
+    return np.linspace(lo, max(hi, lo + 1e-9), bins + 1)
+
+def _bin_centers(edges, log):
+    return np.sqrt(edges[:-1] * edges[1:]) if log else (edges[:-1] + edges[1:]) / 2
+
+def density_figure(rows, x_col, y_col, log_x, log_y, title, labels, height=None):
+    """Heatmap of the number of rows per (x, y) bin, binned on the server."""
+    x = rows[x_col].to_numpy(dtype=np.float64)
+    y = rows[y_col].to_numpy(dtype=np.float64)
+    keep = ~np.isnan(x) & ~np.isnan(y)
+    # Log axes cannot show values <= 0
+    if log_x:
+        keep &= x > 0
+    if log_y:
+        keep &= y > 0
+    x, y = x[keep], y[keep]
+    x_label, y_label = labels.get(x_col, x_col), labels.get(y_col, y_col)
+
+    fig = go.Figure()
+    if len(x):
+        x_edges = _bin_edges(x, DENSITY_BINS[0], log_x)
+        y_edges = _bin_edges(y, DENSITY_BINS[1], log_y)
+        counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+        fig.add_trace(go.Heatmap(
+            x=_bin_centers(x_edges, log_x),
+            y=_bin_centers(y_edges, log_y),
+            z=np.where(counts > 0, counts, np.nan).T,
+            colorscale='Viridis',
+            colorbar=dict(title="Araştırmacı"),
+            hovertemplate=f"{x_label}: %{{x:.3~s}}<br>{y_label}: %{{y:.3~s}}<br>Araştırmacı: %{{z}}<extra></extra>"
+        ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_label,
+        yaxis_title=y_label,
+        xaxis_type="log" if log_x else "linear",
+        yaxis_type="log" if log_y else "linear",
+        height=height
+    )
+    return fig
+
+def _density_title(title, n_points):
+    return f"{title} (yoğunluk, {n_points:,} araştırmacı)"
+
+def _highlight_trace(rows, x_col, y_col, hoverinfo=None):
+    # Siyah çember içine al
+    return go.Scatter(
+        x=rows[x_col],
+        y=rows[y_col],
+        mode='markers',
+        marker=dict(color='black', size=18, symbol='circle-open', line=dict(width=3, color='black')),
+        name="Vurgulanan",
+        hoverinfo=hoverinfo,
+        showlegend=False
+    )
+
+def _highlight_title(title, researcher):
+    # Başlığa ismi ekle (Formatlı)
+    return {
+        'text': f"{title}<br><span style='font-size: 75%; color: gray;'>({researcher} siyah çember ile işaretlenmiştir)</span>",
+        'y': 0.95,
+        'x': 0.5,
+        'xanchor': 'center',
+        'yanchor': 'top'
+    }
+
+class FigureFactory:
+    def __init__(self, df, has_id, yearly, version, cache=None):
+        """
+        df: the dashboard frame; has_id: its "has a Scholar ID" mask; yearly:
+        YearlySeries indexed like df; version: content hash of df.
+        """
+        self.df = df
+        self.has_id = has_id
+        self.yearly = yearly
+        self.version = version
+        self.cache = cache or FigureCache()
+        self.filtered_rows = {}
+
+    def _figure(self, name, params, build):
+        return json.loads(self.cache.get((name, self.version, params), lambda: build(*params)))
+
+    def stats(self):
+        return self.cache.stats()
+
+    def filtered(self, filters):
+        """Rows of the shared sidebar filters: ((min year, max year), fields, only_with_id)."""
+        positions = self.filtered_rows.get(filters)
+        if positions is None:
+            (first, last), fields, only_with_id = filters
+            mask = self.df['yili'].between(first, last) & self.df['genel_alan'].isin(fields)
+            if only_with_id:
+                mask &= self.has_id
+            positions = mask.to_numpy().nonzero()[0]
+            if len(self.filtered_rows) >= MAX_ENTRIES:
+                self.filtered_rows.clear()
+            self.filtered_rows[filters] = positions
+        return self.df.iloc[positions]
+
+    # --------------------------------------------------------------------------
+    # Explorer
+    # --------------------------------------------------------------------------
+
+    def explorer_rows(self, filters, x_col, y_col, size_col):
+        """Plotted rows: filtered, with the axis (and size) values present."""
+        rows = self.filtered(filters).dropna(subset=[x_col, y_col])
+        # Plotly'nin size parametresi NaN değerlerden hoşlanmadığı için temizle
+        if size_col:
+            rows = rows.dropna(subset=[size_col])
+        return rows
+
+    def explorer(self, filters, x_col, y_col, x_label, y_label, log_y, color_col, size_col, opacity, highlight):
+        return self._figure("explorer", (filters, x_col, y_col, x_label, y_label, log_y, color_col,
+                                         size_col, opacity, highlight), self._build_explorer)
+
+    def _build_explorer(self, filters, x_col, y_col, x_label, y_label, log_y, color_col, size_col, opacity, highlight):
+        rows = self.explorer_rows(filters, x_col, y_col, size_col)
+        title = f"{y_label} vs. {x_label}"
+        mode = render_mode(len(rows))
+        if mode == "density":
+            # Renk ve boyut yerine nokta yoğunluğu
+            title = _density_title(title, len(rows))
+            fig = density_figure(rows, x_col, y_col, False, log_y, title, LABELS, height=650)
+        else:
+            fig = px.scatter(
+                rows,
+                x=x_col,
+                y=y_col,
+                color=color_col,
+                size=size_col,
+                size_max=25,
+                opacity=opacity,
+                log_y=log_y,
+                hover_name="adi_soyadi",
+                hover_data={col: True for col in EXPLORER_HOVER},
+                title=title,
+                labels=LABELS,
+                height=650,
+                render_mode=mode
+            )
+
+        # Vurgulanan araştırmacıyı ekle
+        if highlight and highlight != NO_HIGHLIGHT:
+            highlighted = rows[rows['adi_soyadi'] == highlight]
+            if not highlighted.empty:
+                fig.add_trace(_highlight_trace(highlighted, x_col, y_col, hoverinfo='skip'))
+                fig.update_layout(title=_highlight_title(title, highlight))
+
+        fig.update_layout(
+            font=dict(size=12),
+            title_font_size=18
+        )
+        return fig
+
+    # --------------------------------------------------------------------------
+    # Award tab
+    # --------------------------------------------------------------------------
+
+    def award_scatter(self, kind, log_x, log_y, highlight):
+        """kind: "atif" (citations) or "yayin" (publications)."""
+        return self._figure("award_scatter", (kind, log_x, log_y, highlight), self._build_award_scatter)
+
+    def _build_award_scatter(self, kind, log_x, log_y, highlight):
+        award_col, current_col, title, labels, show_legend = AWARD_SCATTERS[kind]
+        rows = self.df[self.has_id]
+        n_points = int((rows[award_col].notna() & rows[current_col].notna()).sum())
+        mode = render_mode(n_points)
+        if mode == "density":
+            title = _density_title(title, n_points)
+            fig = density_figure(rows, award_col, current_col, log_x, log_y, title, labels)
+        else:
+            fig = px.scatter(
+                rows,
+                x=award_col,
+                y=current_col,
+                color='genel_alan',
+                hover_name='adi_soyadi',
+                hover_data=['yili', 'h_indeksi'],
+                title=title,
+                log_x=log_x,
+                log_y=log_y,
+                labels={**labels, 'genel_alan': 'Genel Alan'},
+                render_mode=mode
+            )
+        # Diagonal line (y=x)
+        max_val = max(rows[current_col].max(), rows[award_col].max())
+        fig.add_trace(
+            go.Scatter(x=[0, max_val], y=[0, max_val],
+                       mode='lines', name='y=x',
+                       line=dict(dash='dash', color='gray'))
+        )
+
+        # Vurgulama
+        if highlight and highlight != NO_HIGHLIGHT:
+            highlighted = rows[rows['adi_soyadi'] == highlight]
+            if not highlighted.empty:
+                fig.add_trace(_highlight_trace(highlighted, award_col, current_col))
+                fig.update_layout(title=_highlight_title(title, highlight))
+
+        if not show_legend:
+            fig.update_layout(showlegend=False)
+        return fig
+
+    # --------------------------------------------------------------------------
+    # Profile tab
+    # --------------------------------------------------------------------------
+
+    def time_series(self, researcher_id, series, award_year, log_scale):
+        """Cumulative series of one researcher; None when there is no yearly data."""
+        return self._figure("time_series", (researcher_id, series, award_year, log_scale), self._build_time_series)
+
+    def _build_time_series(self, researcher_id, series, award_year, log_scale):
+        years, _, cumulative = self.yearly.get(researcher_id, series)
+        if not len(years):
+            return None
+        name, title, y_title, color = TIME_SERIES[series]
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=years,
+            y=cumulative,
+            mode='lines+markers',
+            name=name,
+            line=dict(color=color, width=2),
+            marker=dict(size=6)
+        ))
+
+        # Ödül yılı çizgisi
+        if award_year is not None:
+            fig.add_vline(
+                x=award_year,
+                line_dash="dash",
+                line_color="red",
+                annotation_text="Ödül Yılı",
+                annotation_position="top"
+            )
+
+        fig.update_layout(
+            title=title,
+            xaxis_title="Yıl",
+            yaxis_title=y_title,
+            yaxis_type="log" if log_scale else "linear",
+            height=400,
+            xaxis=dict(title=dict(font=dict(size=14)), tickfont=dict(size=12)),
+            yaxis=dict(title=dict(font=dict(size=14)), tickfont=dict(size=12))
+        )
+        return fig
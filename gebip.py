@@ -0,0 +1,303 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+import data_store
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+# ==============================================================================
+# PIPELINE RUNNER
+# ==============================================================================
+# python gebip.py run [stage] [--force] [--only]
+# python gebip.py status
+#
+# The maintenance workflow as a DAG:
+#
+#   scrape -> merge -+-> fix -+-> verify -> export -> aggregates
+#                    +-> map -+
+#
+# fix (scholar_id / profile columns) and map (genel_alan) write disjoint
+# columns and run in parallel. A failed verification (an error rule of
+# data/verify_rules.json with violations) stops the export; aggregates
+# rebuilds the dashboard's precomputed views (dashboard_aggregates.py) from
+# the exported data. Stages hand their frames to each other in memory; a stage
+# with several inputs gets the first input's frame with the columns each other
+# input writes taken from it.
+#
+# Skip-if-fresh: every stage has an input hash (its own rules/input files plus
+# the output hashes of its inputs) and an output hash (content hash of the
+# columns it writes, of the journal, report or exported file). Both are kept
+# in the pipeline_state table; a stage is skipped when its input hash is
+# unchanged and its output still has the recorded hash (so edits made outside
+# the pipeline, e.g. by refresh.py, are picked up). A skipped stage passes on
+# the current store contents.
+#
+# `run stage` runs the stage and whatever it depends on; --only runs just that
+# stage against the current store; --force ignores the recorded hashes.
+
+STATE_TABLE = "pipeline_state"
+STAGE_WORKERS = 4
+
+def frame_hash(df, columns=None):
+    """Content hash of a frame (index, values and column names)."""
+    if columns is not None:
+        df = df[columns]
+    h = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update(",".join(map(str, df.columns)).encode())
+    return h.hexdigest()
+
+def file_hash(path):
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def value_hash(*values):
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+
+class Stage:
+    def __init__(self, name, deps, run, output, writes=None, version=None, current=None):
+        """
+        run(conn, frame) does the work and returns the stage result (a frame for
+        data stages); output(result) hashes it. writes lists the columns the
+        stage changes; version() fingerprints its own inputs (rules, files);
+        current(store_frame) re-hashes its output as it is now, if it can.
+        """
+        self.name = name
+        self.deps = deps
+        self.run = run
+        self.output = output
+        self.writes = writes
+        self.version = version or (lambda: None)
+        self.current = current
+
+# ------------------------------------------------------------------------------
+# Stages
+# ------------------------------------------------------------------------------
+
+def _journal_hash():
+    from checkpoint_journal import JOURNAL
+    return frame_hash(JOURNAL.to_frame()) if len(JOURNAL) else None
+
+def _scrape(conn, frame):
+    from data_scrape import process_all_authors
+    failed = process_all_authors()
+    if failed:
+        raise RuntimeError(f"{len(failed)} scrape batches failed; rerun to retry their rows")
+
+def _merge(conn, frame):
+    from data_scrape import merge_and_validate
+    merge_and_validate()
+    return data_store.load_frame(conn)
+
+def _fix(conn, frame):
+    import data_fixing
+    return data_fixing.run(conn, frame)
+
+def _map(conn, frame):
+    import apply_mappings
+    return apply_mappings.run(conn, frame)
+
+def _verify(conn, frame):
+    import data_verify
+    report = data_verify.verify(frame)
+    if not report["passed"]:
+        raise data_verify.VerificationFailed(f"{report['failed_rules']} verification rules failed")
+    return report
+
+def _export(conn, frame):
+    data_store.export_csv(conn, df=frame)
+    print(f"Exported {data_store.FINAL_CSV}")
+
+def _aggregates(conn, frame):
+    import dashboard_aggregates
+    dashboard_aggregates.build(frame)
+
+def _aggregates_hash():
+    from dashboard_aggregates import AGG_DIR, MANIFEST
+    return file_hash(os.path.join(AGG_DIR, MANIFEST))
+
+def _fix_version():
+    import data_fixing
+    return value_hash(data_fixing.MANUAL_OVERRIDES, data_fixing.LEGACY_NO_ID_MARKERS, data_fixing.PROFILE_COLUMNS)
+
+def _verify_version():
+    from verify_engine import RULES_FILE
+    return file_hash(RULES_FILE)
+
+def _map_version():
+    from mapping_engine import RULES_FILE
+    return file_hash(RULES_FILE)
+
+def _columns_stage(writes):
+    """output / current hashes of a stage that writes the given store columns."""
+    return {"writes": writes,
+            "output": lambda frame: frame_hash(frame, writes),
+            "current": lambda store: frame_hash(store, writes)}
+
+def _data_source():
+    from data_scrape import DATA_FILE
+    return file_hash(DATA_FILE)
+
+FIX_WRITES = ["scholar_id", "scholar_isim", "scholar_kurum", "toplam_atif", "h_indeksi",
+              "i10_indeksi", "yillik_atif", "toplam_yayin", "yillik_yayin", "ilgi_alanlari",
+              "scholar_name", "scholar_affiliation", "odul_aninda_atif", "odul_aninda_yayin"]
+
+STAGES = [
+    Stage("scrape", [], _scrape, output=lambda _: _journal_hash(),
+          version=_data_source, current=lambda _: _journal_hash()),
+    Stage("merge", ["scrape"], _merge, output=frame_hash),
+    Stage("fix", ["merge"], _fix, version=_fix_version, **_columns_stage(FIX_WRITES)),
+    Stage("map", ["merge"], _map, version=_map_version, **_columns_stage(["genel_alan"])),
+    Stage("verify", ["fix", "map"], _verify, version=_verify_version, output=value_hash),
+    Stage("export", ["fix", "map", "verify"], _export, output=lambda _: file_hash(data_store.FINAL_CSV),
+          current=lambda _: file_hash(data_store.FINAL_CSV)),
+    Stage("aggregates", ["export"], _aggregates, output=lambda _: _aggregates_hash(),
+          current=lambda _: _aggregates_hash()),
+]
+STAGE_BY_NAME = {s.name: s for s in STAGES}
+
+# ------------------------------------------------------------------------------
+# Runner
+# ------------------------------------------------------------------------------
+
+def load_state(conn):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+            stage TEXT PRIMARY KEY,
+            input_hash TEXT,
+            output_hash TEXT,
+            finished_at REAL
+        )
+    """)
+    rows = conn.execute(f"SELECT stage, input_hash, output_hash, finished_at FROM {STATE_TABLE}")
+    return {stage: {"input": i, "output": o, "finished_at": t} for stage, i, o, t in rows}
+
+def upstream(name):
+    """The stage and everything it depends on."""
+    needed = {name}
+    for dep in STAGE_BY_NAME[name].deps:
+        needed |= upstream(dep)
+    return needed
+
+def combine(stage, outputs):
+    """Input frame of a stage from its dependencies' frames."""
+    frames = [(STAGE_BY_NAME[d], outputs[d]["frame"]) for d in stage.deps]
+    if not frames:
+        return None
+    frame = frames[0][1]
+    for dep, other in frames[1:]:
+        if dep.writes and other is not frame:
+            frame = frame.copy()
+            frame[dep.writes] = other[dep.writes]
+    return frame
+
+def _run_stage(stage, frame):
+    # One connection per stage thread
+    conn = data_store.connect()
+    try:
+        start = time.perf_counter()
+        result = stage.run(conn, frame)
+        return result, time.perf_counter() - start
+    finally:
+        conn.close()
+
+def run(target=None, force=False, only=False, workers=STAGE_WORKERS):
+    """Runs the pipeline up to target (default: all stages). Returns True on success."""
+    conn = data_store.connect()
+    state = load_state(conn)
+    store = data_store.load_frame(conn)
+
+    if target is None:
+        needed = {s.name for s in STAGES}
+    else:
+        needed = {target} if only else upstream(target)
+
+    # Stages outside the run pass on the current store and their recorded hash
+    outputs = {}
+    for s in STAGES:
+        if s.name not in needed:
+            recorded = state.get(s.name, {}).get("output")
+            outputs[s.name] = {"frame": store, "hash": recorded}
+
+    pending = [s for s in STAGES if s.name in needed]
+    running = {}
+    failed = set()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for stage in list(pending):
+                if any(d in failed for d in stage.deps):
+                    print(f"[{stage.name}] not run: an input stage failed")
+                    failed.add(stage.name)
+                    pending.remove(stage)
+                    continue
+                if not all(d in outputs for d in stage.deps):
+                    continue
+                pending.remove(stage)
+                frame = combine(stage, outputs)
+                input_hash = value_hash(stage.name, stage.version(), [outputs[d]["hash"] for d in stage.deps])
+                recorded = state.get(stage.name)
+                fresh = (not force and recorded is not None and recorded["input"] == input_hash
+                         and (stage.current is None or stage.current(store) == recorded["output"]))
+                if fresh:
+                    print(f"[{stage.name}] up to date, skipped")
+                    outputs[stage.name] = {"frame": store, "hash": recorded["output"]}
+                    continue
+                print(f"[{stage.name}] running...")
+                running[pool.submit(_run_stage, stage, frame)] = (stage, frame, input_hash)
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, frame, input_hash = running.pop(future)
+                try:
+                    result, elapsed = future.result()
+                except Exception as e:
+                    print(f"[{stage.name}] failed: {e}")
+                    failed.add(stage.name)
+                    continue
+                output_hash = stage.output(result)
+                # Report/export stages pass their input frame on
+                out_frame = result if isinstance(result, pd.DataFrame) else frame
+                outputs[stage.name] = {"frame": out_frame, "hash": output_hash}
+                with conn:
+                    conn.execute(f"INSERT OR REPLACE INTO {STATE_TABLE} VALUES (?, ?, ?, ?)",
+                                 (stage.name, input_hash, output_hash, time.time()))
+                print(f"[{stage.name}] done in {elapsed:.1f}s")
+
+    conn.close()
+    if failed:
+        print(f"Failed: {', '.join(s.name for s in STAGES if s.name in failed)}")
+    return not failed
+
+def status():
+    conn = data_store.connect()
+    state = load_state(conn)
+    for s in STAGES:
+        recorded = state.get(s.name)
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(recorded["finished_at"])) if recorded else "never"
+        print(f"  {s.name:<10} last run: {when}")
+
+USAGE = f"usage: python gebip.py run [{'|'.join(STAGE_BY_NAME)}] [--force] [--only]\n       python gebip.py status"
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = {a for a in sys.argv[1:] if a.startswith("--")}
+    if args[:1] == ["run"] and (len(args) == 1 or args[1] in STAGE_BY_NAME):
+        ok = run(args[1] if len(args) > 1 else None, force="--force" in flags, only="--only" in flags)
+        sys.exit(0 if ok else 1)
+    elif args[:1] == ["status"]:
+        status()
+    else:
+        print(USAGE)
+        sys.exit(2)
@@ -0,0 +1,175 @@
+import threading
+from collections import Counter
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# ==============================================================================
+# SHARED HTTP SESSIONS
+# ==============================================================================
+# Keep-alive pooled clients for all Serper and Scholar traffic:
+#   get_session()       requests.Session (one per thread), HTTP/1.1 keep-alive
+#   get_async_client()  httpx.AsyncClient, HTTP/2 when the h2 package is installed
+# Both feed CONNECTION_STATS so a run can confirm connections are being reused.
+# 429/503 are left to rate_limit.LIMITER; the retry policy here only covers
+# connection errors and transient 5xx responses.
+
+# Max pooled connections kept per host
+HOST_POOL_SIZES = {
+    "https://google.serper.dev": 4,
+    "https://scholar.google.com": 8,
+}
+DEFAULT_POOL_SIZE = 4
+RETRY_POLICY = Retry(
+    total=3,
+    connect=3,
+    read=2,
+    status=2,
+    backoff_factor=0.5,
+    status_forcelist=(500, 502, 504),
+    allowed_methods=frozenset({"GET", "POST"}),
+    raise_on_status=False,
+)
+
+class ConnectionStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+        self.http_versions = Counter()
+
+    def add(self, requests=0, new_connections=0, tls_handshakes=0, http_version=None):
+        with self.lock:
+            self.requests += requests
+            self.new_connections += new_connections
+            self.tls_handshakes += tls_handshakes
+            if http_version:
+                self.http_versions[http_version] += 1
+
+    def counts(self):
+        """Raw counters, for adding up the stats of worker processes (add_counts)."""
+        with self.lock:
+            return {"requests": self.requests, "new_connections": self.new_connections,
+                    "tls_handshakes": self.tls_handshakes, "http_versions": dict(self.http_versions)}
+
+    def add_counts(self, counts):
+        with self.lock:
+            self.requests += counts["requests"]
+            self.new_connections += counts["new_connections"]
+            self.tls_handshakes += counts["tls_handshakes"]
+            self.http_versions.update(counts["http_versions"])
+
+    def snapshot(self):
+        with self.lock:
+            reused = max(0, self.requests - self.new_connections)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "tls_handshakes": self.tls_handshakes,
+                "reused_requests": reused,
+                "reuse_ratio": reused / self.requests if self.requests else 0.0,
+                "http_versions": dict(self.http_versions),
+            }
+
+    def report(self):
+        s = self.snapshot()
+        versions = ", ".join(f"{v}: {n}" for v, n in s["http_versions"].items()) or "n/a"
+        return (f"  {s['requests']} requests over {s['new_connections']} connections "
+                f"({s['tls_handshakes']} TLS handshakes), {s['reuse_ratio']:.0%} reused; {versions}")
+
+CONNECTION_STATS = ConnectionStats()
+
+# ------------------------------------------------------------------------------
+# Synchronous (requests)
+# ------------------------------------------------------------------------------
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        CONNECTION_STATS.add(new_connections=1)
+        return super()._new_conn()
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        CONNECTION_STATS.add(new_connections=1, tls_handshakes=1)
+        return super()._new_conn()
+
+class CountingAdapter(HTTPAdapter):
+    """HTTPAdapter that reports requests and newly opened connections."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        CONNECTION_STATS.add(requests=1, http_version="HTTP/1.1")
+        return response
+
+def build_session():
+    session = requests.Session()
+    default = CountingAdapter(pool_connections=len(HOST_POOL_SIZES) + 1,
+                              pool_maxsize=DEFAULT_POOL_SIZE, max_retries=RETRY_POLICY)
+    session.mount("http://", default)
+    session.mount("https://", default)
+    for prefix, size in HOST_POOL_SIZES.items():
+        session.mount(prefix, CountingAdapter(pool_connections=1, pool_maxsize=size,
+                                              max_retries=RETRY_POLICY))
+    return session
+
+_local = threading.local()
+
+def get_session():
+    """Returns this thread's pooled session, creating it on first use."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = build_session()
+        _local.session = session
+    return session
+
+# ------------------------------------------------------------------------------
+# Asynchronous (httpx)
+# ------------------------------------------------------------------------------
+
+async def _trace(event_name, info):
+    if event_name == "connection.connect_tcp.complete":
+        CONNECTION_STATS.add(new_connections=1)
+    elif event_name == "connection.start_tls.complete":
+        CONNECTION_STATS.add(tls_handshakes=1)
+
+async def _on_request(request):
+    request.extensions["trace"] = _trace
+
+async def _on_response(response):
+    CONNECTION_STATS.add(requests=1, http_version=response.http_version)
+
+def get_async_client(max_connections=DEFAULT_POOL_SIZE, timeout=10):
+    """
+    Returns a pooled httpx.AsyncClient (HTTP/2 if available). The caller owns
+    it and should use it as an async context manager.
+    """
+    import httpx
+
+    transport = httpx.AsyncHTTPTransport(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=max_connections,
+                            max_keepalive_connections=max_connections),
+        retries=RETRY_POLICY.connect,
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=timeout,
+        follow_redirects=True,
+        event_hooks={"request": [_on_request], "response": [_on_response]},
+    )
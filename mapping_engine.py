@@ -0,0 +1,101 @@
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+from text_normalize import normalize_name
+
+# ==============================================================================
+# CATEGORY MAPPING ENGINE
+# ==============================================================================
+# Maps the free-text alan of awardees still in the catch-all genel_alan
+# ("Diğer") to a general field, from the versioned rules file
+# data/category_rules.json. Rule kinds, tried in this order:
+#   exact       the alan text as written
+#   normalized  the alan text ASCII-folded, lower-cased, punctuation removed
+#   patterns    regular expressions on the raw text; the highest priority wins
+# Rules are evaluated once per distinct alan value (pd.factorize), not per row:
+# exact / normalized rules are Series.map lookups and all patterns are compiled
+# into one regex of optional lookaheads, so a single str.extract pass reports
+# every pattern that matches each value. apply() also counts the rows won by
+# each rule.
+
+RULES_FILE = "data/category_rules.json"
+UNMATCHED = None
+
+def normalize_label(text):
+    return normalize_name(text)
+
+class CategoryRules:
+    def __init__(self, rules):
+        self.version = rules.get("version")
+        self.source = rules.get("source", "alan")
+        self.target = rules.get("target", "genel_alan")
+        self.only_when = rules.get("only_when")
+        self.exact = dict(rules.get("exact", {}))
+        self.normalized = {normalize_label(k): v for k, v in rules.get("normalized", {}).items()}
+
+        # Highest priority first, file order among equals
+        patterns = sorted(enumerate(rules.get("patterns", [])), key=lambda p: (-p[1].get("priority", 0), p[0]))
+        self.pattern_ids = [f"pattern:{p.get('name', p['pattern'])}" for _, p in patterns]
+        self.pattern_categories = np.array([p["category"] for _, p in patterns], dtype=object)
+        self.combined = None
+        if patterns:
+            for _, p in patterns:
+                re.compile(p["pattern"])  # fail on a bad pattern with its own message
+            self.combined = re.compile("^" + "".join(
+                f"(?:(?=.*?(?P<p{i}>{p['pattern']})))?" for i, (_, p) in enumerate(patterns)))
+
+    @classmethod
+    def load(cls, path=RULES_FILE):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def lookup(self, labels):
+        """(category, rule id) for every label of an index of distinct labels; NaN where no rule matches."""
+        labels = pd.Series(labels, dtype=object)
+        category = labels.map(self.exact)
+        rule = pd.Series(np.where(category.notna(), "exact:" + labels.astype(str), None), dtype=object)
+
+        keys = labels.map(lambda v: normalize_label(v) if isinstance(v, str) else "")
+        todo = category.isna()
+        normalized = keys.map(self.normalized)
+        hit = todo & normalized.notna()
+        category[hit] = normalized[hit]
+        rule[hit] = "normalized:" + keys[hit]
+
+        todo = category.isna() & labels.notna()
+        if self.combined is not None and todo.any():
+            found = labels[todo].astype(str).str.extract(self.combined).notna().to_numpy()
+            any_match = found.any(axis=1)
+            first = found.argmax(axis=1)  # columns are in priority order
+            rows = todo[todo].index[any_match]
+            category[rows] = self.pattern_categories[first[any_match]]
+            rule[rows] = np.array(self.pattern_ids, dtype=object)[first[any_match]]
+        return category, rule
+
+    def apply(self, df):
+        """
+        Returns (mapped target column, {row label: new value} of the changed
+        rows, rule hit counts). Only rows whose target equals only_when are remapped.
+        """
+        codes, uniques = pd.factorize(df[self.source])
+        category, rule = self.lookup(uniques)
+        # Missing source values get code -1: append a "no rule" entry for them
+        category = np.append(category.to_numpy(dtype=object), UNMATCHED)[codes]
+        rule = np.append(rule.to_numpy(dtype=object), UNMATCHED)[codes]
+
+        current = df[self.target]
+        eligible = current.eq(self.only_when).to_numpy() if self.only_when is not None else np.ones(len(df), bool)
+        hit = eligible & pd.notna(category)
+        mapped = current.where(~hit, pd.Series(category, index=df.index))
+        changed = mapped[hit & mapped.ne(current).to_numpy()]
+        hits = pd.Series(rule[hit], dtype=object).value_counts()
+        return mapped, changed.to_dict(), hits
+
+    def unmatched(self, df):
+        """Distinct source values of eligible rows that no rule maps, with their row counts."""
+        mapped, _, _ = self.apply(df)
+        left = df[mapped.eq(self.only_when)] if self.only_when is not None else df
+        return left[self.source].value_counts()
@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+
+from text_normalize import normalize_name
+
+# ==============================================================================
+# NAME MATCHING
+# ==============================================================================
+# Name comparison used by merge_and_validate, deduplicated so it scales to
+# award lists with tens of thousands of rows:
+#   * add_name_columns() normalizes every distinct name once and stores the
+#     normalized string and its token tuple as columns.
+#   * match_frame() compares two such column pairs (awardee vs Scholar name)
+#     over the unique pairs only, with array operations on integer token codes
+#     (no per-pair Python loop), and returns the is_name_match boolean plus a
+#     0-1 similarity score.
+#   * NameBlockingIndex maps tokens and (first initial, last name) keys to rows,
+#     so a list of names can be matched against another without an all-pairs scan.
+# is_name_match() and name_score() are the single-pair interface.
+
+def _match(n1, parts1, n2, parts2):
+    """The is_name_match rules on already-normalized names."""
+    if not n1 or not n2:
+        return False
+    if n1 in n2 or n2 in n1:
+        return True
+    common = set(parts1).intersection(parts2)
+    if len(common) >= 2:
+        return True
+    if len(common) >= 1 and any(len(c) > 2 for c in common):
+        rem1 = [p for p in parts1 if p not in common]
+        rem2 = [p for p in parts2 if p not in common]
+        if not rem1 or not rem2:
+            return True
+        if rem1[0][0] == rem2[0][0]:
+            return True
+    return False
+
+def _score(n1, parts1, n2, parts2):
+    """Similarity in [0, 1]: 1 for containment, else token Jaccard."""
+    if not n1 or not n2:
+        return 0.0
+    if n1 in n2 or n2 in n1:
+        return 1.0
+    set1, set2 = set(parts1), set(parts2)
+    return len(set1 & set2) / len(set1 | set2)
+
+def is_name_match(name1, name2):
+    if pd.isna(name1) or pd.isna(name2):
+        return False
+    n1 = normalize_name(name1)
+    n2 = normalize_name(name2)
+    return _match(n1, n1.split(), n2, n2.split())
+
+def name_score(name1, name2):
+    """0-1 similarity of two names (0.0 if either is missing)."""
+    if pd.isna(name1) or pd.isna(name2):
+        return 0.0
+    n1 = normalize_name(name1)
+    n2 = normalize_name(name2)
+    return _score(n1, n1.split(), n2, n2.split())
+
+def _factorized_names(series):
+    """(codes, normalized uniques, token uniques); missing names get the last, empty entry."""
+    codes, uniques = pd.factorize(series)
+    norm = [normalize_name(n) for n in uniques] + [""]
+    tokens = np.empty(len(norm), dtype=object)  # 1-D array of tuples
+    tokens[:] = [tuple(n.split()) for n in norm]
+    return codes, np.array(norm, dtype=object), tokens
+
+def add_name_columns(df, column, prefix=None):
+    """Adds <prefix>_norm and <prefix>_tokens columns, normalizing each distinct name once."""
+    prefix = prefix or column
+    codes, norm, tokens = _factorized_names(df[column])
+    df[f"{prefix}_norm"] = norm[codes]
+    df[f"{prefix}_tokens"] = tokens[codes]
+    return df
+
+def _token_codes(*token_arrays):
+    """
+    Integer codes for the tokens of arrays of token tuples (one per distinct
+    name): per array (lengths, flat token codes), plus the token vocabulary.
+    """
+    lengths = [np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens)) for tokens in token_arrays]
+    flat = [tok for tokens in token_arrays for t in tokens for tok in t]
+    codes, vocab = pd.factorize(pd.Series(flat, dtype=object))
+    split = np.cumsum([n.sum() for n in lengths])[:-1]
+    return list(zip(lengths, np.split(codes.astype(np.int64), split))), vocab
+
+def _pair_tokens(lengths, codes, names):
+    """(pair number, position, token code) of every token of names[pair]."""
+    offsets = np.cumsum(lengths) - lengths
+    counts = lengths[names]
+    pair = np.repeat(np.arange(len(names)), counts)
+    pos = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return pair, codes[np.repeat(offsets[names], counts) + pos]
+
+def _first_rest(pair, code, keys, common, first_letter, n_pairs):
+    """(first letter code of the first token not in common or -1, all tokens common) per pair."""
+    rest = ~np.isin(keys, common)
+    pairs, first = np.unique(pair[rest], return_index=True)
+    letter = np.full(n_pairs, -1)
+    letter[pairs] = first_letter[code[rest][first]]
+    all_common = np.ones(n_pairs, dtype=bool)
+    all_common[pairs] = False
+    return letter, all_common
+
+def _pair_rules(norm1, tokens1, a, norm2, tokens2, b):
+    """
+    The is_name_match rules and the name score for the pairs
+    (norm1[a[k]], norm2[b[k]]), as array operations. Tokens are integer
+    codes; the token rules come from intersecting the (pair, token) keys of
+    both sides, so pairs without a shared token can only match by containment.
+    """
+    n_pairs = len(a)
+    s1, s2 = norm1[a].astype(str), norm2[b].astype(str)
+    empty = (np.char.str_len(s1) == 0) | (np.char.str_len(s2) == 0)
+    contained = (np.char.find(s2, s1) >= 0) | (np.char.find(s1, s2) >= 0)
+
+    (side1, side2), vocab = _token_codes(tokens1, tokens2)
+    v = max(len(vocab), 1)
+    token_len = np.fromiter(map(len, vocab), dtype=np.int64, count=len(vocab))
+    first_letter, _ = pd.factorize(pd.Series([t[0] for t in vocab], dtype=object))
+    pair1, code1 = _pair_tokens(*side1, a)
+    pair2, code2 = _pair_tokens(*side2, b)
+    keys1, keys2 = pair1 * v + code1, pair2 * v + code2
+    set1, set2 = pd.unique(keys1), pd.unique(keys2)
+    common = np.intersect1d(set1, set2, assume_unique=True)
+
+    n_common = np.bincount(common // v, minlength=n_pairs)
+    long_common = np.zeros(n_pairs, dtype=bool)
+    long_common[(common // v)[token_len[common % v] > 2]] = True
+    union = np.bincount(set1 // v, minlength=n_pairs) + np.bincount(set2 // v, minlength=n_pairs) - n_common
+
+    letter1, rest1_empty = _first_rest(pair1, code1, keys1, common, first_letter, n_pairs)
+    letter2, rest2_empty = _first_rest(pair2, code2, keys2, common, first_letter, n_pairs)
+    one_common = (n_common >= 1) & long_common & (rest1_empty | rest2_empty | (letter1 == letter2))
+
+    match = ~empty & (contained | (n_common >= 2) | one_common)
+    jaccard = np.divide(n_common, union, out=np.zeros(n_pairs), where=union > 0)
+    score = np.where(empty, 0.0, np.where(contained, 1.0, jaccard))
+    return match, score
+
+def match_frame(df, left="adi_soyadi", right="scholar_name"):
+    """
+    Returns a frame (same index as df) with name_match (the is_name_match
+    result) and name_score for every row. Missing names never match.
+    Each distinct (left, right) pair is compared once, with array operations.
+    """
+    if df.empty:
+        return pd.DataFrame({"name_match": np.zeros(0, dtype=bool), "name_score": np.zeros(0)}, index=df.index)
+    for column in (left, right):
+        if f"{column}_norm" not in df.columns:
+            add_name_columns(df, column)
+    n1, p1 = df[f"{left}_norm"].to_numpy(), df[f"{left}_tokens"].to_numpy()
+    n2, p2 = df[f"{right}_norm"].to_numpy(), df[f"{right}_tokens"].to_numpy()
+
+    # Compare each distinct (left, right) pair once
+    left_codes, left_first = _codes(n1)
+    right_codes, right_first = _codes(n2)
+    inverse, first_rows = _codes(left_codes.astype(np.int64) * (right_codes.max() + 1) + right_codes)
+    match, score = _pair_rules(n1[left_first], p1[left_first], left_codes[first_rows],
+                               n2[right_first], p2[right_first], right_codes[first_rows])
+
+    missing = df[left].isna().to_numpy() | df[right].isna().to_numpy()
+    return pd.DataFrame({
+        "name_match": match[inverse] & ~missing,
+        "name_score": np.where(missing, 0.0, score[inverse]),
+    }, index=df.index)
+
+def _codes(values):
+    """(codes, row of each unique's first occurrence)."""
+    codes, _ = pd.factorize(values)
+    # Codes are numbered in order of first appearance
+    first = pd.Series(codes).drop_duplicates().index.to_numpy()
+    return codes, first
+
+def _block_frame(names):
+    """Block keys of every name: (label, key) rows, key a token (> 2 letters) or "first initial|last name"."""
+    frame = add_name_columns(pd.DataFrame({"name": names}), "name")
+    tokens = frame["name_tokens"].explode().dropna()
+    tokens = pd.DataFrame({"label": tokens.index.to_numpy(), "key": tokens.to_numpy()})
+    tokens = tokens[tokens["key"].str.len() > 2]
+    full = frame[frame["name_tokens"].map(len) >= 2]
+    initials = pd.DataFrame({
+        "label": full.index.to_numpy(),
+        "key": [f"{t[0][0]}|{t[-1]}" for t in full["name_tokens"]],
+    })
+    return pd.concat([tokens, initials], ignore_index=True).drop_duplicates(), frame
+
+class NameBlockingIndex:
+    """
+    Inverted index from name tokens and (first initial, last name) keys to row
+    labels. Matching a list of names against it only compares the pairs that
+    share a block key, instead of all pairs.
+    """
+
+    def __init__(self, names):
+        self.blocks, self.names = _block_frame(names)
+
+    def candidate_pairs(self, names):
+        """(query, label) pairs of names (a Series) and indexed rows sharing a block key."""
+        blocks, _ = _block_frame(names)
+        pairs = blocks.merge(self.blocks, on="key", suffixes=("_query", ""))
+        return pairs[["label_query", "label"]].drop_duplicates().rename(columns={"label_query": "query"})
+
+    def best_matches(self, names):
+        """
+        Best matching indexed row for each of names (a Series) that has one:
+        a frame indexed by the query label with label and name_score.
+        """
+        pairs = self.candidate_pairs(names)
+        if pairs.empty:
+            return pd.DataFrame({"label": [], "name_score": []})
+        frame = pd.DataFrame({
+            "query": names.loc[pairs["query"]].to_numpy(),
+            "indexed": self.names["name"].loc[pairs["label"]].to_numpy(),
+        }, index=pairs.index)
+        scores = match_frame(frame, "query", "indexed")
+        pairs = pairs.join(scores)
+        pairs = pairs[pairs["name_match"]].sort_values("name_score", ascending=False, kind="stable")
+        return pairs.drop_duplicates("query").set_index("query")[["label", "name_score"]]
+
+    def __len__(self):
+        return len(self.names)
@@ -0,0 +1,165 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import data_store
+from award_metrics import YearMatrix
+
+# ==============================================================================
+# PER-PAPER CITATION HISTORIES
+# ==============================================================================
+# The scraper already walks every .gsc_a_tr row of a profile; it now also keeps
+# each paper's (year, citations) pair. They are stored per Scholar profile as
+# two NumPy arrays packed into blobs (int16 years, int32 citations, ~6 bytes a
+# paper) in the papers table of the data store.
+#
+# Point-in-time h-index / i10-index:
+#   Scholar only shows a paper's *current* citation count, so a paper's count
+#   at year Y is estimated: papers published after Y count 0, the others are
+#   scaled by one factor per profile so that they add up to the profile's
+#   cumulative citations at Y (from yillik_atif), capped at their current count.
+#   This is an estimate, not Scholar's own historical value: it assumes every
+#   already-published paper gathered the same share of its current citations.
+#
+# The batch engine works on all awardees at once: papers are flattened into one
+# array with a group id per profile, sorted with one lexsort by (group,
+# -citations), and the h-index is the count of papers whose citations are at
+# least their rank within the group.
+
+YEAR_DTYPE = np.int16
+CITATION_DTYPE = np.int32
+
+class PaperHistory:
+    def __init__(self, path=data_store.DB_FILE):
+        self.path = path
+        self.local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        # SQLite connections must not be shared with forked worker processes
+        if conn is None or self.local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS papers (
+                    scholar_id TEXT PRIMARY KEY,
+                    n_papers INTEGER NOT NULL,
+                    years BLOB NOT NULL,
+                    citations BLOB NOT NULL,
+                    recorded_at REAL NOT NULL
+                )
+            """)
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def record(self, scholar_id, papers):
+        """Stores a profile's [(year, citations)] list, replacing any earlier one."""
+        arr = np.asarray(papers, dtype=np.int64).reshape(-1, 2)
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO papers VALUES (?, ?, ?, ?, ?)",
+                         (scholar_id, len(arr), arr[:, 0].astype(YEAR_DTYPE).tobytes(),
+                          arr[:, 1].astype(CITATION_DTYPE).tobytes(), time.time()))
+
+    def get(self, scholar_id):
+        """Returns (years, citations) arrays, or None if the profile has no history."""
+        row = self._conn().execute("SELECT years, citations FROM papers WHERE scholar_id = ?",
+                                   (scholar_id,)).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=YEAR_DTYPE), np.frombuffer(row[1], dtype=CITATION_DTYPE)
+
+    def load(self, scholar_ids):
+        """
+        Flattens the histories of scholar_ids into (group, years, citations),
+        group being the position in scholar_ids. Profiles without a history have no papers.
+        """
+        positions = {}
+        for i, sid in enumerate(scholar_ids):
+            positions.setdefault(sid, []).append(i)
+        groups, years, cits = [], [], []
+        for sid, n, y, c in self._conn().execute("SELECT scholar_id, n_papers, years, citations FROM papers"):
+            # The same profile can belong to several awardee rows
+            for pos in positions.get(sid, []):
+                groups.append(np.full(n, pos, dtype=np.int64))
+                years.append(np.frombuffer(y, dtype=YEAR_DTYPE))
+                cits.append(np.frombuffer(c, dtype=CITATION_DTYPE))
+        if not groups:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        return (np.concatenate(groups), np.concatenate(years).astype(np.int64),
+                np.concatenate(cits).astype(np.int64))
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+# Shared by every scraper in the process
+PAPER_HISTORY = PaperHistory()
+
+def estimate_citations(group, years, citations, query_years, cited_until=None):
+    """
+    Estimated citations of every paper at its profile's query year.
+    query_years / cited_until are aligned with the groups; cited_until is the
+    profile's cumulative citations at the query year (None: no scaling).
+    """
+    query = np.asarray(query_years, dtype=np.float64)[group]
+    published = (years > 0) & (years <= query)
+    est = np.where(published, citations, 0).astype(np.float64)
+    if cited_until is not None:
+        n_groups = len(cited_until)
+        published_total = np.bincount(group, weights=est, minlength=n_groups)
+        scale = np.divide(cited_until, published_total, out=np.ones(n_groups), where=published_total > 0)
+        est = np.minimum(est * np.minimum(scale, 1.0)[group], citations)
+    return np.floor(est)
+
+def batch_h_index(group, citations, n_groups):
+    """h-index and i10-index of every group, from flat per-paper citation arrays."""
+    order = np.lexsort((-citations, group))
+    g, c = group[order], citations[order]
+    starts = np.searchsorted(g, np.arange(n_groups))
+    rank = np.arange(len(g)) - starts[g] + 1
+    h_index = np.bincount(g, weights=(c >= rank), minlength=n_groups).astype(np.int64)
+    i10_index = np.bincount(g, weights=(c >= 10), minlength=n_groups).astype(np.int64)
+    return h_index, i10_index
+
+def historical_indices(conn, query_years=None, offset=0, history=PAPER_HISTORY):
+    """
+    h-index / i10-index of every awardee at yili + offset (or at the given
+    query_years, aligned with the researchers). Returns a frame indexed by
+    researcher id; researchers without a paper history get NaN.
+    """
+    df = data_store.load_frame(conn)
+    if query_years is None:
+        query_years = df["yili"].to_numpy(dtype=np.float64) + offset
+    query_years = np.broadcast_to(np.asarray(query_years, dtype=np.float64), (len(df),))
+
+    # load_frame is ordered by id, as YearMatrix expects
+    matrix = YearMatrix(data_store.load_series(conn), df.index.to_numpy(dtype=np.int64))
+    cited_until = np.nan_to_num(matrix.at("citations", query_years))
+
+    group, years, citations = history.load(df["scholar_id"].tolist())
+    est = estimate_citations(group, years, citations, query_years, cited_until)
+    h_index, i10_index = batch_h_index(group, est, len(df))
+    has_history = np.bincount(group, minlength=len(df)) > 0
+    return pd.DataFrame({
+        "query_year": query_years,
+        "h_indeksi": np.where(has_history, h_index, np.nan),
+        "i10_indeksi": np.where(has_history, i10_index, np.nan),
+    }, index=df.index)
+
+if __name__ == "__main__":
+    # python paper_history.py [offset]  -> h-index / i10-index at award year + offset
+    sys.stdout.reconfigure(encoding='utf-8')
+    offset = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    conn = data_store.connect()
+    result = historical_indices(conn, offset=offset)
+    covered = result["h_indeksi"].notna().sum()
+    print(f"{len(PAPER_HISTORY)} profiles with paper histories, {covered} awardees covered.")
+    if covered:
+        print(result.dropna().describe())
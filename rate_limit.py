@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# ==============================================================================
+# RATE LIMITING
+# ==============================================================================
+# One token bucket per endpoint. Every outbound call first takes a token
+# (waiting if the bucket is empty) and then reports the response status back.
+# 429/503 responses halve the endpoint's rate and pause it for Retry-After
+# seconds (multiplicative decrease); every successful call raises the rate by
+# a small step up to its ceiling (additive increase).
+
+# endpoint: (start rate req/s, max rate req/s, min rate req/s, burst)
+ENDPOINT_LIMITS = {
+    "serper": (5.0, 10.0, 0.5, 5),
+    "scholar": (0.5, 1.0, 0.05, 2),
+}
+INCREASE_STEP = 0.05      # req/s added per successful call
+DECREASE_FACTOR = 0.5     # rate multiplier on 429/503
+MAX_BACKOFF = 120.0       # cap on a single Retry-After / backoff pause
+THROTTLE_STATUSES = {429, 503}
+
+def parse_retry_after(value):
+    """Returns Retry-After in seconds (delta-seconds or HTTP-date form), or None."""
+    if not value:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    def __init__(self, rate, max_rate, min_rate, burst):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.consecutive_throttles = 0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Takes one token and returns how long the caller must wait before using it."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def on_success(self):
+        with self.lock:
+            self.consecutive_throttles = 0
+            self.rate = min(self.max_rate, self.rate + INCREASE_STEP)
+
+    def on_throttle(self, retry_after=None):
+        """Backs off after a 429/503 and returns the pause in seconds."""
+        with self.lock:
+            self.consecutive_throttles += 1
+            self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+            if retry_after is None:
+                retry_after = 2 ** self.consecutive_throttles
+            pause = min(MAX_BACKOFF, retry_after)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+            return pause
+
+class RateLimiter:
+    def __init__(self, limits=ENDPOINT_LIMITS):
+        self.buckets = {name: TokenBucket(*cfg) for name, cfg in limits.items()}
+        self.stats = {name: {"requests": 0, "throttled_responses": 0, "wait_seconds": 0.0}
+                      for name in limits}
+        self.lock = threading.Lock()
+
+    def _reserve(self, endpoint):
+        wait = self.buckets[endpoint].reserve()
+        with self.lock:
+            self.stats[endpoint]["requests"] += 1
+            self.stats[endpoint]["wait_seconds"] += wait
+        return wait
+
+    def wait(self, endpoint):
+        """Blocks until a request to endpoint may be sent."""
+        wait = self._reserve(endpoint)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def wait_async(self, endpoint):
+        wait = self._reserve(endpoint)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def feedback(self, endpoint, status_code, headers=None):
+        """
+        Reports a response. Returns True if it was a throttle response
+        (429/503) and the request should be retried.
+        """
+        bucket = self.buckets[endpoint]
+        if status_code in THROTTLE_STATUSES:
+            retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+            pause = bucket.on_throttle(retry_after)
+            with self.lock:
+                self.stats[endpoint]["throttled_responses"] += 1
+            print(f" [{endpoint}: HTTP {status_code}, backing off {pause:.1f}s]", end="")
+            return True
+        bucket.on_success()
+        return False
+
+    def scale(self, share):
+        """
+        Keeps this limiter to share (0-1] of every endpoint's rates and burst,
+        for a process that is one of several sending to the same endpoints.
+        """
+        for bucket in self.buckets.values():
+            with bucket.lock:
+                bucket.rate *= share
+                bucket.max_rate *= share
+                bucket.min_rate *= share
+                bucket.burst = max(1, int(bucket.burst * share))
+                bucket.tokens = min(bucket.tokens, bucket.burst)
+
+    def report(self):
+        lines = []
+        for name, s in self.stats.items():
+            lines.append(
+                f"  {name}: {s['requests']} requests, {s['throttled_responses']} throttled responses, "
+                f"{s['wait_seconds']:.1f}s spent waiting, current rate {self.buckets[name].rate:.2f} req/s"
+            )
+        return "\n".join(lines)
+
+def endpoint_for(url):
+    host = urlsplit(url).netloc
+    return "serper" if host.endswith("serper.dev") else "scholar"
+
+# Shared by every scraper in the process
+LIMITER = RateLimiter()
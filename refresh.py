@@ -0,0 +1,154 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import data_store
+from award_metrics import refresh_award_metrics
+from data_scrape import PAGE_SIZE, crawl_publications, fetch_first_page
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+# ==============================================================================
+# INCREMENTAL REFRESH
+# ==============================================================================
+# Updates the metrics of already matched profiles without re-running the
+# pipeline. Per Scholar profile the profile_fetches table keeps the citation
+# total seen last and when the profile was last checked / fully crawled.
+#   1. Every profile's first publication page is fetched fresh (bypassing the
+#      response cache); it carries the metrics table and the citation graph.
+#   2. Only if its total citations differ from the stored value, or the last
+#      full crawl is older than REFRESH_TTL_DAYS, is the rest of the
+#      publication list paginated. Otherwise the profile cost one request.
+# Profiles that were never crawled under refresh fall back to the time their
+# paper history was recorded; with neither they count as stale.
+# Changed rows are written through data_store.update_column, after which the
+# award-year metrics are refreshed and the final CSV exported.
+
+STATE_TABLE = "profile_fetches"
+REFRESH_TTL_DAYS = 28
+REFRESH_WORKERS = 4
+DAY = 24 * 3600
+NO_SCHOLAR_ID = "no_scholar_id"
+
+# Store column <- metric, for the first page and for a full crawl
+FIRST_PAGE_COLUMNS = {
+    "toplam_atif": "total_citations",
+    "h_indeksi": "h_index",
+    "i10_indeksi": "i10_index",
+    "yillik_atif": "citations_per_year",
+}
+CRAWL_COLUMNS = {
+    "toplam_yayin": "total_documents",
+    "yillik_yayin": "documents_per_year",
+}
+
+def create_table(conn):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+            scholar_id TEXT PRIMARY KEY,
+            total_citations INTEGER,
+            checked_at REAL,
+            crawled_at REAL
+        )
+    """)
+
+def load_profiles(conn):
+    """One row per matched Scholar profile: row ids, stored totals and fetch times."""
+    df = data_store.load_frame(conn, "scholar_id IS NOT NULL AND scholar_id != ?", (NO_SCHOLAR_ID,))
+    profiles = df.reset_index().groupby("scholar_id").agg(
+        ids=("id", list), toplam_atif=("toplam_atif", "max"), toplam_yayin=("toplam_yayin", "max"))
+    state = pd.read_sql(f"SELECT scholar_id, crawled_at FROM {STATE_TABLE}", conn, index_col="scholar_id")
+    recorded = pd.read_sql("SELECT scholar_id, recorded_at FROM papers", conn, index_col="scholar_id") \
+        if conn.execute("SELECT name FROM sqlite_master WHERE name = 'papers'").fetchone() else None
+    profiles["crawled_at"] = state["crawled_at"].reindex(profiles.index)
+    if recorded is not None:
+        profiles["crawled_at"] = profiles["crawled_at"].fillna(recorded["recorded_at"].reindex(profiles.index))
+    return profiles
+
+def check_profile(scholar_id, stored_citations, crawled_at, now, ttl, force=False):
+    """
+    Fetches the first page and, if needed, the full publication list.
+    Returns (status, metrics) with status "unchanged", "changed", "stale" or "failed".
+    """
+    try:
+        first = fetch_first_page(scholar_id, use_cache=False)
+        if first is None:
+            return "failed", None
+        metrics, first_page = first
+        # A blocked / unparsable page has no metrics table; keep the stored data
+        if metrics["total_citations"] == 0 and stored_citations > 0:
+            return "failed", None
+        if metrics["total_citations"] != stored_citations:
+            status = "changed"
+        elif force or pd.isna(crawled_at) or now - crawled_at > ttl:
+            status = "stale"
+        else:
+            return "unchanged", metrics
+        metrics = crawl_publications(scholar_id, metrics, first_page, use_cache=False)
+        return (status, metrics) if metrics is not None else ("failed", None)
+    except Exception as e:
+        print(f"  [{scholar_id}] refresh error: {e}")
+        return "failed", None
+
+def refresh(conn=None, ttl_days=REFRESH_TTL_DAYS, force=False, limit=None, workers=REFRESH_WORKERS):
+    """Refreshes all matched profiles. Returns a {status: count} summary plus request counts."""
+    conn = conn or data_store.connect()
+    create_table(conn)
+    profiles = load_profiles(conn)
+    if limit:
+        profiles = profiles.head(limit)
+    now = time.time()
+    ttl = ttl_days * DAY
+    print(f"Refreshing {len(profiles)} Scholar profiles (TTL {ttl_days} days)...")
+
+    def run(item):
+        sid, row = item
+        stored = 0 if pd.isna(row["toplam_atif"]) else int(row["toplam_atif"])
+        return check_profile(sid, stored, row["crawled_at"], now, ttl, force)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run, profiles.iterrows()))
+
+    summary = {"unchanged": 0, "changed": 0, "stale": 0, "failed": 0, "requests": 0}
+    updates = {col: {} for col in [*FIRST_PAGE_COLUMNS, *CRAWL_COLUMNS]}
+    state = []
+    for (sid, row), (status, metrics) in zip(profiles.iterrows(), results):
+        summary[status] += 1
+        summary["requests"] += 1
+        if metrics is None:
+            continue
+        crawled_at = row["crawled_at"]
+        if status != "unchanged":
+            crawled_at = now
+            summary["requests"] += max(0, -(-metrics["total_documents"] // PAGE_SIZE) - 1)
+            columns = {**FIRST_PAGE_COLUMNS, **CRAWL_COLUMNS}
+            for col, key in columns.items():
+                updates[col].update({i: metrics[key] for i in row["ids"]})
+        state.append((sid, metrics["total_citations"], now, None if pd.isna(crawled_at) else float(crawled_at)))
+
+    for col, values in updates.items():
+        if values:
+            data_store.update_column(conn, col, values)
+    with conn:
+        conn.executemany(f"INSERT OR REPLACE INTO {STATE_TABLE} VALUES (?, ?, ?, ?)", state)
+
+    full = int(profiles["toplam_yayin"].fillna(0).floordiv(PAGE_SIZE).add(1).sum())
+    summary["full_crawl_requests"] = full
+    print(f"  {summary['unchanged']} unchanged, {summary['changed']} changed, "
+          f"{summary['stale']} stale, {summary['failed']} failed")
+    print(f"  {summary['requests']} Scholar requests (a full re-crawl needs ~{full})")
+
+    if summary["changed"] or summary["stale"]:
+        refresh_award_metrics(conn)
+        data_store.export_csv(conn)
+    return summary
+
+if __name__ == "__main__":
+    # python refresh.py [--force] [--ttl-days N] [--limit N]
+    args = sys.argv[1:]
+    def option(name, default):
+        return int(args[args.index(name) + 1]) if name in args else default
+    refresh(ttl_days=option("--ttl-days", REFRESH_TTL_DAYS), force="--force" in args,
+            limit=option("--limit", None))
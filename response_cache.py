@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# ==============================================================================
+# ON-DISK HTTP RESPONSE CACHE
+# ==============================================================================
+# SQLite cache for Serper and Scholar responses so reruns (e.g. after changing
+# parsing logic) do not download the same pages again.
+#   * Keyed by method + normalized URL (+ JSON body for Serper POSTs).
+#   * Bodies are zlib-compressed and content-addressed (sha256), so identical
+#     pages are stored once.
+#   * Per-endpoint TTLs; least recently used entries are evicted once the
+#     cache grows beyond MAX_CACHE_BYTES.
+#   * Offline "replay only" mode (SCRAPE_OFFLINE=1): stale entries are served
+#     and misses raise CacheMiss instead of going to the network.
+
+CACHE_FILE = os.environ.get("HTTP_CACHE_FILE", "data/http_cache.sqlite")
+DAY = 24 * 3600
+ENDPOINT_TTLS = {
+    "scholar": 7 * DAY,
+    "serper": 30 * DAY,
+}
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+EVICT_EVERY = 200  # check the size bound every N stores
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a request is not in the cache."""
+
+class CachedResponse:
+    """Minimal stand-in for requests/httpx responses served from the cache."""
+    from_cache = True
+
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code} (cached) for {self.url}")
+
+def normalize_url(url):
+    """Lowercases scheme/host, drops default ports and fragments, sorts query params."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ""
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+def cache_key(method, url, body=None):
+    raw = f"{method.upper()} {normalize_url(url)}"
+    if body is not None:
+        raw += " " + json.dumps(body, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    def __init__(self, path=CACHE_FILE, ttls=ENDPOINT_TTLS, max_bytes=MAX_CACHE_BYTES,
+                 offline=os.environ.get("SCRAPE_OFFLINE") == "1"):
+        self.path = path
+        self.ttls = ttls
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "stores": 0, "evicted": 0}
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        # SQLite connections must not be shared with forked worker processes
+        if conn is None or self.local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS bodies (
+                    content_hash TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers TEXT,
+                    content_hash TEXT NOT NULL REFERENCES bodies(content_hash),
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);
+                CREATE INDEX IF NOT EXISTS idx_responses_hash ON responses(content_hash);
+            """)
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def _count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def get(self, method, url, endpoint, body=None):
+        """
+        Returns a CachedResponse, or None on a miss/expired entry.
+        Raises CacheMiss in offline mode instead of returning None.
+        """
+        key = cache_key(method, url, body)
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT r.status, r.headers, r.fetched_at, b.body FROM responses r "
+            "JOIN bodies b ON b.content_hash = r.content_hash WHERE r.key = ?", (key,)
+        ).fetchone()
+
+        if row is not None:
+            status, headers, fetched_at, blob = row
+            expired = time.time() - fetched_at > self.ttls.get(endpoint, DAY)
+            if not expired or self.offline:
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+                self._count("hits")
+                return CachedResponse(url, status, json.loads(headers or "{}"), zlib.decompress(blob))
+            self._count("stale")
+        else:
+            self._count("misses")
+
+        if self.offline:
+            raise CacheMiss(f"offline, not cached: {method} {url}")
+        return None
+
+    def put(self, method, url, endpoint, status_code, headers, content, body=None):
+        """Stores a successful response. Non-200 responses are not cached."""
+        if status_code != 200:
+            return
+        key = cache_key(method, url, body)
+        content_hash = hashlib.sha256(content).hexdigest()
+        blob = zlib.compress(content, 6)
+        kept_headers = {k: v for k, v in dict(headers).items() if k.lower() == "content-type"}
+        now = time.time()
+
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO bodies VALUES (?, ?, ?)",
+                         (content_hash, blob, len(blob)))
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (key, normalize_url(url), endpoint, status_code,
+                          json.dumps(kept_headers), content_hash, now, now))
+        self._count("stores")
+        if self.stats["stores"] % EVICT_EVERY == 0:
+            self.evict()
+
+    def total_bytes(self):
+        return self._conn().execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+
+    def evict(self):
+        """Drops least recently used entries until the cache fits in max_bytes."""
+        conn = self._conn()
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return 0
+
+        removed = 0
+        rows = conn.execute(
+            "SELECT r.key, r.content_hash, b.size FROM responses r "
+            "JOIN bodies b ON b.content_hash = r.content_hash ORDER BY r.accessed_at"
+        ).fetchall()
+        with conn:
+            for key, content_hash, size in rows:
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                still_used = conn.execute(
+                    "SELECT 1 FROM responses WHERE content_hash = ? LIMIT 1", (content_hash,)
+                ).fetchone()
+                if not still_used:
+                    conn.execute("DELETE FROM bodies WHERE content_hash = ?", (content_hash,))
+                    total -= size
+                removed += 1
+        with self.lock:
+            self.stats["evicted"] += removed
+        return removed
+
+    def export_scholar_pages(self, out_dir):
+        """
+        Writes cached Scholar pages in the layout served by scholar_stub_server.py
+        (<user>.html, <user>_<cstart>.html) so the cache can be used as fixtures.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        count = 0
+        rows = self._conn().execute(
+            "SELECT r.url, b.body FROM responses r JOIN bodies b ON b.content_hash = r.content_hash "
+            "WHERE r.endpoint = 'scholar'"
+        )
+        for url, blob in rows:
+            query = dict(parse_qsl(urlsplit(url).query))
+            if "user" not in query:
+                continue
+            name = f"{query['user']}_{query['cstart']}.html" if "cstart" in query else f"{query['user']}.html"
+            with open(os.path.join(out_dir, os.path.basename(name)), "wb") as f:
+                f.write(zlib.decompress(blob))
+            count += 1
+        return count
+
+    def report(self):
+        s = self.stats
+        lookups = s["hits"] + s["misses"] + s["stale"]
+        rate = s["hits"] / lookups if lookups else 0.0
+        return (f"  {s['hits']} hits, {s['misses']} misses, {s['stale']} expired "
+                f"({rate:.0%} hit rate), {s['stores']} stored, {s['evicted']} evicted"
+                f"{' [offline]' if self.offline else ''}")
+
+# Shared by every scraper in the process
+RESPONSE_CACHE = ResponseCache()
+
+if __name__ == "__main__":
+    # python response_cache.py [stats | evict | export <dir>]
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "evict":
+        print(f"Evicted {RESPONSE_CACHE.evict()} entries.")
+    elif command == "export":
+        out_dir = sys.argv[2] if len(sys.argv) > 2 else "data/scholar_html"
+        print(f"Exported {RESPONSE_CACHE.export_scholar_pages(out_dir)} pages to {out_dir}")
+    n = RESPONSE_CACHE._conn().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    print(f"{CACHE_FILE}: {n} responses, {RESPONSE_CACHE.total_bytes() / 1e6:.1f} MB compressed")
@@ -0,0 +1,199 @@
+import asyncio
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+
+from data_scrape import (
+    MAX_PAGES, MAX_RETRIES, PAGE_SIZE, SCHOLAR_HEADERS, SPECULATIVE_PAGES, empty_metrics,
+    estimate_page_count, format_yearly_counts, parse_profile_metrics, parse_publication_page,
+    pages_complete, profile_url, summarize_pages,
+)
+from http_session import get_async_client
+from paper_history import PAPER_HISTORY
+from rate_limit import LIMITER, endpoint_for
+from response_cache import RESPONSE_CACHE, CacheMiss
+
+# ==============================================================================
+# ASYNC PROFILE FETCHER
+# ==============================================================================
+# Fetches many Google Scholar profiles at once. The global limit caps the total
+# number of in-flight requests, the per-host limit caps how hard a single host
+# (scholar.google.com, or a local stand-in server) is hit at the same time.
+# Request pacing and 429/503 backoff come from the shared rate_limit.LIMITER;
+# pages already in response_cache.RESPONSE_CACHE are not fetched again.
+# Set SCHOLAR_BASE_URL (or pass base_url) to point the engine at a local server
+# that serves saved Scholar HTML.
+# scrape_many_extra_metrics keeps one event loop and AsyncClient per thread, so
+# the batches a worker runs reuse its pooled connections; close_async_clients()
+# closes them at the end of a run.
+
+GLOBAL_CONCURRENCY = 16
+PER_HOST_CONCURRENCY = 4
+REQUEST_TIMEOUT = 10
+
+class HostLimits:
+    """Global semaphore plus one lazily created semaphore per host."""
+
+    def __init__(self, global_limit, per_host_limit):
+        self.global_sem = asyncio.Semaphore(global_limit)
+        self.per_host_limit = per_host_limit
+        self.host_sems = {}
+
+    def for_host(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.host_sems:
+            self.host_sems[host] = asyncio.Semaphore(self.per_host_limit)
+        return self.host_sems[host]
+
+async def _get(client, limits, url, max_retries=MAX_RETRIES):
+    endpoint = endpoint_for(url)
+    cached = RESPONSE_CACHE.get("GET", url, endpoint)
+    if cached is not None:
+        return cached
+    
+    async with limits.global_sem:
+        async with limits.for_host(url):
+            for attempt in range(max_retries + 1):
+                await LIMITER.wait_async(endpoint)
+                response = await client.get(url, headers=SCHOLAR_HEADERS)
+                if not LIMITER.feedback(endpoint, response.status_code, response.headers):
+                    break
+    
+    RESPONSE_CACHE.put("GET", url, endpoint, response.status_code, response.headers, response.content)
+    return response
+
+async def _fetch_publication_page(client, limits, scholar_id, page_num, base_url=None):
+    try:
+        response = await _get(client, limits, profile_url(scholar_id, page_num, base_url))
+    except (httpx.HTTPError, CacheMiss):
+        return None
+    if response.status_code != 200:
+        return None
+    return parse_publication_page(response.text)
+
+async def fetch_remaining_pages(client, limits, scholar_id, estimated_pages, base_url=None):
+    """Async version of data_scrape.fetch_remaining_pages."""
+    pages = {}
+    tasks = {}
+    stop = MAX_PAGES  # first page that is short or failed
+    next_page = 1
+    
+    def submit_next():
+        nonlocal next_page
+        task = asyncio.create_task(_fetch_publication_page(client, limits, scholar_id, next_page, base_url))
+        tasks[task] = next_page
+        next_page += 1
+    
+    while next_page < min(estimated_pages + SPECULATIVE_PAGES, MAX_PAGES):
+        submit_next()
+    
+    while tasks:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            page_num = tasks.pop(task)
+            try:
+                result = task.result()
+            except Exception:
+                result = None
+            pages[page_num] = result
+            if result is None or result[0] < PAGE_SIZE:
+                stop = min(stop, page_num)
+            elif next_page < stop:
+                submit_next()
+        
+        # Cancel speculative requests past the last page
+        for task, page_num in list(tasks.items()):
+            if page_num > stop:
+                task.cancel()
+                del tasks[task]
+    
+    return pages
+
+async def fetch_extra_metrics(client, limits, scholar_id, base_url=None):
+    """Async version of data_scrape.scrape_extra_metrics; returns the same dict, or None on failure."""
+    metrics = empty_metrics()
+    
+    try:
+        response = await _get(client, limits, profile_url(scholar_id, 0, base_url))
+        if response.status_code != 200:
+            print(f" [{scholar_id}: Scrape Failed: {response.status_code}]")
+            return None
+        
+        parse_profile_metrics(response.text, metrics)
+        
+        pages = {0: parse_publication_page(response.text)}
+        if pages[0][0] >= PAGE_SIZE:
+            pages.update(await fetch_remaining_pages(
+                client, limits, scholar_id, estimate_page_count(metrics), base_url))
+        if not pages_complete(pages):
+            print(f" [{scholar_id}: Publication Page Failed]")
+            return None
+        total_docs_count, doc_years, papers = summarize_pages(pages)
+        
+        metrics["total_documents"] = total_docs_count
+        metrics["documents_per_year"] = format_yearly_counts(doc_years)
+        metrics["papers"] = papers
+        if papers:
+            PAPER_HISTORY.record(scholar_id, papers)
+        return metrics
+    
+    except Exception as e:
+        print(f" [{scholar_id}: Scrape Error: {e}]")
+        return None
+
+async def fetch_many_extra_metrics(scholar_ids, global_limit=GLOBAL_CONCURRENCY,
+                                   per_host_limit=PER_HOST_CONCURRENCY, base_url=None,
+                                   on_result=None, client=None):
+    """
+    Fetches metrics for all IDs concurrently. Returns {scholar_id: metrics},
+    None for profiles that failed. on_result(scholar_id, metrics) is called as
+    soon as each profile is done. Without a client, one is opened for the call.
+    """
+    unique_ids = list(dict.fromkeys(scholar_ids))
+    limits = HostLimits(global_limit, per_host_limit)
+    
+    async def fetch_one(client, sid):
+        metrics = await fetch_extra_metrics(client, limits, sid, base_url)
+        if on_result is not None:
+            on_result(sid, metrics)
+        return metrics
+    
+    if client is None:
+        async with get_async_client(max_connections=global_limit, timeout=REQUEST_TIMEOUT) as client:
+            results = await asyncio.gather(*(fetch_one(client, sid) for sid in unique_ids))
+    else:
+        results = await asyncio.gather(*(fetch_one(client, sid) for sid in unique_ids))
+    return dict(zip(unique_ids, results))
+
+_local = threading.local()
+_loops = []  # (loop, clients) of every thread, for close_async_clients
+_loops_lock = threading.Lock()
+
+def _thread_client(global_limit):
+    """This thread's event loop and its AsyncClient for global_limit, created on first use."""
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _local.loop = asyncio.new_event_loop()
+        _local.clients = {}
+        with _loops_lock:
+            _loops.append((loop, _local.clients))
+    if global_limit not in _local.clients:
+        _local.clients[global_limit] = get_async_client(max_connections=global_limit, timeout=REQUEST_TIMEOUT)
+    return loop, _local.clients[global_limit]
+
+def scrape_many_extra_metrics(scholar_ids, global_limit=GLOBAL_CONCURRENCY, **kwargs):
+    """Blocking entry point for the synchronous pipeline, on this thread's loop and client."""
+    loop, client = _thread_client(global_limit)
+    return loop.run_until_complete(
+        fetch_many_extra_metrics(scholar_ids, global_limit=global_limit, client=client, **kwargs))
+
+def close_async_clients():
+    """Closes the clients and loops of scrape_many_extra_metrics. Call once their threads are done."""
+    with _loops_lock:
+        loops = _loops[:]
+        _loops.clear()
+    for loop, clients in loops:
+        for client in clients.values():
+            loop.run_until_complete(client.aclose())
+        loop.close()
@@ -0,0 +1,159 @@
+import os
+from abc import ABC, abstractmethod
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# ==============================================================================
+# SCHOLAR PROFILE PAGE PARSERS
+# ==============================================================================
+# Every parser extracts the same three things from a profile page:
+#   #gsc_rsb_st          citations / h-index / i10-index table
+#   .gsc_g_t / .gsc_g_a  yearly citation graph
+#   .gsc_a_tr            publication rows, with their year (.gsc_a_y) and
+#                        current citation count (.gsc_a_c)
+# LxmlParser (C-backed) is used when lxml is installed; BeautifulSoupParser is
+# the original html.parser implementation and stays as the fallback.
+# SCHOLAR_PARSER=bs4|lxml forces a backend.
+
+def _metric_label_key(label):
+    label = label.lower()
+    if "citations" in label or "alıntılar" in label:
+        return "total_citations"
+    if "h-index" in label or "h-endeksi" in label:
+        return "h_index"
+    if "i10-index" in label or "i10-endeksi" in label:
+        return "i10_index"
+    return None
+
+class ProfilePageParser(ABC):
+    name = "base"
+
+    @abstractmethod
+    def parse_metrics(self, html):
+        """
+        Returns {"total_citations", "h_index", "i10_index", "citations_per_year"}
+        for the keys found on the page.
+        """
+
+    @abstractmethod
+    def parse_publications(self, html):
+        """
+        Returns (row_count, [(year, citations)]) for a publication list page,
+        one pair per row; year is 0 when the row has none.
+        """
+
+class BeautifulSoupParser(ProfilePageParser):
+    name = "bs4"
+
+    def parse_metrics(self, html):
+        soup = BeautifulSoup(html, "html.parser")
+        metrics = {}
+
+        table = soup.select_one("#gsc_rsb_st")
+        if table:
+            for row in table.find_all("tr"):
+                cols = row.find_all("td")
+                if len(cols) >= 2:
+                    key = _metric_label_key(cols[0].get_text(strip=True))
+                    val_all = cols[1].get_text(strip=True)
+                    if key:
+                        metrics[key] = int(val_all) if val_all.isdigit() else 0
+
+        years_els = soup.select(".gsc_g_t")
+        vals_els = soup.select(".gsc_g_a")
+        if not vals_els:
+            vals_els = soup.select(".gsc_g_al")
+
+        yearly_data = []
+        if len(years_els) == len(vals_els):
+            for y, v in zip(years_els, vals_els):
+                yearly_data.append(f"{y.get_text(strip=True)}:{v.get_text(strip=True)}")
+        metrics["citations_per_year"] = " | ".join(yearly_data)
+        return metrics
+
+    def parse_publications(self, html):
+        soup = BeautifulSoup(html, "html.parser")
+        rows = soup.select(".gsc_a_tr")
+        papers = []
+        for row in rows:
+            year_el = row.select_one(".gsc_a_y")
+            y_text = year_el.get_text(strip=True) if year_el else ""
+            cit_el = row.select_one(".gsc_a_c .gsc_a_ac") or row.select_one(".gsc_a_c")
+            c_text = cit_el.get_text(strip=True) if cit_el else ""
+            papers.append((int(y_text) if y_text.isdigit() else 0,
+                           int(c_text) if c_text.isdigit() else 0))
+        return len(rows), papers
+
+def _has_class(cls):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+def _text(el):
+    # Same result as BeautifulSoup's get_text(strip=True)
+    return "".join(t.strip() for t in el.itertext())
+
+class LxmlParser(ProfilePageParser):
+    name = "lxml"
+
+    METRIC_ROWS = "//table[@id='gsc_rsb_st']//tr"
+    GRAPH_YEARS = f"//*[{_has_class('gsc_g_t')}]"
+    GRAPH_VALUES = f"//*[{_has_class('gsc_g_a')}]"
+    GRAPH_VALUES_ALT = f"//*[{_has_class('gsc_g_al')}]"
+    PUB_ROWS = f"//*[{_has_class('gsc_a_tr')}]"
+    PUB_YEAR = f".//*[{_has_class('gsc_a_y')}]"
+    PUB_CITATIONS = f".//*[{_has_class('gsc_a_c')}]"
+    PUB_CITATIONS_LINK = f".//*[{_has_class('gsc_a_ac')}]"
+
+    def parse_metrics(self, html):
+        doc = lxml.html.fromstring(html)
+        metrics = {}
+
+        for row in doc.xpath(self.METRIC_ROWS):
+            cols = row.xpath("./td")
+            if len(cols) >= 2:
+                key = _metric_label_key(_text(cols[0]))
+                val_all = _text(cols[1])
+                if key:
+                    metrics[key] = int(val_all) if val_all.isdigit() else 0
+
+        years_els = doc.xpath(self.GRAPH_YEARS)
+        vals_els = doc.xpath(self.GRAPH_VALUES) or doc.xpath(self.GRAPH_VALUES_ALT)
+        yearly_data = []
+        if len(years_els) == len(vals_els):
+            yearly_data = [f"{_text(y)}:{_text(v)}" for y, v in zip(years_els, vals_els)]
+        metrics["citations_per_year"] = " | ".join(yearly_data)
+        return metrics
+
+    def parse_publications(self, html):
+        doc = lxml.html.fromstring(html)
+        rows = doc.xpath(self.PUB_ROWS)
+        papers = []
+        for row in rows:
+            year_els = row.xpath(self.PUB_YEAR)
+            y_text = _text(year_els[0]) if year_els else ""
+            cit_els = row.xpath(self.PUB_CITATIONS)
+            if cit_els:
+                cit_els = cit_els[0].xpath(self.PUB_CITATIONS_LINK) or cit_els
+            c_text = _text(cit_els[0]) if cit_els else ""
+            papers.append((int(y_text) if y_text.isdigit() else 0,
+                           int(c_text) if c_text.isdigit() else 0))
+        return len(rows), papers
+
+PARSERS = {"bs4": BeautifulSoupParser}
+if LXML_AVAILABLE:
+    PARSERS["lxml"] = LxmlParser
+
+def get_parser(name=None):
+    """Returns the requested parser, else lxml if installed, else BeautifulSoup."""
+    name = name or os.environ.get("SCHOLAR_PARSER")
+    if name in PARSERS:
+        return PARSERS[name]()
+    return LxmlParser() if LXML_AVAILABLE else BeautifulSoupParser()
+
+# Shared by every scraper in the process
+PARSER = get_parser()
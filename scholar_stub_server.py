@@ -0,0 +1,54 @@
+import http.server
+import os
+import sys
+from urllib.parse import parse_qs, urlsplit
+
+# ==============================================================================
+# LOCAL STAND-IN FOR scholar.google.com
+# ==============================================================================
+# Serves saved Scholar HTML so the scrapers can be exercised without network:
+#   <html_dir>/<user>.html            main profile page
+#   <html_dir>/<user>_<cstart>.html   100-row publication page
+# Usage:
+#   python scholar_stub_server.py data/scholar_html 8765
+#   SCHOLAR_BASE_URL=http://127.0.0.1:8765 python data_scrape.py
+
+def make_handler(html_dir):
+    class StubHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            query = parse_qs(urlsplit(self.path).query)
+            user = query.get("user", [""])[0]
+            cstart = query.get("cstart", [None])[0]
+            name = f"{user}_{cstart}.html" if cstart is not None else f"{user}.html"
+            path = os.path.join(html_dir, os.path.basename(name))
+            
+            if not user or not os.path.exists(path):
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            
+            with open(path, "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+def serve(html_dir, port=8765):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), make_handler(html_dir))
+    print(f"Serving {html_dir} on http://127.0.0.1:{port}")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    html_dir = sys.argv[1] if len(sys.argv) > 1 else "data/scholar_html"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    serve(html_dir, port)
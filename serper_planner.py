@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from data_scrape import generate_name_variations, has_scholar_result, normalize_query, serper_search
+
+# ==============================================================================
+# SERPER QUERY PLANNER
+# ==============================================================================
+# Resolves the Serper searches for a whole awardee list up front:
+#   1. Every primary name query is deduplicated and sent concurrently.
+#   2. Names without a Scholar hit fall back to their name variations, one
+#      variation "round" at a time (first variation of every unresolved name,
+#      then the second, ...), so a name stops as soon as one variation hits,
+#      exactly like the sequential loop in process_all_authors.
+# A name counts as resolved only if a profile candidate passes the same
+# ranking search_and_enrich_serper applies, against the awardee's institution
+# when affiliations are given (as process_batch does). Responses land in the
+# Serper query cache, so the batch loop afterwards only reads from the cache.
+
+SERPER_WORKERS = 8
+
+def _dispatch(queries, results, max_workers):
+    """Runs the not-yet-seen normalized queries concurrently."""
+    pending = {}
+    for q in queries:
+        key = normalize_query(q)
+        if key not in results and key not in pending:
+            pending[key] = q
+
+    def run(q):
+        try:
+            return serper_search(q, prefetch=True)
+        except Exception as e:
+            print(f"Error searching for {q}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for key, data in zip(pending, pool.map(run, pending.values())):
+            results[key] = data
+    return len(pending)
+
+def prefetch_searches(names, affiliations=None, max_workers=SERPER_WORKERS):
+    """
+    Warms the Serper cache for all names; affiliations (aligned with names,
+    e.g. calistigi_kurum) are used to rank the candidates. Returns plan statistics.
+    """
+    if affiliations is None:
+        affiliations = [None] * len(names)
+    people = [p for p in dict.fromkeys(zip(names, affiliations)) if isinstance(p[0], str)]
+    primary = list(dict.fromkeys(name for name, _ in people))
+    results = {}
+    stats = {"names": len(primary), "planned_queries": 0, "dispatched": 0}
+
+    # 1. Primary queries
+    stats["planned_queries"] += len(primary)
+    stats["dispatched"] += _dispatch(primary, results, max_workers)
+
+    # 2. Variation rounds for unresolved (name, affiliation) pairs
+    variations = {
+        (n, aff): [v for v in generate_name_variations(n) if v != n]
+        for n, aff in people if not has_scholar_result(results.get(normalize_query(n)), n, aff)
+    }
+    round_num = 0
+    while variations:
+        round_queries = {p: vs[round_num] for p, vs in variations.items() if round_num < len(vs)}
+        if not round_queries:
+            break
+        stats["planned_queries"] += len(round_queries)
+        stats["dispatched"] += _dispatch(round_queries.values(), results, max_workers)
+        variations = {p: vs for p, vs in variations.items()
+                      if p in round_queries
+                      and not has_scholar_result(results.get(normalize_query(round_queries[p])), round_queries[p], p[1])}
+        round_num += 1
+
+    stats["deduplicated"] = stats["planned_queries"] - stats["dispatched"]
+    return stats
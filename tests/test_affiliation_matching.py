@@ -0,0 +1,43 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from affiliation_matching import Gazetteer
+
+NAMES = [
+    "Yıldırım Beyazıt Üniv.", "Ankara Yıldırım Beyazıt Üniversitesi", "Ankara Üniversitesi",
+    "İstanbul Üniversitesi", "İstanbul Teknik Üniversitesi", "TÜBİTAK", "TÜBİTAK MAM",
+    "TÜBİTAK Uzay Teknolojileri Araştırma E.", "İzmir Ekonomi Üniv.", "İzmir Yüksek Teknoloji Enstitüsü",
+]
+GAZETTEER = Gazetteer(NAMES)
+
+def test_same_institution_with_city():
+    score, notes = GAZETTEER.grade("Yıldırım Beyazıt Üniv.", "Ankara Yıldırım Beyazıt Üniversitesi")
+    assert score == 5, notes
+
+def test_city_institution_is_different():
+    score, _ = GAZETTEER.grade("Ankara Üniversitesi", "Ankara Yıldırım Beyazıt Üniversitesi")
+    assert score == 1
+
+def test_more_specific_institution_is_different():
+    score, _ = GAZETTEER.grade("İstanbul Üniversitesi", "Istanbul Technical University")
+    assert score == 1
+    score, _ = GAZETTEER.grade("İzmir Yüksek Teknoloji Enstitüsü", "İzmir University of Economics Department of Physics")
+    assert score == 1
+
+def test_tubitak_mam():
+    found = ("Hilal Yazici, Assoc. Prof. TUBITAK-MRC, Genetic Engineering and Biotechnology Institute. "
+             "Verified email at tubitak.gov.tr.")
+    score, notes = GAZETTEER.grade("TÜBİTAK MAM", found)
+    assert score == 5, notes
+
+def test_tubitak_uzay():
+    found = "Kamil B. ALICI. TUBITAK Space Technologies Research Institute. Verified email at utexas.edu."
+    score, notes = GAZETTEER.grade("TÜBİTAK Uzay Teknolojileri Araştırma E.", found)
+    assert score == 5, notes
+
+def test_grade_many_matches_grade():
+    pairs = [("TÜBİTAK MAM", "TUBITAK-MRC"), ("Ankara Üniversitesi", None), ("TÜBİTAK MAM", "TUBITAK-MRC")]
+    originals, founds = zip(*pairs)
+    assert GAZETTEER.grade_many(originals, founds) == [GAZETTEER.grade(o, f) for o, f in pairs]
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import data_store
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+AWARDEES = os.path.join(ROOT, "data", "gebip_awardees.csv")
+FINAL_CSV = os.path.join(ROOT, data_store.FINAL_CSV)
+
+def test_normalize_keys_award_rounds():
+    df = pd.DataFrame({"yili": ["2001-1", "2001-2", "2024"], "sira_no": ["3", 4, 5]})
+    keys = data_store.normalize_keys(df)
+    assert keys["yili"].tolist() == [2001, 2001, 2024]
+    assert keys["sira_no"].tolist() == [3, 4, 5]
+
+def test_upsert_scrape_results_matches_awardee_keys(tmp_path):
+    conn = data_store.connect(str(tmp_path / "store.sqlite"), seed_csv=FINAL_CSV)
+    seeded = conn.execute(f"SELECT COUNT(*) FROM {data_store.TABLE}").fetchone()[0]
+
+    # Scraper output keeps the awardee list's string yili ("2001-1")
+    scraped = pd.read_csv(AWARDEES)
+    assert scraped["yili"].astype(str).str.contains("-").any()
+    scraped = scraped[["sira_no", "adi_soyadi", "yili", "calistigi_kurum"]].assign(scholar_id=None)
+    data_store.upsert_scrape_results(conn, scraped)
+
+    # Every awardee updated its seeded row, none was inserted
+    assert conn.execute(f"SELECT COUNT(*) FROM {data_store.TABLE}").fetchone()[0] == seeded
+    conn.close()
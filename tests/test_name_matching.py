@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from name_matching import NameBlockingIndex, add_name_columns, is_name_match, match_frame, name_score
+
+AWARDEES = ["Ali Veli", "Ayşe Kaya", "Mehmet Ali Demir", "A. Ümit Yılmaz", "Zeynep Ak"]
+FOUND = ["Ali Veli", "Mehmet Demir", "M. A. Demir", "Ümit Yılmaz", "Ayse Kaya", "Zeynep Aksoy", None, ""]
+
+def test_match_frame_agrees_with_pairwise_rules():
+    left = [a for a in AWARDEES for _ in FOUND]
+    right = FOUND * len(AWARDEES)
+    frame = add_name_columns(pd.DataFrame({"adi_soyadi": left, "scholar_name": right}), "adi_soyadi")
+    result = match_frame(frame)
+    assert result["name_match"].tolist() == [is_name_match(a, b) for a, b in zip(left, right)]
+    assert result["name_score"].tolist() == [name_score(a, b) for a, b in zip(left, right)]
+
+def test_blocking_index_finds_the_owner():
+    index = NameBlockingIndex(pd.Series(AWARDEES))
+    best = index.best_matches(pd.Series(["Mehmet Demir", "Ayse Kaya", "Nobody Here"], index=[10, 11, 12]))
+    assert best["label"].to_dict() == {10: 2, 11: 1}
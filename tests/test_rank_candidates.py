@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from data_scrape import NAME_WEIGHT, rank_candidates
+
+def organic(name, snippet, scholar_id):
+    """One profile result as Serper returns it."""
+    return {
+        "title": f"{name} - Google Scholar",
+        "link": f"https://scholar.google.com/citations?user={scholar_id}&hl=en",
+        "snippet": snippet,
+    }
+
+RESPONSE = {"organic": [
+    organic("Ayşe Kaya", "Acme Research Labs - Cited by 1,204 - Organic Chemistry - Catalysis", "ACME"),
+    organic("Ayşe Kaya", "Ankara Üniversitesi - Cited by 310 - Organic Chemistry", "ANKARA"),
+]}
+
+def test_citation_count_does_not_pass_as_affiliation():
+    ranked, n_candidates = rank_candidates(RESPONSE, "Ayşe Kaya", "Ankara Üniversitesi")
+    assert n_candidates == 2
+    assert [c["scholar_id"] for c in ranked] == ["ANKARA", "ACME"]
+    # An unknown institution is a mismatch (grade 1), not a citation snippet (grade 3)
+    assert ranked[1]["candidate_score"] == NAME_WEIGHT
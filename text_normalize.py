@@ -0,0 +1,66 @@
+import re
+from functools import lru_cache
+
+from unidecode import unidecode
+
+# ==============================================================================
+# TEXT NORMALIZATION
+# ==============================================================================
+# Shared by the scraper (name variations), the affiliation gazetteer and the
+# name matching code. The same names and institutions repeat hundreds of times, so:
+#   * unidecode and the full normalizations are memoized with lru_cache
+#   * punctuation is stripped with str.translate tables instead of replace chains
+#   * university abbreviations are expanded by one precompiled regex with word
+#     boundaries, in a single pass. The old per-key substring replace also hit
+#     words that merely contain a key ("ku" in "fakultesi", "itu" in "institute").
+
+CACHE_SIZE = 65536
+
+UNIVERSITY_MAPPING = {
+    "odtu": "middle east technical university",
+    "metu": "middle east technical university",
+    "middle east technical university": "middle east technical university",
+    "itu": "istanbul technical university",
+    "istanbul teknik universitesi": "istanbul technical university",
+    "boun": "bogazici university",
+    "bogazici": "bogazici university",
+    "iyte": "izmir institute of technology",
+    "izmir yuksek teknoloji enstitusu": "izmir institute of technology",
+    "ku": "koc university",
+    "su": "sabanci university"
+}
+
+NAME_PUNCTUATION = str.maketrans({c: " " for c in ".-,()[]'\""})
+
+@lru_cache(maxsize=CACHE_SIZE)
+def ascii_fold(text):
+    """unidecode, memoized."""
+    return unidecode(text)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fold_lower(text):
+    return ascii_fold(text).lower()
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _normalize_name(name):
+    return " ".join(fold_lower(name).translate(NAME_PUNCTUATION).split())
+
+def normalize_name(name):
+    """ASCII, lower case, punctuation to spaces, single spaces. Non-strings give ""."""
+    if not isinstance(name, str):
+        return ""
+    return _normalize_name(name)
+
+class AbbreviationExpander:
+    """Replaces whole-word keys (longest first) in one regex pass."""
+
+    def __init__(self, mapping):
+        self.mapping = dict(mapping)
+        keys = sorted(self.mapping, key=len, reverse=True)
+        self.pattern = re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keys) + r")\b")
+        self.expand = lru_cache(maxsize=CACHE_SIZE)(self._expand)
+
+    def _expand(self, text):
+        return self.pattern.sub(lambda m: self.mapping[m.group(0)], text)
+
+UNIVERSITY_EXPANDER = AbbreviationExpander(UNIVERSITY_MAPPING)
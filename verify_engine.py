@@ -0,0 +1,143 @@
+import json
+
+import numpy as np
+
+from text_normalize import normalize_name
+
+# ==============================================================================
+# VERIFICATION ENGINE
+# ==============================================================================
+# Declarative checks on the production data, loaded from the versioned rules
+# file data/verify_rules.json. Every rule compiles into a function returning
+# a boolean violation mask over the rows; evaluate() computes all masks in one
+# pass over the frame, stacks them into one rules x rows matrix and counts.
+# Rule types:
+#   pinned_id         {name: scholar_id}; rows of that awardee with another ID
+#   forbidden_values  column takes one of the values
+#   not_null          a column is missing
+#   zero_when         a column is non-zero / present while a condition holds
+#   nonzero_when      a column is zero while a condition holds
+#   monotone_series   a "YYYY:Count | ..." string is malformed, not in
+#                     increasing years or has a negative count
+#   less_or_equal     left > right (rows where both are present)
+#   between           column outside [min, max] (rows where it is present)
+# The report is a plain dict (JSON-ready); passed is False if any "error" rule
+# has violations, which data_verify.py turns into its exit code.
+
+RULES_FILE = "data/verify_rules.json"
+SAMPLE_COLUMNS = ["adi_soyadi", "yili", "scholar_id"]
+SAMPLE_SIZE = 5
+SERIES_STRING = r"\s*(?:\d+\s*:\s*\d+\s*(?:\|\s*\d+\s*:\s*\d+\s*)*)?"
+
+def _condition(when):
+    column = when["column"]
+    if "equals" in when:
+        return lambda df: df[column].eq(when["equals"]).to_numpy()
+    if "not_equals" in when:
+        return lambda df: (df[column].notna() & df[column].ne(when["not_equals"])).to_numpy()
+    if "in" in when:
+        return lambda df: df[column].isin(when["in"]).to_numpy()
+    raise ValueError(f"Unknown condition: {when}")
+
+def _any_column(df, columns, test):
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        mask |= test(df[col]).to_numpy()
+    return mask
+
+def _pinned_id(rule):
+    pins = {normalize_name(name): sid for name, sid in rule["pins"].items()}
+    def check(df):
+        expected = df["adi_soyadi"].map(normalize_name).map(pins)
+        return (expected.notna() & df["scholar_id"].ne(expected)).to_numpy()
+    return check
+
+def _monotone_series(rule):
+    column = rule["column"]
+    def check(df):
+        strings = df[column]
+        present = strings.notna().to_numpy()
+        strings = strings[present].astype(str)
+        # Well formed, no negative counts
+        valid = strings.str.fullmatch(SERIES_STRING).to_numpy()
+
+        # Years of all valid strings as one flat array, grouped by row
+        good = strings[valid]
+        nums = np.array(" ".join(good.tolist()).replace("|", " ").replace(":", " ").split(), dtype=np.int64)
+        group = np.repeat(np.arange(len(good)), good.str.count(":").to_numpy())
+        decreasing = (np.diff(nums[0::2]) <= 0) & (group[1:] == group[:-1])
+        unordered = np.zeros(len(good), dtype=bool)
+        unordered[group[1:][decreasing]] = True
+
+        bad = ~valid
+        bad[np.flatnonzero(valid)[unordered]] = True
+        mask = np.zeros(len(df), dtype=bool)
+        mask[np.flatnonzero(present)[bad]] = True
+        return mask
+    return check
+
+def _zero_when(rule):
+    cond = _condition(rule["when"])
+    return lambda df: cond(df) & _any_column(df, rule["columns"], lambda s: s.notna() & s.ne(0))
+
+def _nonzero_when(rule):
+    cond = _condition(rule["when"])
+    return lambda df: cond(df) & _any_column(df, rule["columns"], lambda s: s.eq(0))
+
+RULE_TYPES = {
+    "pinned_id": _pinned_id,
+    "forbidden_values": lambda r: lambda df: df[r["column"]].isin(r["values"]).to_numpy(),
+    "not_null": lambda r: lambda df: _any_column(df, r["columns"], lambda s: s.isna()),
+    "zero_when": _zero_when,
+    "nonzero_when": _nonzero_when,
+    "monotone_series": _monotone_series,
+    "less_or_equal": lambda r: lambda df: df[r["left"]].gt(df[r["right"]]).to_numpy(),
+    "between": lambda r: lambda df: (df[r["column"]].lt(r["min"]) | df[r["column"]].gt(r["max"])).to_numpy(),
+}
+
+class VerifyRules:
+    def __init__(self, spec):
+        self.version = spec.get("version")
+        self.rules = spec["rules"]
+        for rule in self.rules:
+            if rule["type"] not in RULE_TYPES:
+                raise ValueError(f"Unknown rule type '{rule['type']}' in rule {rule['id']}")
+        self.checks = [RULE_TYPES[rule["type"]](rule) for rule in self.rules]
+
+    @classmethod
+    def load(cls, path=RULES_FILE):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def masks(self, df):
+        """rules x rows matrix of violations."""
+        if not self.checks:
+            return np.zeros((0, len(df)), dtype=bool)
+        return np.vstack([check(df) for check in self.checks])
+
+    def evaluate(self, df):
+        """Evaluates every rule on df. Returns the JSON-ready report."""
+        masks = self.masks(df)
+        counts = masks.sum(axis=1)
+        sample_cols = [c for c in SAMPLE_COLUMNS if c in df.columns]
+        results = []
+        for rule, mask, count in zip(self.rules, masks, counts):
+            sample = df.loc[mask, sample_cols].head(SAMPLE_SIZE)
+            results.append({
+                "id": rule["id"],
+                "type": rule["type"],
+                "severity": rule.get("severity", "error"),
+                "description": rule.get("description", ""),
+                "violations": int(count),
+                "sample": json.loads(sample.to_json(orient="records", force_ascii=False)),
+            })
+        errors = sum(1 for r in results if r["violations"] and r["severity"] == "error")
+        warnings = sum(1 for r in results if r["violations"] and r["severity"] != "error")
+        return {
+            "rules_version": self.version,
+            "records": len(df),
+            "passed": errors == 0,
+            "failed_rules": errors,
+            "warning_rules": warnings,
+            "results": results,
+        }
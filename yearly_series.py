@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# YEARLY TIME SERIES
+# ==============================================================================
+# yillik_atif / yillik_yayin hold "YYYY:Count | YYYY:Count" strings. They are
+# parsed once, at ingest, into a long table in the data store:
+#   yearly_series(researcher_id, year, citations, documents)
+# researcher_id is the row id of the researchers table. A year that appears in
+# only one of the two strings has NULL for the other value.
+# YearlySeries loads the table into NumPy arrays sorted by (researcher, year),
+# so cumulative series and "sum up to year X" are group operations over all
+# researchers at once instead of per-row string splitting.
+
+SERIES_TABLE = "yearly_series"
+SERIES_COLUMNS = {"yillik_atif": "citations", "yillik_yayin": "documents"}
+PAIR_PATTERN = r"^\s*(\d+)\s*:\s*(\d+)\s*$"
+
+def _explode_column(strings, value_name):
+    pairs = strings.dropna().astype(str).str.split("|").explode()
+    parsed = pairs.str.extract(PAIR_PATTERN).dropna()
+    long_df = pd.DataFrame({
+        "researcher_id": parsed.index.astype("int64"),
+        "year": parsed[0].astype("int64").to_numpy(),
+        value_name: parsed[1].astype("int64").to_numpy(),
+    })
+    # A year listed twice keeps its last value
+    return long_df.drop_duplicates(["researcher_id", "year"], keep="last")
+
+def explode_yearly(df):
+    """Parses the yearly strings of df (indexed by researcher id) into the long format."""
+    parts = [_explode_column(df[col], name) for col, name in SERIES_COLUMNS.items() if col in df.columns]
+    if not parts:
+        return pd.DataFrame(columns=["researcher_id", "year", *SERIES_COLUMNS.values()])
+    long_df = parts[0]
+    for part in parts[1:]:
+        long_df = long_df.merge(part, on=["researcher_id", "year"], how="outer")
+    for name in SERIES_COLUMNS.values():
+        if name not in long_df.columns:
+            long_df[name] = np.nan
+    return long_df.sort_values(["researcher_id", "year"]).reset_index(drop=True)
+
+def create_table(conn):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SERIES_TABLE} (
+            researcher_id INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            citations INTEGER,
+            documents INTEGER,
+            PRIMARY KEY (researcher_id, year)
+        )
+    """)
+
+def write_series(conn, df):
+    """Replaces the series of every researcher in df (indexed by researcher id)."""
+    long_df = explode_yearly(df)
+    ids = [(int(i),) for i in df.index]
+    rows = [
+        (int(r), int(y), None if pd.isna(c) else int(c), None if pd.isna(d) else int(d))
+        for r, y, c, d in long_df[["researcher_id", "year", "citations", "documents"]].itertuples(index=False, name=None)
+    ]
+    with conn:
+        conn.executemany(f"DELETE FROM {SERIES_TABLE} WHERE researcher_id = ?", ids)
+        conn.executemany(f"INSERT INTO {SERIES_TABLE} VALUES (?, ?, ?, ?)", rows)
+    return len(rows)
+
+class YearlySeries:
+    """Long-format series as NumPy arrays, grouped by researcher (CSR-style offsets)."""
+
+    def __init__(self, long_df):
+        long_df = long_df.sort_values(["researcher_id", "year"], kind="stable")
+        self.researcher = long_df["researcher_id"].to_numpy(dtype=np.int64)
+        self.year = long_df["year"].to_numpy(dtype=np.int64)
+        self.values = {name: long_df[name].to_numpy(dtype=np.float64) for name in SERIES_COLUMNS.values()}
+        self.researcher_ids, starts = np.unique(self.researcher, return_index=True)
+        self.offsets = np.append(starts, len(self.researcher))
+
+    @classmethod
+    def from_frame(cls, df):
+        """Builds the series straight from the yearly strings (CSV fallback)."""
+        return cls(explode_yearly(df))
+
+    @classmethod
+    def load(cls, conn):
+        return cls(pd.read_sql(f"SELECT researcher_id, year, citations, documents FROM {SERIES_TABLE}", conn))
+
+    def cumulative(self, name):
+        """Running total per researcher, aligned with self.year (missing years count as 0)."""
+        total = np.cumsum(np.nan_to_num(self.values[name]))
+        group_start = np.repeat(self.offsets[:-1], np.diff(self.offsets))
+        before = np.concatenate(([0.0], total))[group_start]
+        return total - before
+
+    def sum_until(self, name, until_year):
+        """
+        Per-researcher sum of `name` over years <= until_year. until_year is a
+        scalar or an array aligned with self.researcher_ids (e.g. award years).
+        """
+        limit = np.broadcast_to(np.asarray(until_year, dtype=np.float64), self.researcher_ids.shape)
+        group = np.repeat(np.arange(len(self.researcher_ids)), np.diff(self.offsets))
+        keep = self.year <= limit[group]
+        values = np.where(keep, np.nan_to_num(self.values[name]), 0.0)
+        return np.bincount(group, weights=values, minlength=len(self.researcher_ids))
+
+    def get(self, researcher_id, name):
+        """Returns (years, values, cumulative) for one researcher, only years with a value."""
+        pos = np.searchsorted(self.researcher_ids, researcher_id)
+        if pos == len(self.researcher_ids) or self.researcher_ids[pos] != researcher_id:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, empty
+        sl = slice(self.offsets[pos], self.offsets[pos + 1])
+        years, values = self.year[sl], self.values[name][sl]
+        present = ~np.isnan(values)
+        values = values[present].astype(np.int64)
+        return years[present], values, np.cumsum(values)